@@ -0,0 +1,128 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+"""Compare the pdfminer and pymupdf text backends of PDFParser
+
+Reports, per PDF and in total, the extraction time of each backend and how
+closely the pymupdf text matches pdfminer's: word F1 (same words), bigram
+F1 (same words in the same reading order) and the ratio of word counts.
+Run against a directory of PDFs:
+
+    python benchmarks/pdf_backends.py ./documents
+
+or generate a synthetic corpus first:
+
+    python benchmarks/pdf_backends.py /tmp/pdf_corpus --generate 20 --pages 120
+"""
+import argparse
+import os
+import random
+import re
+import time
+from collections import Counter
+from typing import List, Tuple
+
+from synthetic_data_kit.parsers.pdf_parser import PDFParser
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _f1(reference: Counter, candidate: Counter) -> float:
+    ref_total, cand_total = sum(reference.values()), sum(candidate.values())
+    if not ref_total or not cand_total:
+        return float(ref_total == cand_total)
+    overlap = sum((reference & candidate).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / cand_total, overlap / ref_total
+    return 2 * precision * recall / (precision + recall)
+
+
+def parity(reference: str, candidate: str) -> Tuple[float, float, float]:
+    """(word F1, bigram F1, candidate/reference word count)"""
+    ref = _WORD.findall(reference.lower())
+    cand = _WORD.findall(candidate.lower())
+    return (
+        _f1(Counter(ref), Counter(cand)),
+        _f1(Counter(zip(ref, ref[1:])), Counter(zip(cand, cand[1:]))),
+        len(cand) / max(len(ref), 1),
+    )
+
+
+def generate_corpus(directory: str, documents: int, pages: int, seed: int = 0) -> None:
+    """Write PDFs of random multi-column prose for benchmarking"""
+    import pymupdf
+
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+        for _ in range(5000)
+    ]
+    os.makedirs(directory, exist_ok=True)
+    for d in range(documents):
+        doc = pymupdf.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 48), f"Report {d} - page {p + 1}", fontsize=9)
+            for x in (72, 320):
+                words = " ".join(rng.choice(vocabulary) for _ in range(350))
+                page.insert_textbox(pymupdf.Rect(x, 72, x + 220, 770), words, fontsize=9)
+        doc.save(os.path.join(directory, f"doc_{d:03d}.pdf"))
+        doc.close()
+
+
+def run(pdf_paths: List[str], workers: int) -> None:
+    pdfminer = PDFParser(backend="pdfminer")
+    serial = PDFParser(backend="pymupdf", workers=1)
+    parallel = PDFParser(backend="pymupdf", workers=workers, parallel_min_pages=1)
+
+    totals = Counter()
+    word_scores, bigram_scores = [], []
+    print(f"{'file':<28}{'pdfminer s':>12}{'pymupdf s':>12}{'x' + str(workers) + ' s':>10}"
+          f"{'word F1':>10}{'bigram F1':>11}{'words':>8}")
+    for path in pdf_paths:
+        timings = []
+        outputs = []
+        for parser in (pdfminer, serial, parallel):
+            start = time.perf_counter()
+            rows = parser.parse(path)
+            timings.append(time.perf_counter() - start)
+            outputs.append("\n".join(row["text"] for row in rows))
+        word_score, bigram_score, ratio = parity(outputs[0], outputs[1])
+        word_scores.append(word_score)
+        bigram_scores.append(bigram_score)
+        totals.update({"pdfminer": timings[0], "serial": timings[1], "parallel": timings[2]})
+        print(f"{os.path.basename(path)[:27]:<28}{timings[0]:>12.2f}{timings[1]:>12.2f}{timings[2]:>10.2f}"
+              f"{word_score:>10.3f}{bigram_score:>11.3f}{ratio:>8.2f}")
+
+    print(f"\n{len(pdf_paths)} PDFs")
+    print(f"pdfminer:          {totals['pdfminer']:.2f}s")
+    print(f"pymupdf:           {totals['serial']:.2f}s ({totals['pdfminer'] / totals['serial']:.1f}x)")
+    print(f"pymupdf x{workers:<3}       {totals['parallel']:.2f}s "
+          f"({totals['pdfminer'] / totals['parallel']:.1f}x)")
+    print(f"mean word F1:      {sum(word_scores) / len(word_scores):.3f} (min {min(word_scores):.3f})")
+    print(f"mean bigram F1:    {sum(bigram_scores) / len(bigram_scores):.3f} (min {min(bigram_scores):.3f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="Directory of PDFs")
+    parser.add_argument("--generate", type=int, default=0, help="Write this many synthetic PDFs first")
+    parser.add_argument("--pages", type=int, default=100, help="Pages per synthetic PDF")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Processes for page-parallel pymupdf")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_corpus(args.directory, args.generate, args.pages)
+    pdf_paths = sorted(
+        os.path.join(args.directory, name) for name in os.listdir(args.directory) if name.lower().endswith(".pdf")
+    )
+    if not pdf_paths:
+        parser.error(f"No PDFs found in {args.directory}")
+    run(pdf_paths, args.workers)
+
+
+if __name__ == "__main__":
+    main()
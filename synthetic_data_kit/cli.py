@@ -180,6 +180,12 @@ def ingest(
     multimodal: bool = typer.Option(
         False, "--multimodal", help="Enable multimodal parsing for supported file types"
     ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", min=1, help="Worker processes for directory ingest (default: ingest.workers in config)"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Re-parse directory files whose output is already up to date"
+    ),
 ):
     """
     Parse documents (PDF, HTML, YouTube, DOCX, PPT, TXT) into clean text.
@@ -238,12 +244,17 @@ def ingest(
                 return 0
             
             console.print(f"Processing directory: [bold]{input}[/bold]", style="blue")
+            ingest_config = ctx.config.get("ingest", {})
             results = process_directory_ingest(
                 directory=input,
                 output_dir=output_dir,
                 config=ctx.config,
                 verbose=verbose,
                 multimodal=multimodal,
+                workers=workers or ingest_config.get("workers", 1),
+                file_timeout=ingest_config.get("file_timeout"),
+                max_memory_mb=ingest_config.get("max_memory_mb"),
+                force=force,
             )
             
             # Return appropriate exit code
@@ -278,7 +289,7 @@ def ingest(
 def create(
     input: str = typer.Argument(..., help="File or directory to process"),
     content_type: str = typer.Option(
-        "qa", "--type", help="Type of content to generate [qa|summary|cot|cot-enhance|multimodal-qa]"
+        "qa", "--type", help="Type of content to generate [qa|qa-cot|summary|cot|cot-enhance|multimodal-qa]"
     ),
     output_dir: Optional[Path] = typer.Option(
         None, "--output-dir", "-o", help="Where to save the output"
@@ -304,6 +315,12 @@ def create(
     preview: bool = typer.Option(
         False, "--preview", help="Preview files to be processed without actually processing them"
     ),
+    resume: bool = typer.Option(
+        False, "--resume", help="Continue an interrupted run, replaying completed LLM calls from its journal"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Regenerate directory files whose output is already up to date"
+    ),
 ):
     """
     Generate content from text using local LLM inference.
@@ -311,9 +328,12 @@ def create(
     Can process:
     - Single file: synthetic-data-kit create document.txt --type qa
     - Directory: synthetic-data-kit create ./processed-text/ --type qa
+    - Interrupted run: synthetic-data-kit create document.txt --type qa --resume
     
     Content types:
     - qa: Generate question-answer pairs from .txt files (use --num-pairs to specify how many)
+    - qa-cot: Generate QA pairs and Chain of Thought examples in one pass over each chunk
+      (writes both *_qa_pairs.json and *_cot_examples.json; CoT count from generation.num_cot_examples)
     - summary: Generate summaries from .txt files
     - cot: Generate Chain of Thought reasoning examples from .txt files (use --num-pairs to specify how many)
     - multimodal-qa: Generate question-answer pairs from .lance files (use --num-pairs to specify how many)
@@ -414,7 +434,9 @@ def create(
                 verbose=verbose,
                 provider=provider,
                 chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap
+                chunk_overlap=chunk_overlap,
+                resume=resume,
+                force=force
             )
             
             # Return appropriate exit code
@@ -441,7 +463,8 @@ def create(
                     verbose,
                     provider=provider,
                     chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap
+                    chunk_overlap=chunk_overlap,
+                    resume=resume
                 )
             if output_path:
                 console.print(f"✅ Content saved to [bold]{output_path}[/bold]", style="green")
@@ -473,6 +496,23 @@ def curate(
     preview: bool = typer.Option(
         False, "--preview", help="Preview files to be processed without actually processing them"
     ),
+    rethreshold: bool = typer.Option(
+        False, "--rethreshold", help="Re-apply the threshold to stored ratings without calling the LLM"
+    ),
+    top_k: Optional[int] = typer.Option(
+        None, "--top-k", help="Keep only the N best-rated pairs (threshold defaults to 0)", min=1
+    ),
+    per_source: bool = typer.Option(
+        False, "--per-source", help="With --top-k on a directory, keep N pairs per file instead of N overall"
+    ),
+    resume: bool = typer.Option(
+        True, "--resume/--no-resume",
+        help="Reuse ratings stored by earlier or interrupted runs (--no-resume re-rates every pair)"
+    ),
+    stream: Optional[bool] = typer.Option(
+        None, "--stream/--no-stream",
+        help="Rate in windows and append accepted pairs to a JSONL output as they complete (default for .jsonl input)"
+    ),
 ):
     """
     Clean and filter content based on quality.
@@ -480,8 +520,12 @@ def curate(
     Can process:
     - Single file: synthetic-data-kit curate qa_pairs.json --threshold 8.0
     - Directory: synthetic-data-kit curate ./generated/ --threshold 8.0
+    - Stored ratings: synthetic-data-kit curate qa_pairs.json --threshold 6.0 --rethreshold
+    - Fixed size: synthetic-data-kit curate ./generated/ --top-k 10000
+    - Streaming: synthetic-data-kit curate qa_pairs.jsonl -o cleaned.jsonl
     
     Processes .json files containing QA pairs and filters them based on quality ratings.
+    Ratings are stored next to the input, so only new or changed pairs are rated again.
     """
     import os
     from synthetic_data_kit.core.curate import curate_qa_pairs
@@ -492,7 +536,10 @@ def curate(
     
     console.print(f"🔗 Using {provider} provider", style="green")
     
-    if provider == "api-endpoint":
+    if rethreshold:
+        # Stored ratings only, no server needed
+        console.print("Re-applying threshold to stored ratings", style="green")
+    elif provider == "api-endpoint":
         # Use API endpoint config
         api_endpoint_config = get_openai_config(ctx.config)
         api_base = api_base or api_endpoint_config.get("api_base")
@@ -566,7 +613,12 @@ def curate(
                 model=model,
                 config_path=ctx.config_path,
                 verbose=verbose,
-                provider=provider
+                provider=provider,
+                rethreshold=rethreshold,
+                top_k=top_k,
+                top_k_per_source=per_source,
+                resume=resume,
+                stream=stream
             )
             
             # Return appropriate exit code
@@ -597,7 +649,11 @@ def curate(
                     model,
                     ctx.config_path,
                     verbose,
-                    provider=provider
+                    provider=provider,
+                    rethreshold=rethreshold,
+                    top_k=top_k,
+                    stream=stream,
+                    resume=resume
                 )
             console.print(f"✅ Cleaned content saved to [bold]{result_path}[/bold]", style="green")
             return 0
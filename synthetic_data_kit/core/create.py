@@ -7,7 +7,7 @@
 import os
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple
 
 from synthetic_data_kit.models.llm_client import LLMClient
 from synthetic_data_kit.generators.qa_generator import QAGenerator
@@ -16,7 +16,10 @@ from synthetic_data_kit.generators.multimodal_qa_generator import MultimodalQAGe
 
 from synthetic_data_kit.utils.config import get_generation_config
 
-from synthetic_data_kit.utils.lance_utils import load_lance_dataset
+from synthetic_data_kit.utils.lance_utils import load_lance_dataset, iter_lance_rows, take_column
+from synthetic_data_kit.utils.image_dedup import ImageRegistry
+from synthetic_data_kit.utils.boilerplate import filter_documents
+from synthetic_data_kit.utils.journal import RunJournal
 
 def read_json(file_path):
     # Read the file
@@ -25,6 +28,63 @@ def read_json(file_path):
     return document_text
 
 
+def read_documents(file_path: str, content_type: str) -> Tuple[List[Dict[str, Any]], Optional[Callable]]:
+    """Rows to generate from, and a loader of image bytes by image key
+
+    Lance datasets are read one record batch at a time and only the columns
+    the content type uses: text types never read the ``image`` column, and
+    multimodal-qa reads only whether each row has an image (``has_image``),
+    leaving the bytes to the returned loader so they are fetched chunk by
+    chunk as requests are made.
+    """
+    if not file_path.endswith(".lance"):
+        return [{"text": read_json(file_path), "image": None}], None
+
+    dataset = load_lance_dataset(file_path)
+    names = dataset.schema.names
+    columns = {name: name for name in ("text", "page", "image_id") if name in names}
+    if content_type != "multimodal-qa" or "image" not in names:
+        return list(iter_lance_rows(dataset, columns)), None
+
+    columns["has_image"] = "image IS NOT NULL"
+    documents = list(iter_lance_rows(dataset, columns))
+    return documents, _image_loader(dataset, file_path, documents)
+
+
+def _image_loader(dataset, file_path: str, documents: List[Dict[str, Any]]) -> Callable:
+    """Image bytes by key (image id or row position), None where unavailable
+
+    Images stored in this dataset are taken from it by row position; ids it
+    only references are resolved from the dataset of the ingest directory
+    that stores them.
+    """
+    positions = {}
+    for position, doc in enumerate(documents):
+        if doc.get("has_image"):
+            positions.setdefault(doc.get("image_id") or position, position)
+    registry = ImageRegistry(os.path.dirname(os.path.abspath(file_path)), file_path)
+
+    def load(keys: List[Any]) -> List[Optional[bytes]]:
+        local = [key for key in keys if key in positions]
+        images = dict(zip(local, take_column(dataset, "image", [positions[key] for key in local])))
+        images.update(registry.resolve(key for key in keys if key not in positions))
+        return [images.get(key) for key in keys]
+
+    return load
+
+
+def _open_journal(file_path: str, output_dir: str, base_name: str, content_type: str,
+                  client: LLMClient, resume: bool, *settings) -> RunJournal:
+    """Journal of completed LLM calls for this input, type and configuration"""
+    stat = os.stat(file_path)
+    fingerprint = RunJournal.make_fingerprint(
+        os.path.abspath(file_path), stat.st_size, stat.st_mtime, content_type, client.model,
+        client.config.get("generation"), client.config.get("prompts"), *settings
+    )
+    journal_path = os.path.join(output_dir, f"{base_name}_{content_type}.journal.jsonl")
+    return RunJournal(journal_path, fingerprint, resume=resume)
+
+
 def process_file(
     file_path: str,
     output_dir: str,
@@ -38,18 +98,25 @@ def process_file(
     chunk_size: Optional[int] = None,
     chunk_overlap: Optional[int] = None,
     rolling_summary: Optional[bool] = False,
+    resume: bool = False,
 ) -> str:
     """Process a file to generate content
     
+    For qa, qa-cot and cot, each completed LLM call is recorded in a journal
+    in ``output_dir`` that is removed once the output is written. With
+    ``resume``, an interrupted run with the same input and settings replays
+    completed calls from the journal instead of repeating them.
+    
     Args:
         file_path: Path to the text file to process
         output_dir: Directory to save generated content
         config_path: Path to configuration file
         api_base: VLLM API base URL
         model: Model to use
-        content_type: Type of content to generate (qa, summary, cot)
+        content_type: Type of content to generate (qa, qa-cot, summary, cot)
         num_pairs: Target number of QA pairs to generate
         threshold: Quality threshold for filtering (1-10)
+        resume: Continue from the journal of an interrupted run
     
     Returns:
         Path to the output file
@@ -79,11 +146,7 @@ def process_file(
     base_name = os.path.splitext(os.path.basename(file_path))[0]
     
     # Generate content based on type
-    if file_path.endswith(".lance"):
-        dataset = load_lance_dataset(file_path)
-        documents = dataset.to_table().to_pylist()
-    else:
-        documents = [{"text": read_json(file_path), "image": None}]
+    documents, image_loader = read_documents(file_path, content_type)
 
     if content_type == "qa":
         generator = QAGenerator(client, config_path)
@@ -95,12 +158,17 @@ def process_file(
             num_pairs = generation_config.get("num_pairs", 25)
         
         # Process document
-        result = generator.process_documents(
-            documents,
-            num_pairs=num_pairs,
-            verbose=verbose,
-            rolling_summary=rolling_summary
-        )
+        generator.journal = _open_journal(file_path, output_dir, base_name, content_type, client, resume,
+                                          num_pairs, rolling_summary)
+        with generator.journal:
+            result = generator.process_documents(
+                documents,
+                num_pairs=num_pairs,
+                verbose=verbose,
+                rolling_summary=rolling_summary
+            )
+        # Curate's grounding check rebuilds the chunks from the source
+        result["source"] = os.path.abspath(file_path)
         
         # Save output
         output_path = os.path.join(output_dir, f"{base_name}_qa_pairs.json")
@@ -111,11 +179,55 @@ def process_file(
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(result, f, indent=2)
             print(f"Successfully wrote result to {output_path}")
+            generator.journal.finish()
         except Exception as e:
             print(f"Error writing result file: {e}")
         
         return output_path
     
+    elif content_type == "qa-cot":
+        from synthetic_data_kit.generators.qa_cot_generator import QACoTGenerator
+
+        generator = QACoTGenerator(client, config_path)
+
+        # Get num_pairs and num_examples from args or config
+        generation_config = get_generation_config(client.config)
+        if num_pairs is None:
+            num_pairs = generation_config.get("num_pairs", 25)
+        num_examples = generation_config.get("num_cot_examples", 5)
+
+        # One request per chunk produces both outputs
+        generator.journal = _open_journal(file_path, output_dir, base_name, content_type, client, resume,
+                                          num_pairs, num_examples, rolling_summary)
+        with generator.journal:
+            result = generator.process_documents(
+                documents,
+                num_pairs=num_pairs,
+                num_examples=num_examples,
+                verbose=verbose,
+                rolling_summary=rolling_summary
+            )
+
+        # Save both outputs in the same formats as the qa and cot types
+        output_path = os.path.join(output_dir, f"{base_name}_qa_pairs.json")
+        cot_output_path = os.path.join(output_dir, f"{base_name}_cot_examples.json")
+        qa_output = {"summary": result["summary"], "qa_pairs": result["qa_pairs"],
+                     "source": os.path.abspath(file_path)}
+        if "fingerprint_run" in result:
+            qa_output["fingerprint_run"] = result["fingerprint_run"]
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(qa_output, f, indent=2)
+        with open(cot_output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "summary": result["summary"],
+                "cot_examples": result["cot_examples"],
+                "conversations": result["conversations"]
+            }, f, indent=2)
+        print(f"Saved CoT examples to {cot_output_path}")
+        generator.journal.finish()
+
+        return output_path
+
     elif content_type == "multimodal-qa":
         generator = MultimodalQAGenerator(client, config_path)
         output_path = generator.process_dataset(
@@ -124,6 +236,7 @@ def process_file(
             num_examples=num_pairs,
             verbose=verbose,
             base_name=base_name,
+            image_loader=image_loader,
         )
         return output_path
 
@@ -140,10 +253,12 @@ def process_file(
     elif content_type == "summary":
         generator = QAGenerator(client, config_path)
 
-        full_text = " ".join([doc["text"] for doc in documents])
+        documents = filter_documents(documents, generator.generation_config, verbose)
+        full_text = generator.compactor.text(" ".join([doc["text"] for doc in documents]))
         
         # Generate just the summary
         summary = generator.generate_summary(full_text)
+        generator.compactor.report()
         
         # Save output
         output_path = os.path.join(output_dir, f"{base_name}_summary.json")
@@ -162,6 +277,7 @@ def process_file(
         # Initialize the CoT generator
         generator = COTGenerator(client, config_path)
 
+        documents = filter_documents(documents, generator.generation_config, verbose)
         full_text = " ".join([doc["text"] for doc in documents])
         
         # Get num_examples from args or config
@@ -171,16 +287,19 @@ def process_file(
             num_pairs = generation_config.get("num_cot_examples", 5)
         
         # Process document to generate CoT examples
-        result = generator.process_document(
-            full_text,
-            num_examples=num_pairs,
-            include_simple_steps=verbose  # More detailed if verbose is enabled
-        )
+        generator.journal = _open_journal(file_path, output_dir, base_name, content_type, client, resume, num_pairs)
+        with generator.journal:
+            result = generator.process_document(
+                full_text,
+                num_examples=num_pairs,
+                include_simple_steps=verbose  # More detailed if verbose is enabled
+            )
         
         # Save output
         output_path = os.path.join(output_dir, f"{base_name}_cot_examples.json")
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(result, f, indent=2)
+        generator.journal.finish()
         
         if verbose:
             # Print some example content
@@ -309,6 +428,7 @@ def process_file(
             
             if verbose:
                 print(f"Enhanced {len(enhanced_conversations)} conversation(s)")
+            generator.compactor.report()
                 
             return output_path
             
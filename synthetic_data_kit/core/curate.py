@@ -7,92 +7,46 @@
 
 import os
 import json
+import itertools
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
 from synthetic_data_kit.models.llm_client import LLMClient
-from synthetic_data_kit.generators.qa_generator import QAGenerator
-from synthetic_data_kit.utils.config import get_curate_config, get_prompt
+from synthetic_data_kit.utils.config import load_config, get_curate_config, get_generation_config, get_prompt
+from synthetic_data_kit.utils.text import PromptCompactor
+from synthetic_data_kit.utils.dedup import MinHashLSH, deduplicate, semantic_deduplicate_items
+from synthetic_data_kit.utils.fingerprint_store import filter_known_items, record_items, new_run_id
+from synthetic_data_kit.utils.prefilter import prefilter_pairs, PREFILTER_RULES
+from synthetic_data_kit.utils.grounding import GroundingIndex, load_source_chunks
+from synthetic_data_kit.utils.top_k import TopKSelector, select_top_k
+from synthetic_data_kit.utils.rating_store import RatingStore, align_ratings, default_store_path, pair_hash
+from synthetic_data_kit.utils.journal import RunJournal
+from synthetic_data_kit.utils.qa_stream import iter_qa_pairs, read_metadata, append_jsonl, metadata_path
 from synthetic_data_kit.utils.llm_processing import convert_to_conversation_format, parse_ratings
 
-def curate_qa_pairs(
-    input_path: str,
-    output_path: str,
-    threshold: Optional[float] = None,
-    api_base: Optional[str] = None,
-    model: Optional[str] = None,
-    config_path: Optional[Path] = None,
+
+def _rate_pairs(
+    client: LLMClient,
+    qa_pairs: List[Dict[str, Any]],
+    rating_prompt_template: str,
+    compactor: PromptCompactor,
+    batch_size: int,
+    inference_batch: int,
+    rating_temperature: float,
     verbose: bool = False,
-    provider: Optional[str] = None,
-) -> str:
-    """Clean and filter QA pairs based on quality ratings
+    label: str = "Rating QA pairs",
+    on_rated: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """Rate QA pairs with one judge
     
-    Args:
-        input_path: Path to the input file with QA pairs
-        output_path: Path to save the cleaned output
-        threshold: Quality threshold (1-10)
-        api_base: VLLM API base URL
-        model: Model to use
-        config_path: Path to configuration file
-        verbose: Show detailed output
+    Pairs are sent ``batch_size`` to a prompt and ``inference_batch`` prompts
+    at a time. A batch whose response can't be parsed is retried one pair at
+    a time; pairs that still get no rating are left out. ``on_rated`` is
+    called with each inference batch's rated pairs as soon as it completes.
     
     Returns:
-        Path to the cleaned output file
+        Rated pairs, each with a ``rating`` key
     """
-    # Set verbose either via CLI or via env variable. If its via CLI, set it to env variable
-    if verbose:
-        os.environ['SDK_VERBOSE'] = 'true'
-    else:
-        os.environ['SDK_VERBOSE'] = 'false'
-    
-    # Load input file
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Extract QA pairs
-    qa_pairs = data.get("qa_pairs", [])
-    summary = data.get("summary", "")
-    
-    # If there are no QA pairs or they're already filtered
-    if not qa_pairs:
-        raise ValueError("No QA pairs found in the input file")
-    
-    # Initialize LLM client
-    client = LLMClient(
-        config_path=config_path,
-        provider=provider,
-        api_base=api_base,
-        model_name=model
-    )
-    
-    # Get threshold from args, then config, then default
-    if threshold is None:
-        config = client.config
-        cleanup_config = get_curate_config(config)
-        threshold = cleanup_config.get("threshold", 7.0)
-    
-    # Create QA generator
-    generator = QAGenerator(client, config_path)
-    
-    # Get configuration
-    curate_config = get_curate_config(client.config)
-    
-    # Allow environment variable to override batch size (for debugging)
-    env_batch_size = os.environ.get('SDK_BATCH_SIZE')
-    if env_batch_size and env_batch_size.isdigit():
-        batch_size = int(env_batch_size)
-        inference_batch = int(env_batch_size)
-        if verbose:
-            print(f"Using environment-specified batch size: {batch_size}")
-    else:
-        batch_size = curate_config.get("batch_size", 32)
-        inference_batch = curate_config.get("inference_batch", 32)
-        
-    rating_temperature = curate_config.get("temperature", 0.1)
-    
-    # Get rating prompt template
-    rating_prompt_template = get_prompt(client.config, "qa_rating")
-    
     # Split QA pairs into batches
     batches = []
     for i in range(0, len(qa_pairs), batch_size):
@@ -102,20 +56,17 @@ def curate_qa_pairs(
     # Prepare all message batches for rating
     all_messages = []
     for batch in batches:
-        batch_json = json.dumps(batch, indent=2)
+        batch_json = compactor.json(batch)
         rating_prompt = rating_prompt_template.format(pairs=batch_json)
         messages = [{"role": "system", "content": rating_prompt}]
         all_messages.append(messages)
     
-    # Initialize counters and result containers
-    filtered_pairs = []
-    total_score = 0
-    total_evaluated = 0
-    total_passed = 0
+    # Initialize result container
+    rated_pairs = []
     
     # Process batches with simple progress indicator rather than a detailed bar
     # This avoids conflicts with other output messages
-    print(f"Processing {len(batches)} batches of QA pairs...")
+    print(f"Processing {len(batches)} batches of QA pairs with {client.model}...")
     
     # Only use detailed progress bar in verbose mode
     if verbose:
@@ -130,7 +81,7 @@ def curate_qa_pairs(
         ]
         
         progress_ctx = Progress(*progress_columns)
-        rate_task = progress_ctx.add_task(f"Rating QA pairs", total=len(batches))
+        rate_task = progress_ctx.add_task(label, total=len(batches))
         progress_ctx.start()
     else:
         progress_ctx = None
@@ -151,6 +102,7 @@ def curate_qa_pairs(
         else:
             print(f"Processing batch {batch_num}/{total_batches}")
         
+        rated_before = len(rated_pairs)
         try:
             # Get ratings for the batch
             if verbose:
@@ -180,16 +132,8 @@ def curate_qa_pairs(
                             
                         rated_batch = parse_ratings(response, original_batch)
                         
-                        # Process the rated batch
-                        for pair in rated_batch:
-                            if "rating" in pair:
-                                rating = pair["rating"]
-                                total_score += rating
-                                total_evaluated += 1
-                                
-                                if rating >= threshold:
-                                    filtered_pairs.append(pair)
-                                    total_passed += 1
+                        # Attach the ratings to the pairs as they were sent
+                        rated_pairs.extend(align_ratings(original_batch, rated_batch))
                     except Exception as e:
                         if verbose:
                             print(f"Error processing batch {original_batch_index+1}: {str(e)}")
@@ -201,7 +145,7 @@ def curate_qa_pairs(
                                 print("Attempting to process items individually...")
                             
                             for item in original_batch:
-                                item_json = json.dumps(item, indent=2)
+                                item_json = compactor.json(item)
                                 rating_prompt = rating_prompt_template.format(pairs=item_json)
                                 item_response = client.chat_completion(
                                     [{"role": "system", "content": rating_prompt}],
@@ -209,19 +153,13 @@ def curate_qa_pairs(
                                 )
                                 try:
                                     # This should be a single item
-                                    rated_item = parse_ratings(item_response, [item])
+                                    rated_item = align_ratings([item], parse_ratings(item_response, [item]))
                                     if rated_item and len(rated_item) > 0:
                                         pair = rated_item[0]
                                         if "rating" in pair:
-                                            rating = pair["rating"]
-                                            total_score += rating
-                                            total_evaluated += 1
-                                            
-                                            if rating >= threshold:
-                                                filtered_pairs.append(pair)
-                                                total_passed += 1
-                                                if verbose:
-                                                    print(f"Successfully processed individual item with rating {rating}")
+                                            rated_pairs.append(pair)
+                                            if verbose:
+                                                print(f"Successfully processed individual item with rating {pair['rating']}")
                                 except Exception as inner_e:
                                     if verbose:
                                         print(f"Failed to process individual item: {str(inner_e)}")
@@ -243,6 +181,10 @@ def curate_qa_pairs(
             # Update progress bar if in verbose mode
             if progress_ctx and rate_task:
                 progress_ctx.update(rate_task, advance=current_batch_size)
+        
+        # Persist this batch's ratings before starting the next one
+        if on_rated is not None and len(rated_pairs) > rated_before:
+            on_rated(rated_pairs[rated_before:])
     
     # Stop progress bar if in verbose mode
     if progress_ctx:
@@ -253,18 +195,420 @@ def curate_qa_pairs(
         print(" " * 80, end="\r")
         print("Batch processing complete.")
     
-    # Calculate metrics
-    metrics = {
-        "total": len(qa_pairs),
-        "filtered": len(filtered_pairs),
-        "retention_rate": round(len(filtered_pairs) / len(qa_pairs), 2) if qa_pairs else 0,
-        "avg_score": round(total_score / total_evaluated, 1) if total_evaluated else 0
+    return rated_pairs
+
+
+def _cascade_rate(
+    judge_client: LLMClient,
+    screen_client: LLMClient,
+    qa_pairs: List[Dict[str, Any]],
+    threshold: float,
+    band: float,
+    rate_kwargs: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Rate with a cheap model and re-rate only borderline pairs with the judge
+    
+    Pairs ``screen_client`` rates within ``band`` of the threshold, or fails
+    to rate at all, are re-rated by ``judge_client``; the rest keep the cheap
+    rating.
+    
+    Returns:
+        Tuple of (rated pairs in input order, cascade stats)
+    """
+    screened = _rate_pairs(screen_client, qa_pairs, label="Screening QA pairs", **rate_kwargs)
+    decided = [pair for pair in screened if abs(pair["rating"] - threshold) > band]
+    borderline = [
+        {key: value for key, value in pair.items() if key not in ("rating", "scores")}
+        for pair in screened if abs(pair["rating"] - threshold) <= band
+    ]
+    screened_hashes = {pair_hash(pair) for pair in screened}
+    borderline += [pair for pair in qa_pairs if pair_hash(pair) not in screened_hashes]
+    
+    rejudged = []
+    if borderline:
+        print(f"Re-rating {len(borderline)} borderline pairs with {judge_client.model}")
+        rejudged = _rate_pairs(judge_client, borderline, label="Re-rating borderline pairs", **rate_kwargs)
+    
+    order = {pair_hash(pair): i for i, pair in enumerate(qa_pairs)}
+    rated_pairs = sorted(decided + rejudged, key=lambda pair: order.get(pair_hash(pair), len(order)))
+    stats = {
+        "screen_model": screen_client.model,
+        "screened": len(screened),
+        "accepted": sum(pair["rating"] >= threshold for pair in decided),
+        "rejected": sum(pair["rating"] < threshold for pair in decided),
+        "escalated": len(borderline),
     }
+    return rated_pairs, stats
+
+
+class _Curator:
+    """Filtering and rating steps shared by batch and streaming curate
     
-    # Always print basic stats, even in non-verbose mode
-    print(f"Rated {total_evaluated} QA pairs")
-    print(f"Retained {total_passed} pairs (threshold: {threshold})")
-    print(f"Average score: {metrics['avg_score']}")
+    ``process`` can be called once with every pair or repeatedly with
+    successive windows of them; duplicate detection and all counts carry
+    over between calls.
+    """
+    
+    def __init__(
+        self,
+        input_path: str,
+        metadata: Dict[str, Any],
+        threshold: Optional[float],
+        api_base: Optional[str],
+        model: Optional[str],
+        config_path: Optional[Path],
+        verbose: bool,
+        provider: Optional[str],
+        rethreshold: bool,
+        top_k: Optional[int],
+        resume: bool = True,
+    ):
+        self.verbose = verbose
+        self.rethreshold = rethreshold
+        self.resume = resume
+        
+        # Initialize LLM client (not needed when only re-applying stored ratings)
+        if rethreshold:
+            self.client = None
+            config = load_config(config_path)
+        else:
+            self.client = LLMClient(
+                config_path=config_path,
+                provider=provider,
+                api_base=api_base,
+                model_name=model
+            )
+            config = self.client.config
+        
+        # Get configuration
+        self.curate_config = curate_config = get_curate_config(config)
+        self.generation_config = generation_config = get_generation_config(config)
+        self.compactor = PromptCompactor(generation_config.get("compact_prompts", True))
+        
+        # Get threshold from args, then config, then default
+        if threshold is None:
+            threshold = 0 if top_k else curate_config.get("threshold", 7.0)
+        self.threshold = threshold
+        
+        # Allow environment variable to override batch size (for debugging)
+        env_batch_size = os.environ.get('SDK_BATCH_SIZE')
+        if env_batch_size and env_batch_size.isdigit():
+            batch_size = int(env_batch_size)
+            inference_batch = int(env_batch_size)
+            if verbose:
+                print(f"Using environment-specified batch size: {batch_size}")
+        else:
+            batch_size = curate_config.get("batch_size", 32)
+            inference_batch = curate_config.get("inference_batch", 32)
+        # Pairs in flight at once: the concurrent window of rating requests
+        self.window_size = batch_size * inference_batch
+        
+        self.rate_kwargs = {
+            "rating_prompt_template": get_prompt(config, "qa_rating"),
+            "compactor": self.compactor,
+            "batch_size": batch_size,
+            "inference_batch": inference_batch,
+            "rating_temperature": curate_config.get("temperature", 0.1),
+            "verbose": verbose,
+        }
+        
+        # Optional cheap judge for cascade rating
+        self.screen_client = None
+        cascade_config = curate_config.get("cascade") or {}
+        self.cascade_band = cascade_config.get("band", 1.0)
+        if cascade_config.get("enabled", False) and not rethreshold:
+            self.screen_client = LLMClient(
+                config_path=config_path,
+                provider=cascade_config.get("provider"),
+                api_base=cascade_config.get("api_base"),
+                api_key=cascade_config.get("api_key"),
+                model_name=cascade_config.get("model")
+            )
+        
+        # Near-duplicates are checked against every pair kept so far
+        self.dedup_index = None
+        if generation_config.get("enable_deduplication", True):
+            self.dedup_index = MinHashLSH(threshold=generation_config.get("similarity_threshold", 0.8))
+        
+        # Fingerprints of earlier runs (other than the create run that
+        # produced this file). Without the run id this file's own pairs
+        # would look known, so the check is skipped
+        self.run_id = metadata.get("fingerprint_run")
+        self.check_known = self.run_id is not None
+        if self.run_id is None:
+            self.run_id = new_run_id()
+            if generation_config.get("fingerprint_store"):
+                print("Warning: input does not record the run that created it, "
+                      "skipping the fingerprint store check")
+        
+        # Source chunks for the grounding check
+        self.grounding_index = None
+        if curate_config.get("grounding_check", True):
+            source = metadata.get("source")
+            chunks = load_source_chunks(source, generation_config)
+            if chunks is not None:
+                self.grounding_index = GroundingIndex(chunks)
+            elif source:
+                print(f"Warning: source document {source} not found, skipping grounding check")
+            else:
+                print("Warning: input does not record its source document, skipping grounding check")
+        
+        # Stored ratings are reused only under the same judge settings;
+        # re-thresholding reuses whatever was stored
+        judge_fingerprint = None
+        if not rethreshold:
+            screen = (self.screen_client.model, self.cascade_band, threshold) if self.screen_client else None
+            judge_fingerprint = RunJournal.make_fingerprint(
+                self.client.model, self.rate_kwargs["rating_prompt_template"],
+                self.rate_kwargs["rating_temperature"], screen
+            )
+        self.rating_store = RatingStore(curate_config.get("rating_store") or default_store_path(input_path),
+                                        fingerprint=judge_fingerprint)
+        
+        # Running counts for metrics
+        self.input_count = 0
+        self.duplicates_removed = 0
+        self.known_removed = 0
+        self.prefilter_counts = {rule: 0 for rule in PREFILTER_RULES} if curate_config.get("prefilter", True) else {}
+        self.grounding_rejected = 0
+        self.grounding_total = 0.0
+        self.grounding_count = 0
+        self.stored_count = 0
+        self.unrated_count = 0
+        self.total_score = 0
+        self.total_evaluated = 0
+        self.total_passed = 0
+        self.cascade_stats = None
+    
+    def process(self, qa_pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter pairs and rate the survivors
+        
+        Returns:
+            Rated pairs in input order, each with a ``rating`` key
+        """
+        self.input_count += len(qa_pairs)
+        
+        # Don't pay to rate near-duplicates
+        if self.dedup_index is not None and qa_pairs:
+            qa_pairs, removed = deduplicate(qa_pairs, index=self.dedup_index)
+            self.duplicates_removed += removed
+        
+        # Nor pairs already known from earlier runs
+        if self.check_known:
+            count = len(qa_pairs)
+            qa_pairs = filter_known_items(qa_pairs, self.generation_config, self.run_id, update=False)
+            self.known_removed += count - len(qa_pairs)
+        
+        # Nor pairs that break simple rules and would fail the threshold anyway
+        if self.curate_config.get("prefilter", True):
+            qa_pairs, counts = prefilter_pairs(qa_pairs, self.curate_config)
+            for rule, count in counts.items():
+                self.prefilter_counts[rule] += count
+        
+        # Nor answers the source text doesn't support
+        if self.grounding_index is not None and qa_pairs:
+            scores = self.grounding_index.score_pairs(qa_pairs)
+            self.grounding_total += float(scores.sum())
+            self.grounding_count += len(scores)
+            min_grounding = self.curate_config.get("min_grounding", 0.0)
+            if min_grounding:
+                grounded = scores >= min_grounding
+                self.grounding_rejected += int((~grounded).sum())
+                qa_pairs = [pair for pair, keep in zip(qa_pairs, grounded) if keep]
+        
+        # Reuse stored ratings; only new or changed pairs go to the judge
+        input_pairs = qa_pairs
+        if self.resume:
+            rated_pairs, qa_pairs = self.rating_store.lookup(qa_pairs)
+        else:
+            rated_pairs = []
+        self.stored_count += len(rated_pairs)
+        if self.rethreshold:
+            self.unrated_count += len(qa_pairs)
+            qa_pairs = []
+        
+        # Rate, optionally screening with a cheap model first. Ratings are
+        # stored as each batch completes, so an interrupted run resumes from there
+        if qa_pairs:
+            try:
+                if self.screen_client is not None:
+                    newly_rated, stats = _cascade_rate(
+                        self.client, self.screen_client, qa_pairs, self.threshold, self.cascade_band, self.rate_kwargs
+                    )
+                    self._add_cascade_stats(stats)
+                    judge = f"{stats['screen_model']} -> {self.client.model}"
+                    rated_pairs += self.rating_store.record(newly_rated, judge=judge)
+                else:
+                    judge = self.client.model
+                    _rate_pairs(self.client, qa_pairs, **self.rate_kwargs, on_rated=lambda batch: rated_pairs.extend(
+                        self.rating_store.record(batch, judge=judge)
+                    ))
+            except KeyboardInterrupt:
+                print(f"\nInterrupted: ratings so far are saved in {self.rating_store.path}; "
+                      f"rerun to continue from there")
+                raise
+            order = {pair_hash(pair): i for i, pair in enumerate(input_pairs)}
+            rated_pairs.sort(key=lambda pair: order.get(pair_hash(pair), len(order)))
+        
+        self.total_evaluated += len(rated_pairs)
+        self.total_score += sum(pair["rating"] for pair in rated_pairs)
+        return rated_pairs
+    
+    def _add_cascade_stats(self, stats: Dict[str, Any]) -> None:
+        if self.cascade_stats is None:
+            self.cascade_stats = stats
+            return
+        for key, value in stats.items():
+            if key != "screen_model":
+                self.cascade_stats[key] += value
+    
+    def accept(self, rated_pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rated pairs that pass the threshold"""
+        passed = [pair for pair in rated_pairs if pair["rating"] >= self.threshold]
+        self.total_passed += len(passed)
+        return passed
+    
+    def metrics(self, kept: int, semantic_removed: int = 0, top_k_dropped: int = 0) -> Dict[str, Any]:
+        metrics = {
+            "total": self.input_count,
+            "stored_ratings_used": self.stored_count,
+            "duplicates_removed": self.duplicates_removed,
+            "known_removed": self.known_removed,
+            "prefilter_rejected": dict(self.prefilter_counts),
+            "grounding_rejected": self.grounding_rejected,
+            "semantic_duplicates_removed": semantic_removed,
+            "top_k_dropped": top_k_dropped,
+            "filtered": kept,
+            "retention_rate": round(kept / self.input_count, 2) if self.input_count else 0,
+            "avg_score": round(self.total_score / self.total_evaluated, 1) if self.total_evaluated else 0
+        }
+        if self.rethreshold:
+            metrics["unrated"] = self.unrated_count
+        if self.cascade_stats is not None:
+            metrics["cascade"] = dict(self.cascade_stats)
+        if self.grounding_index is not None:
+            metrics["avg_grounding"] = round(self.grounding_total / self.grounding_count, 2) if self.grounding_count else 0
+        return metrics
+    
+    def report(self) -> None:
+        """Print what was filtered before rating and how rating went"""
+        verbose = self.verbose
+        if verbose or self.duplicates_removed:
+            print(f"Deduplication: removed {self.duplicates_removed} near-duplicate QA pairs")
+        if verbose or self.known_removed:
+            print(f"Removed {self.known_removed} QA pairs already seen in earlier runs")
+        if verbose or any(self.prefilter_counts.values()):
+            print(f"Pre-filter rejected {sum(self.prefilter_counts.values())} pairs before rating: "
+                  + ", ".join(f"{rule}={count}" for rule, count in self.prefilter_counts.items()))
+        if verbose or self.grounding_rejected:
+            print(f"Grounding check rejected {self.grounding_rejected} pairs")
+        if self.stored_count:
+            print(f"Reused {self.stored_count} stored ratings from {self.rating_store.path}")
+        if self.unrated_count:
+            print(f"Dropped {self.unrated_count} pairs without a stored rating")
+        
+        # Always print basic stats, even in non-verbose mode
+        print(f"Rated {self.total_evaluated} QA pairs")
+        print(f"Retained {self.total_passed} pairs (threshold: {self.threshold})")
+        avg_score = round(self.total_score / self.total_evaluated, 1) if self.total_evaluated else 0
+        print(f"Average score: {avg_score}")
+        self.compactor.report()
+
+
+def curate_qa_pairs(
+    input_path: str,
+    output_path: str,
+    threshold: Optional[float] = None,
+    api_base: Optional[str] = None,
+    model: Optional[str] = None,
+    config_path: Optional[Path] = None,
+    verbose: bool = False,
+    provider: Optional[str] = None,
+    rethreshold: bool = False,
+    top_k: Optional[int] = None,
+    stream: Optional[bool] = None,
+    resume: bool = True,
+) -> str:
+    """Clean and filter QA pairs based on quality ratings
+    
+    Every rating is stored in a side file keyed by pair hash (``curate.rating_store``,
+    by default ``<input>.ratings.jsonl``), and only pairs without a stored
+    rating are sent to the judge.
+    
+    Args:
+        input_path: Path to the input file with QA pairs
+        output_path: Path to save the cleaned output
+        threshold: Quality threshold (1-10)
+        api_base: VLLM API base URL
+        model: Model to use
+        config_path: Path to configuration file
+        verbose: Show detailed output
+        rethreshold: Rebuild the output from stored ratings only, without an
+            LLM client; pairs without a stored rating are dropped
+        top_k: Keep only the ``top_k`` best-rated pairs. The threshold then
+            defaults to 0, so exactly ``top_k`` pairs are kept when there
+            are enough
+        stream: Use ``curate_qa_pairs_streaming``; the default is to stream
+            ``.jsonl`` inputs only
+        resume: Reuse stored ratings, including those of an interrupted run;
+            False re-rates every pair
+    
+    Returns:
+        Path to the cleaned output file
+    """
+    # Set verbose either via CLI or via env variable. If its via CLI, set it to env variable
+    if verbose:
+        os.environ['SDK_VERBOSE'] = 'true'
+    else:
+        os.environ['SDK_VERBOSE'] = 'false'
+    
+    if stream is None:
+        stream = input_path.endswith(".jsonl")
+    if stream:
+        return curate_qa_pairs_streaming(
+            input_path, output_path, threshold, api_base, model, config_path, verbose,
+            provider=provider, rethreshold=rethreshold, top_k=top_k, resume=resume
+        )
+    
+    # Load input file
+    with open(input_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    # Extract QA pairs
+    qa_pairs = data.get("qa_pairs", [])
+    summary = data.get("summary", "")
+    
+    # If there are no QA pairs or they're already filtered
+    if not qa_pairs:
+        raise ValueError("No QA pairs found in the input file")
+    
+    curator = _Curator(input_path, data, threshold, api_base, model, config_path, verbose,
+                       provider, rethreshold, top_k, resume)
+    rated_pairs = curator.process(qa_pairs)
+    filtered_pairs = curator.accept(rated_pairs)
+    
+    # Collapse paraphrases, keeping the best-rated version of each question
+    retained_count = len(filtered_pairs)
+    filtered_pairs = semantic_deduplicate_items(filtered_pairs, curator.generation_config, verbose)
+    
+    # Keep only the best K, if asked for a fixed dataset size
+    deduped_retained_count = len(filtered_pairs)
+    if top_k:
+        filtered_pairs = select_top_k(filtered_pairs, top_k)
+    
+    # Calculate metrics
+    metrics = curator.metrics(
+        len(filtered_pairs),
+        semantic_removed=retained_count - deduped_retained_count,
+        top_k_dropped=deduped_retained_count - len(filtered_pairs)
+    )
+    
+    curator.report()
+    if top_k:
+        print(f"Kept top {len(filtered_pairs)} pairs (top-k: {top_k})")
+    
+    # Remember what made it into the curated set
+    record_items(filtered_pairs, curator.generation_config, curator.run_id)
     
     # Convert to conversation format
     conversations = convert_to_conversation_format(filtered_pairs)
@@ -284,4 +628,140 @@ def curate_qa_pairs(
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(result, f, indent=2)
     
-    return output_path
\ No newline at end of file
+    return output_path
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def curate_qa_pairs_streaming(
+    input_path: str,
+    output_path: str,
+    threshold: Optional[float] = None,
+    api_base: Optional[str] = None,
+    model: Optional[str] = None,
+    config_path: Optional[Path] = None,
+    verbose: bool = False,
+    provider: Optional[str] = None,
+    rethreshold: bool = False,
+    top_k: Optional[int] = None,
+    resume: bool = True,
+) -> str:
+    """Curate QA pairs one rating window at a time
+    
+    Pairs are read incrementally (one per line from ``.jsonl``, or element
+    by element from the ``qa_pairs`` array of a ``.json`` file) and rated in
+    windows of ``batch_size * inference_batch`` pairs. Accepted pairs are
+    appended to a JSONL output as each window completes, and running metrics
+    are rewritten next to it (``<output>.metrics.json``), so a crash keeps
+    everything finished so far. With ``top_k`` only the best K are held, in a
+    heap, and written at the end. The source document and run id of a JSONL
+    file are kept in a ``<file>.meta.json`` sidecar, read for the input and
+    written for the output.
+    
+    Memory is bounded by the window, except for the near-duplicate index and
+    the rating store, which keep a small fingerprint per pair. Semantic
+    deduplication needs all pairs at once and is skipped.
+    
+    Args:
+        Same as ``curate_qa_pairs``; an ``output_path`` ending in ``.json`` is
+        written as ``.jsonl``
+    
+    Returns:
+        Path to the JSONL output file
+    """
+    metadata = read_metadata(input_path)
+    curator = _Curator(input_path, metadata, threshold, api_base, model, config_path, verbose,
+                       provider, rethreshold, top_k, resume)
+    if curator.generation_config.get("semantic_dedup", False):
+        print("Semantic deduplication needs every pair at once and is skipped when streaming")
+    
+    if output_path.endswith(".json"):
+        output_path = output_path[:-len(".json")] + ".jsonl"
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    open(output_path, 'w', encoding='utf-8').close()
+    metrics_path = os.path.splitext(output_path)[0] + ".metrics.json"
+    summary = metadata.get("summary", "")
+    # Accepted pairs are recorded under this run, so curating the output again excludes them
+    output_metadata = {"summary": summary, "fingerprint_run": curator.run_id}
+    if metadata.get("source"):
+        output_metadata["source"] = metadata["source"]
+    _write_json_atomic(metadata_path(output_path), output_metadata)
+    
+    selector = TopKSelector(top_k) if top_k else None
+    position = 0
+    kept = 0
+    pairs = iter_qa_pairs(input_path)
+    while True:
+        window = list(itertools.islice(pairs, curator.window_size))
+        if not window:
+            break
+        accepted = curator.accept(curator.process(window))
+        if selector is not None:
+            for pair in accepted:
+                selector.push((position, pair), pair["rating"])
+                position += 1
+        else:
+            append_jsonl(output_path, accepted)
+            record_items(accepted, curator.generation_config, curator.run_id)
+            kept += len(accepted)
+        _write_json_atomic(metrics_path, {"summary": summary, "metrics": curator.metrics(kept)})
+    
+    if curator.input_count == 0:
+        raise ValueError("No QA pairs found in the input file")
+    
+    top_k_dropped = 0
+    if selector is not None:
+        selected = [pair for _, pair in sorted(selector.results(), key=lambda entry: entry[0])]
+        append_jsonl(output_path, selected)
+        record_items(selected, curator.generation_config, curator.run_id)
+        kept = len(selected)
+        top_k_dropped = curator.total_passed - kept
+    _write_json_atomic(metrics_path, {
+        "summary": summary, "metrics": curator.metrics(kept, top_k_dropped=top_k_dropped)
+    })
+    
+    curator.report()
+    if top_k:
+        print(f"Kept top {kept} pairs (top-k: {top_k})")
+    
+    return output_path
+
+
+def apply_top_k(output_paths: List[str], top_k: int) -> int:
+    """Trim curated outputs to the ``top_k`` best-rated pairs across all of them
+    
+    Goes over the files twice. The selection pass streams each file's pairs,
+    holding only the positions of the best ``top_k``; the second pass loads
+    one file at a time and rewrites it with its share.
+    
+    Returns:
+        Number of pairs kept
+    """
+    selector = TopKSelector(top_k)
+    for file_index, path in enumerate(output_paths):
+        for pair_index, pair in enumerate(iter_qa_pairs(path)):
+            selector.push((file_index, pair_index), pair.get("rating", 0))
+    
+    selected = set(selector.results())
+    for file_index, path in enumerate(output_paths):
+        with open(path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        qa_pairs = result.get("qa_pairs", [])
+        kept = [pair for pair_index, pair in enumerate(qa_pairs) if (file_index, pair_index) in selected]
+        result["qa_pairs"] = kept
+        result["conversations"] = convert_to_conversation_format(kept)
+        metrics = result.setdefault("metrics", {})
+        metrics["top_k_dropped"] = metrics.get("top_k_dropped", 0) + len(qa_pairs) - len(kept)
+        metrics["filtered"] = len(kept)
+        total = metrics.get("total")
+        if total:
+            metrics["retention_rate"] = round(len(kept) / total, 2)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    
+    return len(selected)
@@ -7,6 +7,7 @@
 
 import os
 import sys
+import itertools
 import requests
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -33,9 +34,20 @@ def _check_pdf_url(url: str) -> bool:
         return False
 
 
+def _pdf_parser(config: Optional[Dict[str, Any]]):
+    """PDFParser with the backend and page parallelism from the ingest config"""
+    from synthetic_data_kit.parsers.pdf_parser import PDFParser
+
+    ingest_config = (config or {}).get("ingest") or {}
+    return PDFParser(
+        backend=ingest_config.get("pdf_backend", "pdfminer"),
+        workers=ingest_config.get("pdf_page_workers"),
+        parallel_min_pages=ingest_config.get("pdf_parallel_min_pages", 64),
+    )
+
+
 def determine_parser(file_path: str, config: Dict[str, Any], multimodal: bool = False):
     """Determine the appropriate parser for a file or URL"""
-    from synthetic_data_kit.parsers.pdf_parser import PDFParser
     from synthetic_data_kit.parsers.html_parser import HTMLParser
     from synthetic_data_kit.parsers.youtube_parser import YouTubeParser
     from synthetic_data_kit.parsers.docx_parser import DOCXParser
@@ -46,12 +58,17 @@ def determine_parser(file_path: str, config: Dict[str, Any], multimodal: bool =
     ext = os.path.splitext(file_path)[1].lower()
     if multimodal:
         if ext in [".pdf", ".docx", ".pptx"]:
-            return MultimodalParser()
+            ingest_config = (config or {}).get("ingest") or {}
+            return MultimodalParser(
+                workers=ingest_config.get("pdf_page_workers"),
+                parallel_min_pages=ingest_config.get("pdf_parallel_min_pages", 64),
+                min_image_size=ingest_config.get("min_image_size", 0),
+            )
         else:
             raise ValueError(f"Unsupported file extension for multimodal parsing: {ext}")
 
     if ext == ".pdf":
-        return PDFParser()
+        return _pdf_parser(config)
 
     # Check if it's a URL
     if file_path.startswith(("http://", "https://")):
@@ -60,7 +77,7 @@ def determine_parser(file_path: str, config: Dict[str, Any], multimodal: bool =
             return YouTubeParser()
         # PDF URL
         elif _check_pdf_url(file_path):
-            return MultimodalParser() if multimodal else PDFParser()
+            return MultimodalParser() if multimodal else _pdf_parser(config)
         # HTML URL
         else:
             return HTMLParser()
@@ -83,6 +100,27 @@ def determine_parser(file_path: str, config: Dict[str, Any], multimodal: bool =
     raise FileNotFoundError(f"File not found: {file_path}")
 
 
+# Ingest settings that only affect how files are scheduled, not what is parsed
+_SCHEDULING_KEYS = ("workers", "file_timeout", "max_memory_mb", "pdf_page_workers", "pdf_parallel_min_pages")
+
+
+def ingest_settings(file_path: str, config: Optional[Dict[str, Any]], multimodal: bool = False) -> str:
+    """Fingerprint of the parser and settings that determine a file's parsed output
+
+    Changes when the parser class, the package version or the ingest config
+    changes, so the manifest re-parses files after an upgrade.
+    """
+    from synthetic_data_kit import __version__
+    from synthetic_data_kit.utils.manifest import settings_fingerprint
+
+    parser = determine_parser(file_path, config, multimodal)
+    ingest_config = {
+        key: value for key, value in ((config or {}).get("ingest") or {}).items()
+        if key not in _SCHEDULING_KEYS
+    }
+    return settings_fingerprint(type(parser).__name__, __version__, multimodal, ingest_config)
+
+
 def process_file(
     file_path: str,
     output_dir: Optional[str] = None,
@@ -102,7 +140,8 @@ def process_file(
     Returns:
         Path to the output file
     """
-    from synthetic_data_kit.utils.lance_utils import create_lance_dataset
+    from synthetic_data_kit.utils.lance_utils import write_lance_stream
+    from synthetic_data_kit.utils.image_dedup import ImageRegistry, dedupe_rows
     import pyarrow as pa
     # Create output directory if it doesn't exist
     if not os.path.exists(output_dir):
@@ -111,8 +150,12 @@ def process_file(
     # Determine parser based on file type
     parser = determine_parser(file_path, config, multimodal)
 
-    # Parse the file
-    content = parser.parse(file_path)
+    # Parse the file; rows of parsers that yield them are written as they are extracted
+    if hasattr(parser, "iter_rows"):
+        rows = parser.iter_rows(file_path)
+    else:
+        rows = iter(parser.parse(file_path))
+    first_row = next(rows, None)
 
     # Generate output filename if not provided
     if not output_name:
@@ -138,14 +181,26 @@ def process_file(
     output_name += ".lance"
     output_path = os.path.join(output_dir, output_name)
 
-    schema = pa.schema([
-        pa.field("text", pa.string()),
-        pa.field("image", pa.binary())
-    ]) if multimodal else pa.schema([
-        pa.field("text", pa.string())
-    ])
-
-    create_lance_dataset(content, output_path, schema=schema)
-
+    fields = [pa.field("text", pa.string())]
+    if multimodal:
+        # Each distinct image's bytes are stored once; repeats reference it by image_id.
+        # Across the output directory only when opted in; references are resolved at create
+        fields.append(pa.field("image", pa.binary()))
+        fields.append(pa.field("image_id", pa.string()))
+        ingest_config = (config or {}).get("ingest") or {}
+        registry = ImageRegistry(output_dir, output_path) if ingest_config.get("dedup_images", False) else None
+        if first_row is not None:
+            rows = dedupe_rows(itertools.chain([first_row], rows), registry, ingest_config.get("min_image_size", 0))
+            first_row = next(rows, None)
+    if first_row and "page" in first_row:
+        # Parsers that split by page keep the page number with its text
+        fields.append(pa.field("page", pa.int32()))
+    schema = pa.schema(fields)
+
+    if first_row is not None:
+        write_lance_stream(itertools.chain([first_row], rows), output_path, schema=schema)
+        if multimodal and registry is not None:
+            # Only a written dataset may be referenced by others
+            registry.commit()
 
     return output_path
@@ -32,9 +32,12 @@ def convert_format(
     Returns:
         Path to the output file or directory
     """
-    # Load input file
+    # Load input file (JSONL from streaming curate holds one QA pair per line)
     with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        if input_path.endswith(".jsonl"):
+            data = [json.loads(line) for line in f if line.strip()]
+        else:
+            data = json.load(f)
     
     # Extract data based on known structures
     # Try to handle the case where we have QA pairs or conversations
@@ -12,6 +12,24 @@ from pathlib import Path
 
 from synthetic_data_kit.models.llm_client import LLMClient
 from synthetic_data_kit.utils.config import get_prompt, get_generation_config
+from synthetic_data_kit.utils.text import PromptCompactor
+from synthetic_data_kit.utils.chunk_selection import plan_chunks
+from synthetic_data_kit.utils.dedup import NoveltyTracker
+from synthetic_data_kit.utils.fingerprint_store import filter_known_items, new_run_id
+from synthetic_data_kit.utils.journal import journaled
+
+def cot_examples_to_conversations(examples: List[Dict[str, Any]]) -> List[List[Dict[str, str]]]:
+    """Format CoT examples as system/user/assistant conversations"""
+    conversations = []
+    for example in examples:
+        if "question" in example and "reasoning" in example and "answer" in example:
+            conv = [
+                {"role": "system", "content": "You are a helpful assistant that provides detailed explanations."},
+                {"role": "user", "content": example["question"]},
+                {"role": "assistant", "content": f"Let me think through this step by step:\n\n{example['reasoning']}\n\nSo the answer is: {example['answer']}"}
+            ]
+            conversations.append(conv)
+    return conversations
 
 class COTGenerator:
     """Generates chain-of-thought reasoning examples"""
@@ -21,6 +39,15 @@ class COTGenerator:
         self.client = client
         self.config = client.config
         self.generation_config = get_generation_config(self.config)
+        
+        # Tracks input tokens saved by whitespace/JSON compaction
+        self.compactor = PromptCompactor(self.generation_config.get("compact_prompts", True))
+        
+        # Why the last chunked generation stopped dispatching chunks
+        self.stop_reason = None
+        
+        # Optional RunJournal; completed LLM calls are replayed from it on resume
+        self.journal = None
     
     def parse_json_output(self, output_text: str) -> Optional[List[Dict]]:
         """Parse JSON from LLM output text"""
@@ -89,11 +116,11 @@ class COTGenerator:
             print(f"Generating {num_examples} CoT examples (single call)...")
         
         messages = [{"role": "system", "content": prompt}]
-        response = self.client.chat_completion(
+        response = journaled(self.journal, "cot:single", lambda: self.client.chat_completion(
             messages, 
             temperature=temperature,
             max_tokens=max_tokens
-        )
+        ))
         
         # Parse response
         examples = self.parse_json_output(response)
@@ -109,22 +136,16 @@ class COTGenerator:
         return examples
     
     def _generate_with_chunking(self, document_text: str, num_examples: int) -> List[Dict[str, Any]]:
-        """Generate CoT examples using chunking strategy (copied from QA generator)"""
-        from synthetic_data_kit.utils.text import split_into_chunks
-        
+        """Generate CoT examples using chunking strategy (same chunk planning as QA generator)"""
         verbose = os.environ.get('SDK_VERBOSE', 'false').lower() == 'true'
         
         # Get generation config
-        chunk_size = self.generation_config.get("chunk_size", 4000)
         temperature = self.generation_config.get("temperature", 0.7)
-        overlap = self.generation_config.get("overlap", 200)
         batch_size = self.generation_config.get("batch_size", 32)
         
-        # Split text into chunks
-        chunks = split_into_chunks(
-            document_text, 
-            chunk_size=chunk_size, 
-            overlap=overlap
+        # Split text into chunks and pick what to send
+        chunks, chunk_indices, chunk_budgets = plan_chunks(
+            document_text, num_examples, self.generation_config, verbose
         )
         
         if verbose:
@@ -133,18 +154,17 @@ class COTGenerator:
             print(f"Using batch size of {batch_size}")
         
         all_examples = []
-        examples_per_chunk = max(1, round(num_examples / len(chunks)))
         
         # Get CoT generation prompt template
         cot_prompt_template = get_prompt(self.config, "cot_generation")
         
         # Prepare all message batches
         all_messages = []
-        for i, chunk in enumerate(chunks):
+        for i, budget in zip(chunk_indices, chunk_budgets):
             # Format the prompt with text
             cot_prompt = cot_prompt_template.format(
-                num_examples=examples_per_chunk,
-                text=chunk
+                num_examples=budget,
+                text=chunks[i]
             )
             
             messages = [
@@ -152,22 +172,29 @@ class COTGenerator:
             ]
             all_messages.append(messages)
         
-        print(f"Processing {len(chunks)} chunks to generate CoT examples...")
+        print(f"Processing {len(all_messages)} chunks to generate CoT examples...")
         
-        # Process in batches (same logic as QA generator)
-        for batch_start in range(0, len(chunks), batch_size):
+        # Stop dispatching once new examples are mostly repeats
+        novelty = NoveltyTracker.from_config(self.generation_config, target=num_examples)
+        drop_repeats = self.generation_config.get("enable_deduplication", True)
+        self.stop_reason = "all chunks processed"
+        
+        # Process in batches (same logic as QA generator), smaller at first so
+        # saturation is checked early
+        dispatch_ranges = novelty.dispatch_ranges(len(all_messages), batch_size)
+        for batch_num, (batch_start, batch_end) in enumerate(dispatch_ranges, 1):
             # Check if we've already generated enough examples
             if len(all_examples) >= num_examples:
                 if verbose:
                     print(f"Reached target of {num_examples} examples. Stopping processing.")
                 break
+            if novelty.saturated():
+                self.stop_reason = f"saturated: {novelty.describe()}"
+                break
                 
-            batch_end = min(batch_start + batch_size, len(chunks))
             batch_messages = all_messages[batch_start:batch_end]
             current_batch_size = len(batch_messages)
-            
-            batch_num = batch_start//batch_size + 1
-            total_batches = (len(chunks) + batch_size - 1)//batch_size
+            total_batches = len(dispatch_ranges)
             
             # Simple progress indicator for non-verbose mode
             if not verbose:
@@ -176,12 +203,12 @@ class COTGenerator:
                 print(f"Processing batch {batch_num}/{total_batches} with {current_batch_size} chunks")
             
             try:
-                # Process the batch
-                batch_responses = self.client.batch_completion(
+                # Process the batch (or replay it from the journal)
+                batch_responses = journaled(self.journal, f"cot:{batch_start}", lambda: self.client.batch_completion(
                     batch_messages,
                     temperature=temperature,
                     batch_size=batch_size
-                )
+                ))
                 
                 # Process each response in the batch
                 for j, response in enumerate(batch_responses):
@@ -192,8 +219,15 @@ class COTGenerator:
                         break
                         
                     chunk_index = batch_start + j
+                    if chunk_index < len(chunk_indices):
+                        chunk_index = chunk_indices[chunk_index]
                     chunk_examples = self.parse_json_output(response)
                     
+                    if chunk_examples:
+                        novel = novelty.observe(chunk_examples)
+                        if drop_repeats:
+                            chunk_examples = [e for e, is_novel in zip(chunk_examples, novel) if is_novel]
+                    
                     if chunk_examples:
                         # Only add examples up to the target limit
                         remaining_examples = num_examples - len(all_examples)
@@ -222,7 +256,10 @@ class COTGenerator:
             print("Batch processing complete.")
         
         # Always print summary information
+        if len(all_examples) >= num_examples:
+            self.stop_reason = "target reached"
         print(f"Generated {len(all_examples)} CoT examples total (requested: {num_examples})")
+        print(f"Stopped: {self.stop_reason} (novelty rate {novelty.rate:.0%} over {novelty.seen} generated examples)")
         return all_examples
     
     def enhance_with_cot(self, conversations: List[Dict], include_simple_steps: bool = False) -> List[Dict]:
@@ -237,7 +274,7 @@ class COTGenerator:
             print(f"Debug - First conversation: {json.dumps(conversations[0] if conversations else {}, indent=2)[:100]}...")
         
         # Format the prompt
-        conversation_str = json.dumps(conversations, ensure_ascii=False, indent=2)
+        conversation_str = self.compactor.json(conversations, ensure_ascii=False)
         prompt = prompt_template.format(
             conversations=conversation_str,
             include_simple_steps=str(include_simple_steps).lower()
@@ -280,27 +317,24 @@ class COTGenerator:
         else:
             os.environ['SDK_VERBOSE'] = 'false'
         
+        document_text = self.compactor.text(document_text)
+        
         # Generate summary first (helpful context)
         max_context_length = self.generation_config.get("max_context_length", 8000)
-        summary = self.client.chat_completion(
+        summary = journaled(self.journal, "summary", lambda: self.client.chat_completion(
             [{"role": "system", "content": "Summarize this document in 2-3 sentences."},
              {"role": "user", "content": document_text[0:max_context_length]}], 
             temperature=0.1
-        )
+        ))
         
         # Generate CoT examples
         examples = self.generate_cot_examples(document_text, num_examples)
+        # Near-duplicates were already dropped during generation
+        examples = filter_known_items(examples, self.generation_config, new_run_id(),
+                                      verbose=verbose, label="CoT examples")
         
         # Format into simple conversation format as well
-        conversations = []
-        for example in examples:
-            if "question" in example and "reasoning" in example and "answer" in example:
-                conv = [
-                    {"role": "system", "content": "You are a helpful assistant that provides detailed explanations."},
-                    {"role": "user", "content": example["question"]},
-                    {"role": "assistant", "content": f"Let me think through this step by step:\n\n{example['reasoning']}\n\nSo the answer is: {example['answer']}"}
-                ]
-                conversations.append(conv)
+        conversations = cot_examples_to_conversations(examples)
         
         # Prepare result
         result = {
@@ -311,5 +345,6 @@ class COTGenerator:
         
         # Print stats
         print(f"Generated {len(examples)} chain-of-thought examples")
+        self.compactor.report()
         
         return result
@@ -11,8 +11,8 @@ from typing import Optional
 from synthetic_data_kit.models.llm_client import LLMClient
 from synthetic_data_kit.utils.config import load_config, get_generation_config
 from synthetic_data_kit.utils.text import split_into_chunks
+from synthetic_data_kit.utils.image_pipeline import ImagePipeline
 import math
-import base64
 
 class MultimodalQAGenerator:
     """Generates Multimodal Question Answering data (text QA from text+image context)"""
@@ -20,46 +20,134 @@ class MultimodalQAGenerator:
         self.client = client
         self.config = load_config(str(config_path) if config_path else None) if config_path else client.config
         self.generation_config = get_generation_config(self.config)
+        self.image_pipeline = ImagePipeline.from_config(self.generation_config)
 
-    def generate_qa_pairs(self, documents, num_pairs=25, verbose=False):
-        # Concatenate all text and collect all images (if any)
-        all_text = " ".join([doc["text"] for doc in documents])
-        images = [doc.get("image", None) for doc in documents]
-        # Chunk the text
+    @staticmethod
+    def _pages(documents):
+        """Group rows into (text, image keys) units
+
+        Multimodal ingest writes a page's text on its first row and one row
+        per image, so a unit starts at each row with new text; rows of older
+        datasets that repeat the same text for every image join one unit too.
+        Image keys are image ids where present, else row positions.
+        """
+        pages = []
+        current = None
+        for position, doc in enumerate(documents):
+            text = doc.get("text") or ""
+            marker = (doc.get("page"), text)
+            if current is None or (text and marker != current["marker"]):
+                current = {"marker": marker, "text": text, "images": []}
+                pages.append(current)
+            has_image = doc.get("image") is not None or doc.get("has_image")
+            key = doc.get("image_id") or (position if has_image else None)
+            if key is not None and key not in current["images"]:
+                current["images"].append(key)
+        return pages
+
+    @staticmethod
+    def _image_sources(documents, image_loader):
+        """Map each image key to its bytes, or to None where ``image_loader`` provides them
+
+        Rows read with only a ``has_image`` flag, and references to images
+        stored elsewhere (an ``image_id`` without bytes), are loaded through
+        ``image_loader``; without one, references are left out.
+        """
+        sources = {}
+        for position, doc in enumerate(documents):
+            key = doc.get("image_id") or position
+            if doc.get("image") is not None:
+                if sources.get(key) is None:
+                    sources[key] = doc["image"]
+            elif image_loader is not None and (doc.get("has_image") or doc.get("image_id")):
+                sources.setdefault(key, None)
+        return sources
+
+    def _chunks(self, pages, chunk_size, overlap):
+        """Pack consecutive pages into chunks, each with the images of its own pages"""
+        chunks = []
+        text, images = "", []
+        for page in pages:
+            if text and len(text) + len(page["text"]) + 1 > chunk_size:
+                chunks.append((text, images))
+                text, images = "", []
+            if len(page["text"]) > chunk_size:
+                # A page too long for one chunk: every piece keeps the page's images
+                for piece in split_into_chunks(page["text"], chunk_size=chunk_size, overlap=overlap):
+                    chunks.append((piece, list(page["images"])))
+                continue
+            text = f"{text} {page['text']}" if text else page["text"]
+            images.extend(key for key in page["images"] if key not in images)
+        if text or images:
+            chunks.append((text, images))
+        return chunks
+
+    def _encode_images(self, keys, sources, urls, image_loader):
+        """Add data URLs for ``keys`` not yet in ``urls``, loading lazy images first"""
+        keys = [key for key in dict.fromkeys(keys) if key not in urls]
+        lazy = [key for key in keys if sources[key] is None]
+        loaded = dict(zip(lazy, image_loader(lazy))) if lazy else {}
+        missing = sum(1 for key in lazy if loaded[key] is None)
+        if missing:
+            print(f"Warning: {missing} referenced image(s) could not be loaded and are skipped")
+        images = [loaded[key] if key in loaded else sources[key] for key in keys]
+        urls.update(zip(keys, self.image_pipeline.encode_many(images)))
+
+    def generate_qa_pairs(self, documents, num_pairs=25, verbose=False, image_loader=None):
+        """Generate QA pairs chunk by chunk
+
+        ``image_loader`` returns the image bytes (or None) of a list of image
+        keys, i.e. image ids or row positions; with it, rows may carry
+        ``has_image`` instead of their bytes or reference images stored in
+        another dataset, and images are loaded and encoded one request batch
+        at a time.
+        """
+        # Chunk the text page by page so each chunk keeps only its own images
         chunk_size = self.generation_config.get("chunk_size", 4000)
         overlap = self.generation_config.get("overlap", 200)
-        chunks = split_into_chunks(all_text, chunk_size=chunk_size, overlap=overlap)
+        max_images = self.generation_config.get("max_images_per_chunk", 4)
+        chunks = self._chunks(self._pages(documents), chunk_size, overlap)
+        if not chunks:
+            return []
         print(f"Document split into {len(chunks)} chunks")
+
+        # Each distinct image is encoded once; repeats (by image_id) share the encoding
+        sources = self._image_sources(documents, image_loader)
+        chunks = [(chunk, [key for key in image_keys if key in sources][:max_images])
+                  for chunk, image_keys in chunks]
+        urls = {}
+
         # Distribute num_pairs across chunks
         pairs_per_chunk = max(1, math.ceil(num_pairs / len(chunks)))
-        # Prepare all message batches
-        all_messages = []
-        for i, chunk in enumerate(chunks):
-            user_content = []
-            user_content.append({"type": "text", "text": f"Passage: {chunk}"})
-            image = next((img for img in images if img is not None), None)
-            if image is not None:
-                image_b64 = base64.b64encode(image).decode("utf-8")
-                user_content.append({
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/png;base64,{image_b64}"}
-                })
-            system_prompt = (
-                f"You are a helpful assistant. Given the following passage and image, generate {pairs_per_chunk} high-quality question-answer pairs. "
-                "Return ONLY valid JSON as a list: [{\"question\": \"...\", \"answer\": \"...\"}, ...]. "
-                "Do not include any explanation, markdown, or text outside the JSON."
-            )
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_content}
-            ]
-            all_messages.append(messages)
         # Batch LLM calls
         batch_size = self.generation_config.get("batch_size", 32)
         all_qa_pairs = []
-        for batch_start in range(0, len(all_messages), batch_size):
-            batch_end = min(batch_start + batch_size, len(all_messages))
-            batch_messages = all_messages[batch_start:batch_end]
+        for batch_start in range(0, len(chunks), batch_size):
+            batch_chunks = chunks[batch_start:batch_start + batch_size]
+            # Load and encode only the images this batch sends
+            self._encode_images([key for _, image_keys in batch_chunks for key in image_keys],
+                                sources, urls, image_loader)
+            batch_messages = []
+            for chunk, image_keys in batch_chunks:
+                user_content = []
+                user_content.append({"type": "text", "text": f"Passage: {chunk}"})
+                chunk_urls = [urls[key] for key in image_keys if urls[key] is not None]
+                for url in chunk_urls:
+                    user_content.append({
+                        "type": "image_url",
+                        "image_url": {"url": url}
+                    })
+                context = "passage and image" + ("s" if len(chunk_urls) > 1 else "") if chunk_urls else "passage"
+                system_prompt = (
+                    f"You are a helpful assistant. Given the following {context}, generate {pairs_per_chunk} high-quality question-answer pairs. "
+                    "Return ONLY valid JSON as a list: [{\"question\": \"...\", \"answer\": \"...\"}, ...]. "
+                    "Do not include any explanation, markdown, or text outside the JSON."
+                )
+                messages = [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content}
+                ]
+                batch_messages.append(messages)
             batch_responses = self.client.batch_completion(
                 batch_messages,
                 temperature=self.generation_config.get("temperature", 0.7),
@@ -81,9 +169,10 @@ class MultimodalQAGenerator:
                 break
         return all_qa_pairs[:num_pairs]
 
-    def process_dataset(self, documents, output_dir: str, num_examples=None, verbose=False, base_name: str = "multimodal_qa_pairs") -> str:
-        # documents: list of dicts with 'text' and 'image'
-        qa_pairs = self.generate_qa_pairs(documents, num_examples or 25, verbose=verbose)
+    def process_dataset(self, documents, output_dir: str, num_examples=None, verbose=False, base_name: str = "multimodal_qa_pairs",
+                        image_loader=None) -> str:
+        # documents: list of dicts with 'text' and 'image', or 'has_image' and an image_loader
+        qa_pairs = self.generate_qa_pairs(documents, num_examples or 25, verbose=verbose, image_loader=image_loader)
         output_path = os.path.join(output_dir, f"{base_name}.json")
         with open(output_path, "w", encoding="utf-8") as f:
             import json
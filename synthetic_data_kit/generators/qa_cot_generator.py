@@ -0,0 +1,212 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Generate QA pairs and CoT examples from the same chunks in a single request each
+import os
+from typing import Dict, List, Any, Optional, Tuple
+
+from synthetic_data_kit.generators.qa_generator import QAGenerator
+from synthetic_data_kit.generators.cot_generator import cot_examples_to_conversations
+from synthetic_data_kit.utils.chunk_selection import plan_chunks
+from synthetic_data_kit.utils.boilerplate import filter_documents
+from synthetic_data_kit.utils.dedup import deduplicate_items
+from synthetic_data_kit.utils.fingerprint_store import filter_known_items, new_run_id
+from synthetic_data_kit.utils.journal import journaled
+from synthetic_data_kit.utils.llm_processing import parse_qa_pairs
+from synthetic_data_kit.utils.text import extract_json_from_text
+from synthetic_data_kit.utils.config import get_prompt
+
+
+def _split_budget(total: int, parts: int) -> List[int]:
+    """Split ``total`` into ``parts`` near-equal integers, larger ones first"""
+    if parts <= 0:
+        return []
+    base, extra = divmod(max(0, total), parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def _scale_budget(budgets: List[int], total: int) -> List[int]:
+    """Scale ``budgets`` down to sum to ``total``, keeping their proportions
+
+    Uses largest remainders, earlier entries first on ties; entries may
+    become 0.
+    """
+    weight = sum(budgets)
+    if weight <= total:
+        return list(budgets)
+    shares = [total * budget / weight for budget in budgets]
+    scaled = [int(share) for share in shares]
+    by_remainder = sorted(range(len(budgets)), key=lambda i: scaled[i] - shares[i])
+    for i in by_remainder[:total - sum(scaled)]:
+        scaled[i] += 1
+    return scaled
+
+
+def parse_qa_cot_output(text: str) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+    """Parse a combined response into (qa_pairs, cot_examples)
+
+    Falls back to treating the response as plain QA pairs when the model
+    ignores the combined format.
+    """
+    try:
+        data = extract_json_from_text(text)
+    except ValueError:
+        return parse_qa_pairs(text), []
+
+    if isinstance(data, list):
+        return [p for p in data if isinstance(p, dict) and "question" in p and "answer" in p], []
+    if not isinstance(data, dict):
+        return [], []
+
+    qa_pairs = [
+        {"question": p["question"], "answer": p["answer"]}
+        for p in data.get("qa_pairs") or []
+        if isinstance(p, dict) and "question" in p and "answer" in p
+    ]
+    cot_examples = [e for e in data.get("cot_examples") or [] if isinstance(e, dict)]
+    return qa_pairs, cot_examples
+
+
+class QACoTGenerator(QAGenerator):
+    """Generates QA pairs and chain-of-thought examples in one pass over the chunks
+
+    Each selected chunk is sent once with a prompt asking for both outputs, so
+    the chunk text is only paid for once instead of once per content type.
+    """
+
+    def generate_qa_cot(self,
+                        document_text: str,
+                        num_pairs: int = 25,
+                        num_examples: int = 5) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+        """Generate QA pairs and CoT examples from the document using batched processing"""
+        verbose = os.environ.get('SDK_VERBOSE', 'false').lower() == 'true'
+
+        # Get generation config
+        temperature = self.generation_config.get("temperature", 0.7)
+        batch_size = self.generation_config.get("batch_size", 32)
+
+        # Chunks are planned once for whichever target is larger. QA pairs get
+        # their own share of that plan, so a larger CoT target doesn't make
+        # the chunks ask for (and pay for) more pairs than requested; CoT
+        # examples are spread evenly over the chunks in dispatch order
+        chunks, chunk_indices, budgets = plan_chunks(
+            document_text, max(num_pairs, num_examples), self.generation_config, verbose
+        )
+        pair_budgets = _scale_budget(budgets, num_pairs) if num_pairs < num_examples else budgets
+        example_budgets = _split_budget(num_examples, len(chunk_indices))
+
+        if verbose:
+            print("Generating QA pairs and CoT examples...")
+            print(f"Document split into {len(chunks)} chunks")
+            print(f"Using batch size of {batch_size}")
+
+        prompt_template = get_prompt(self.config, "qa_cot_generation")
+
+        # Prepare all message batches
+        all_messages = []
+        for i, pair_budget, example_budget in zip(chunk_indices, pair_budgets, example_budgets):
+            prompt = prompt_template.format(
+                num_pairs=pair_budget,
+                num_examples=example_budget,
+                text=chunks[i]
+            )
+            all_messages.append([{"role": "system", "content": prompt}])
+
+        print(f"Processing {len(all_messages)} chunks to generate QA pairs and CoT examples...")
+
+        all_qa_pairs = []
+        all_examples = []
+
+        def done() -> bool:
+            return len(all_qa_pairs) >= num_pairs and len(all_examples) >= num_examples
+
+        for batch_start in range(0, len(all_messages), batch_size):
+            if done():
+                if verbose:
+                    print(f"Reached targets of {num_pairs} pairs and {num_examples} examples. Stopping processing.")
+                break
+
+            batch_messages = all_messages[batch_start:batch_start + batch_size]
+            batch_num = batch_start // batch_size + 1
+            total_batches = (len(all_messages) + batch_size - 1) // batch_size
+
+            if not verbose:
+                print(f"Processing batch {batch_num}/{total_batches}...", end="\r")
+            else:
+                print(f"Processing batch {batch_num}/{total_batches} with {len(batch_messages)} chunks")
+
+            try:
+                batch_responses = journaled(self.journal, f"qa-cot:{batch_start}", lambda: self.client.batch_completion(
+                    batch_messages,
+                    temperature=temperature,
+                    batch_size=batch_size
+                ))
+
+                for j, response in enumerate(batch_responses):
+                    qa_pairs, examples = parse_qa_cot_output(response)
+                    qa_pairs = qa_pairs[:max(0, num_pairs - len(all_qa_pairs))]
+                    examples = examples[:max(0, num_examples - len(all_examples))]
+                    all_qa_pairs.extend(qa_pairs)
+                    all_examples.extend(examples)
+
+                    if verbose:
+                        chunk_index = batch_start + j
+                        if chunk_index < len(chunk_indices):
+                            chunk_index = chunk_indices[chunk_index]
+                        print(f"  Generated {len(qa_pairs)} pairs and {len(examples)} examples from chunk {chunk_index+1}")
+
+                    if done():
+                        break
+
+            except Exception as e:
+                if verbose:
+                    print(f"  Error processing batch {batch_num}: {str(e)}")
+
+        if not verbose:
+            print(" " * 80, end="\r")
+            print("Batch processing complete.")
+
+        print(f"Generated {len(all_qa_pairs)} QA pairs total (requested: {num_pairs})")
+        print(f"Generated {len(all_examples)} CoT examples total (requested: {num_examples})")
+        return all_qa_pairs, all_examples
+
+    def process_documents(self,
+                          documents: List[Dict[str, Any]],
+                          num_pairs: int = 25,
+                          num_examples: int = 5,
+                          verbose: bool = False,
+                          rolling_summary: Optional[bool] = False) -> Dict[str, Any]:
+        """Process a list of documents to generate QA pairs and CoT examples without rating"""
+        if verbose:
+            os.environ['SDK_VERBOSE'] = 'true'
+        else:
+            os.environ['SDK_VERBOSE'] = 'false'
+
+        # Drop repeated headers/footers and near-empty pages before chunking
+        documents = filter_documents(documents, self.generation_config, verbose)
+        full_text = self.compactor.text(" ".join([doc["text"] for doc in documents]))
+
+        summary = journaled(self.journal, "summary",
+                            lambda: self.generate_summary(full_text, rolling_summary=rolling_summary))
+        qa_pairs, cot_examples = self.generate_qa_cot(
+            full_text, num_pairs=num_pairs, num_examples=num_examples
+        )
+        qa_pairs = deduplicate_items(qa_pairs, self.generation_config, verbose)
+        cot_examples = deduplicate_items(cot_examples, self.generation_config, verbose, label="CoT examples")
+        run_id = new_run_id()
+        qa_pairs = filter_known_items(qa_pairs, self.generation_config, run_id, verbose=verbose)
+        cot_examples = filter_known_items(cot_examples, self.generation_config, run_id,
+                                          verbose=verbose, label="CoT examples")
+        self.compactor.report()
+
+        result = {
+            "summary": summary,
+            "qa_pairs": qa_pairs,
+            "cot_examples": cot_examples,
+            "conversations": cot_examples_to_conversations(cot_examples)
+        }
+        if self.generation_config.get("fingerprint_store"):
+            result["fingerprint_run"] = run_id
+        return result
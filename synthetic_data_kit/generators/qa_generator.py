@@ -6,17 +6,27 @@
 # Create QA Pairs
 
 from typing import Dict, List, Any, Optional, Tuple
-import json
 import time
 import os
 from pathlib import Path
 from rich.progress import Progress, BarColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn
 
 from synthetic_data_kit.models.llm_client import LLMClient
-from synthetic_data_kit.utils.text import split_into_chunks
+from synthetic_data_kit.utils.text import split_into_chunks, PromptCompactor
+from synthetic_data_kit.utils.chunk_selection import plan_chunks
+from synthetic_data_kit.utils.boilerplate import filter_documents
+from synthetic_data_kit.utils.dedup import NoveltyTracker
+from synthetic_data_kit.utils.fingerprint_store import filter_known_items, new_run_id
+from synthetic_data_kit.utils.journal import journaled
 from synthetic_data_kit.utils.llm_processing import parse_qa_pairs, parse_ratings, convert_to_conversation_format
 from synthetic_data_kit.utils.config import load_config, get_generation_config, get_curate_config, get_prompt
 
+def _interleave(chunk_pairs: List[Tuple[int, List[Dict[str, str]]]]) -> List[Tuple[int, List[Dict[str, str]]]]:
+    """Reorder (chunk, pairs) entries so that taking a prefix of them draws
+    one pair from each chunk in turn"""
+    rounds = max((len(pairs) for _, pairs in chunk_pairs), default=0)
+    return [(j, [pairs[r]]) for r in range(rounds) for j, pairs in chunk_pairs if r < len(pairs)]
+
 class QAGenerator:
     def __init__(self, 
                  client: LLMClient,
@@ -30,6 +40,15 @@ class QAGenerator:
         # Get specific configurations
         self.generation_config = get_generation_config(self.config)
         self.curate_config = get_curate_config(self.config)
+        
+        # Tracks input tokens saved by whitespace/JSON compaction
+        self.compactor = PromptCompactor(self.generation_config.get("compact_prompts", True))
+        
+        # Why the last generate_qa_pairs call stopped dispatching chunks
+        self.stop_reason = None
+        
+        # Optional RunJournal; completed LLM calls are replayed from it on resume
+        self.journal = None
     
     def generate_summary(self, 
                          document_text: str, 
@@ -89,16 +108,13 @@ class QAGenerator:
         verbose = os.environ.get('SDK_VERBOSE', 'false').lower() == 'true'
         
         # Get generation config
-        chunk_size = self.generation_config.get("chunk_size", 4000)
         temperature = self.generation_config.get("temperature", 0.7)
-        overlap = self.generation_config.get("overlap", 200)
         batch_size = self.generation_config.get("batch_size", 32)
+        chunk_sampling = self.generation_config.get("chunk_sampling", "coverage")
         
-        # Split text into chunks
-        chunks = split_into_chunks(
-            document_text, 
-            chunk_size=chunk_size, 
-            overlap=overlap
+        # Split text into chunks and pick what to send
+        chunks, chunk_indices, chunk_budgets = plan_chunks(
+            document_text, num_pairs, self.generation_config, verbose
         )
         
         if verbose:
@@ -107,17 +123,17 @@ class QAGenerator:
             print(f"Using batch size of {batch_size}")
         
         all_qa_pairs = []
-        pairs_per_chunk = max(1, round(num_pairs / len(chunks)))
         
         # Get QA generation prompt template
         qa_prompt_template = get_prompt(self.config, "qa_generation")
         
         # Prepare all message batches
         all_messages = []
-        for i, chunk in enumerate(chunks):
+        for i, budget in zip(chunk_indices, chunk_budgets):
+            chunk = chunks[i]
             # Format the prompt with summary and text
             qa_prompt = qa_prompt_template.format(
-                num_pairs=pairs_per_chunk,
+                num_pairs=budget,
                 summary=summary[:100],
                 text=chunk
             )
@@ -127,7 +143,13 @@ class QAGenerator:
             ]
             all_messages.append(messages)
         
-        print(f"Processing {len(chunks)} chunks to generate QA pairs...")
+        print(f"Processing {len(all_messages)} chunks to generate QA pairs...")
+        
+        # Track how many new pairs are still novel so we can stop paying for
+        # generations once the model starts repeating itself
+        novelty = NoveltyTracker.from_config(self.generation_config, target=num_pairs)
+        drop_repeats = self.generation_config.get("enable_deduplication", True)
+        self.stop_reason = "all chunks processed"
         
         # Set up progress tracking based on verbose mode
         if verbose:
@@ -142,26 +164,27 @@ class QAGenerator:
             ]
             
             progress_ctx = Progress(*progress_columns)
-            generate_task = progress_ctx.add_task(f"Generating QA pairs", total=len(chunks))
+            generate_task = progress_ctx.add_task(f"Generating QA pairs", total=len(all_messages))
             progress_ctx.start()
         else:
             progress_ctx = None
             generate_task = None
         
-        # Process in batches
-        for batch_start in range(0, len(chunks), batch_size):
+        # Process in batches, smaller at first so saturation is checked early
+        dispatch_ranges = novelty.dispatch_ranges(len(all_messages), batch_size)
+        for batch_num, (batch_start, batch_end) in enumerate(dispatch_ranges, 1):
             # Check if we've already generated enough pairs
             if len(all_qa_pairs) >= num_pairs:
                 if verbose:
                     print(f"Reached target of {num_pairs} pairs. Stopping processing.")
                 break
+            if novelty.saturated():
+                self.stop_reason = f"saturated: {novelty.describe()}"
+                break
                 
-            batch_end = min(batch_start + batch_size, len(chunks))
             batch_messages = all_messages[batch_start:batch_end]
             current_batch_size = len(batch_messages)
-            
-            batch_num = batch_start//batch_size + 1
-            total_batches = (len(chunks) + batch_size - 1)//batch_size
+            total_batches = len(dispatch_ranges)
             
             # Simple progress indicator for non-verbose mode
             if not verbose:
@@ -170,15 +193,20 @@ class QAGenerator:
                 print(f"Processing batch {batch_num}/{total_batches} with {current_batch_size} chunks")
             
             try:
-                # Process the batch
-                batch_responses = self.client.batch_completion(
+                # Process the batch (or replay it from the journal)
+                batch_responses = journaled(self.journal, f"qa:{batch_start}", lambda: self.client.batch_completion(
                     batch_messages,
                     temperature=temperature,
                     batch_size=batch_size
-                )
+                ))
+                
+                batch_pairs = [(j, parse_qa_pairs(response)) for j, response in enumerate(batch_responses)]
+                if chunk_sampling == "coverage":
+                    # Spread the remaining budget across every chunk in the batch
+                    batch_pairs = _interleave(batch_pairs)
                 
                 # Process each response in the batch
-                for j, response in enumerate(batch_responses):
+                for j, chunk_pairs in batch_pairs:
                     # Check if we've reached the target before processing more
                     if len(all_qa_pairs) >= num_pairs:
                         if verbose:
@@ -186,7 +214,12 @@ class QAGenerator:
                         break
                         
                     chunk_index = batch_start + j
-                    chunk_pairs = parse_qa_pairs(response)
+                    if chunk_index < len(chunk_indices):
+                        chunk_index = chunk_indices[chunk_index]
+                    
+                    novel = novelty.observe(chunk_pairs)
+                    if drop_repeats:
+                        chunk_pairs = [pair for pair, is_novel in zip(chunk_pairs, novel) if is_novel]
                     
                     # Only add pairs up to the target limit
                     remaining_pairs = num_pairs - len(all_qa_pairs)
@@ -227,7 +260,10 @@ class QAGenerator:
             print("Batch processing complete.")
         
         # Always print summary information, even in non-verbose mode
+        if len(all_qa_pairs) >= num_pairs:
+            self.stop_reason = "target reached"
         print(f"Generated {len(all_qa_pairs)} QA pairs total (requested: {num_pairs})")
+        print(f"Stopped: {self.stop_reason} (novelty rate {novelty.rate:.0%} over {novelty.seen} generated pairs)")
         return all_qa_pairs
     
     def rate_qa_pairs(self, 
@@ -275,7 +311,7 @@ class QAGenerator:
             for i, batch in enumerate(batches):
                 if verbose:
                     print(f"Rating batch {i+1}/{len(batches)}...")
-                batch_json = json.dumps(batch, indent=2)
+                batch_json = self.compactor.json(batch)
                 
                 # Format the rating prompt with pairs
                 rating_prompt = rating_prompt_template.format(pairs=batch_json)
@@ -316,6 +352,7 @@ class QAGenerator:
         # Always print summary information, even in non-verbose mode
         print(f"Keeping {len(rated_pairs)} out of {len(qa_pairs)} pairs (threshold: {threshold})")
         print(f"Average score: {metrics['avg_score']}")
+        self.compactor.report()
         return rated_pairs, metrics
     
     def process_documents(self,
@@ -331,20 +368,35 @@ class QAGenerator:
             os.environ['SDK_VERBOSE'] = 'false'
 
         all_qa_pairs = []
-        full_text = " ".join([doc["text"] for doc in documents])
+
+        # Drop repeated headers/footers and near-empty pages before chunking
+        documents = filter_documents(documents, self.generation_config, verbose)
+        full_text = self.compactor.text(" ".join([doc["text"] for doc in documents]))
 
         # Generate summary
-        summary = self.generate_summary(full_text, rolling_summary=rolling_summary)
+        summary = journaled(self.journal, "summary",
+                            lambda: self.generate_summary(full_text, rolling_summary=rolling_summary))
 
         # Generate QA pairs
         qa_pairs = self.generate_qa_pairs(full_text, summary, num_pairs=num_pairs)
 
+        # Near-duplicates (e.g. from overlapping chunks) were already dropped as
+        # they arrived, by the NoveltyTracker with deduplicate_items' settings
+
+        # Drop questions already produced by earlier runs and remember these ones
+        run_id = new_run_id()
+        qa_pairs = filter_known_items(qa_pairs, self.generation_config, run_id, verbose=verbose)
+
         all_qa_pairs.extend(qa_pairs)
+        self.compactor.report()
 
         # Prepare result - no rating at this stage
         result = {
             "summary": summary,
             "qa_pairs": all_qa_pairs
         }
+        if self.generation_config.get("fingerprint_store"):
+            # Lets curate tell this run's pairs from ones known before it
+            result["fingerprint_run"] = run_id
 
         return result
\ No newline at end of file
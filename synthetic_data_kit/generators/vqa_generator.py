@@ -17,6 +17,7 @@ from pathlib import Path
 
 from synthetic_data_kit.models.llm_client import LLMClient
 from synthetic_data_kit.utils.config import load_config, get_generation_config
+from synthetic_data_kit.utils.image_pipeline import ImagePipeline
 
 class VQAGenerator:
     """Generates Visual Question Answering data with reasoning"""
@@ -32,14 +33,17 @@ class VQAGenerator:
         
         # Get specific configurations
         self.generation_config = get_generation_config(self.config)
+        
+        # Downsizes and re-encodes images before they are sent
+        self.image_pipeline = ImagePipeline.from_config(self.generation_config)
     
     def encode_image_base64(self, image):
-        """Encode an image in base64 format"""
-        import io
-        import base64
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode('utf-8')
+        """Encode an image in base64 format, resized and compressed by the image pipeline
+
+        Returns None for an image that can't be processed.
+        """
+        url = self.image_pipeline.encode(image)
+        return url.split(",", 1)[1] if url is not None else None
     
     def transform(self, messages):
         """Transform messages by adding reasoning to VQA data"""
@@ -57,15 +61,22 @@ class VQAGenerator:
         # Create a list of message sets for the model
         messages_list = []
         
+        # Encode the batch's images in parallel before building requests
+        image_urls = self.image_pipeline.encode_many(messages['image'])
+        
         for i in range(len(messages['image'])):
-            image = messages['image'][i]
             query = messages['query'][i]
             label = messages['label'][i][0] if isinstance(messages['label'][i], list) else messages['label'][i]
             
-            # Encode the image
-            image_base64 = self.encode_image_base64(image)
-            
-            # Prepare the messages for the API request
+            # Prepare the messages for the API request; an image that couldn't be
+            # processed is left out rather than failing the batch
+            content = []
+            if image_urls[i] is not None:
+                content.append({
+                    "type": "image_url",
+                    "image_url": {"url": image_urls[i]},
+                })
+            content.append({"type": "text", "text": f"{query} Final answer: {label}"})
             message_set = [
                 {
                     "role": "system",
@@ -73,13 +84,7 @@ class VQAGenerator:
                 },
                 {
                     "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{image_base64}"},
-                        },
-                        {"type": "text", "text": f"{query} Final answer: {label}"},
-                    ],
+                    "content": content,
                 }
             ]
             messages_list.append(message_set)
@@ -5,7 +5,7 @@
 # the root directory of this source tree.
 
 import io
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 import fitz  # PyMuPDF
 from PIL import Image
@@ -15,68 +15,103 @@ import os
 import docx
 from pptx import Presentation
 
+from synthetic_data_kit.utils.page_pool import iter_page_ranges
+
+
+def _extract_pdf_range(file_path: str, start: int, stop: int, min_image_size: int = 0) -> List[Dict[str, Any]]:
+    """Rows for pages [start, stop); runs in worker processes, each opening the document
+
+    Images smaller than ``min_image_size`` on either side are skipped before
+    extraction, and an xref repeated across pages (logos, watermarks) is
+    extracted and hashed once.
+    """
+    from synthetic_data_kit.utils.image_dedup import image_id
+
+    rows = []
+    extracted = {}
+    with fitz.open(file_path) as doc:
+        for page_num in range(start, stop):
+            page = doc.load_page(page_num)
+            text = page.get_text()
+            page_rows = []
+            for img in page.get_images(full=True):
+                xref, width, height = img[0], img[2], img[3]
+                if min(width, height) < min_image_size:
+                    continue
+                if xref not in extracted:
+                    data = doc.extract_image(xref)["image"]
+                    extracted[xref] = (data, image_id(data))
+                data, data_id = extracted[xref]
+                page_rows.append({"text": text, "image": data, "page": page_num + 1, "image_id": data_id})
+
+            rows.extend(page_rows or [{"text": text, "image": None, "page": page_num + 1}])
+    return rows
+
+
 class MultimodalParser:
-    def parse(self, file_path: str) -> List[Dict[str, Any]]:
-        """
-        Parses a file, extracting text and images.
+    """Parser that extracts text together with the images on the same page
 
-        Args:
-            file_path (str): The path to the file.
+    PDFs of at least ``parallel_min_pages`` pages are split into page ranges
+    that ``workers`` processes extract; rows are yielded in page order as
+    ranges complete, with at most two ranges per worker in flight.
+    """
 
-        Returns:
-            List[Dict[str, Any]]: A list of dictionaries, where each dictionary
-                                 represents a page with its text and a single image.
-        """
+    def __init__(self, workers: Optional[int] = None, parallel_min_pages: int = 64, min_image_size: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_min_pages = parallel_min_pages
+        self.min_image_size = min_image_size or 0
+
+    def iter_rows(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield rows as they are extracted, so they can be written without holding the whole file"""
         ext = os.path.splitext(file_path)[1].lower()
         if ext == ".pdf":
-            return self._parse_pdf(file_path)
+            return self._iter_pdf(file_path)
         elif ext == ".docx":
-            return self._parse_docx(file_path)
+            return self._iter_docx(file_path)
         elif ext == ".pptx":
-            return self._parse_pptx(file_path)
+            return self._iter_pptx(file_path)
         else:
             raise ValueError(f"Unsupported file extension for multimodal parsing: {ext}")
 
-    def _parse_pdf(self, file_path: str) -> List[Dict[str, Any]]:
-        doc = fitz.open(file_path)
-        data = []
+    def parse(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        Parses a file, extracting text and images.
 
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text = page.get_text()
-            image_list = page.get_images(full=True)
+        Args:
+            file_path (str): The path to the file.
 
-            if not image_list:
-                data.append({"text": text, "image": None})
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, where each dictionary
+                                 represents a page with its text and a single image.
+        """
+        return list(self.iter_rows(file_path))
 
-            for img_index, img in enumerate(image_list):
-                xref = img[0]
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                data.append({"text": text, "image": image_bytes})
+    def _iter_pdf(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        with fitz.open(file_path) as doc:
+            page_count = doc.page_count
 
-        return data
+        for rows in iter_page_ranges(_extract_pdf_range, file_path, page_count, self.workers,
+                                     self.parallel_min_pages, self.min_image_size):
+            yield from rows
 
-    def _parse_docx(self, file_path: str) -> List[Dict[str, Any]]:
+    def _iter_docx(self, file_path: str) -> Iterator[Dict[str, Any]]:
         doc = docx.Document(file_path)
-        data = []
         text = ""
         for para in doc.paragraphs:
             text += para.text + "\n"
 
+        has_images = False
         for rel in doc.part.rels.values():
             if "image" in rel.target_ref:
-                image_bytes = rel.target_part.blob
-                data.append({"text": text, "image": image_bytes})
+                has_images = True
+                yield {"text": text, "image": rel.target_part.blob}
 
-        if not data:
-            data.append({"text": text, "image": None})
+        if not has_images:
+            yield {"text": text, "image": None}
 
-        return data
-
-    def _parse_pptx(self, file_path: str) -> List[Dict[str, Any]]:
+    def _iter_pptx(self, file_path: str) -> Iterator[Dict[str, Any]]:
         prs = Presentation(file_path)
-        data = []
+        has_images = False
         for slide in prs.slides:
             text = ""
             for shape in slide.shapes:
@@ -85,15 +120,13 @@ class MultimodalParser:
 
             for shape in slide.shapes:
                 if shape.shape_type == 13:  # Picture
-                    image_bytes = shape.image.blob
-                    data.append({"text": text, "image": image_bytes})
+                    has_images = True
+                    yield {"text": text, "image": shape.image.blob}
 
-        if not data:
+        if not has_images:
             text = ""
             for slide in prs.slides:
                 for shape in slide.shapes:
                     if hasattr(shape, "text"):
                         text += shape.text + "\n"
-            data.append({"text": text, "image": None})
-
-        return data
+            yield {"text": text, "image": None}
@@ -38,6 +38,7 @@ class CreateForm(FlaskForm):
     input_file = StringField('Input File Path', validators=[DataRequired()])
     content_type = SelectField('Content Type', choices=[
         ('qa', 'Question-Answer Pairs'), 
+        ('qa-cot', 'QA Pairs + Chain of Thought'), 
         ('summary', 'Summary'), 
         ('cot', 'Chain of Thought'), 
         ('cot-enhance', 'CoT Enhancement')
@@ -107,6 +108,7 @@ def create():
             
             content_type_labels = {
                 'qa': 'QA pairs',
+                'qa-cot': 'QA pairs and Chain of Thought examples',
                 'summary': 'summary',
                 'cot': 'Chain of Thought examples',
                 'cot-enhance': 'CoT enhanced conversation'
@@ -151,7 +153,8 @@ def curate():
                 api_base=api_base, 
                 model=model,
                 config_path=None,  # Use default config
-                verbose=True
+                verbose=True,
+                top_k=num_pairs or None
             )
             
             flash(f'Successfully curated QA pairs! Output saved to: {result_path}', 'success')
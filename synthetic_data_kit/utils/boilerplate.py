@@ -0,0 +1,194 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Strip repeated page furniture (headers, footers, page numbers) before generation
+import re
+from collections import Counter
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+# pdfminer separates pages with a form feed
+PAGE_SEPARATOR = "\f"
+
+# Lines with fewer letters (table cells, figures, bare numbers) are never
+# counted as repeated lines; bare page numbers are matched separately
+MIN_LINE_LETTERS = 3
+
+# If filtering would leave less than this fraction of the content, the
+# repeated lines are most likely the content itself, so nothing is removed
+MIN_KEPT_FRACTION = 0.05
+
+_DIGITS = re.compile(r"\d+")
+_LETTERS = re.compile(r"[^\W\d_]")
+# A bare page number such as "12", "- 12 -" or "12 / 40"
+_PAGE_NUMBER = re.compile(r"^[-\u2013\u2014\s]*(\d{1,4})[-\u2013\u2014\s]*(?:(?:/|of)\s*\d{1,4}\s*)?$")
+
+
+def _line_key(line: str) -> Optional[str]:
+    """Normalise a line so that e.g. "Page 3 of 40" and "Page 4 of 40" match
+
+    Returns None for lines with fewer than MIN_LINE_LETTERS letters.
+    """
+    if len(_LETTERS.findall(line)) < MIN_LINE_LETTERS:
+        return None
+    return _DIGITS.sub("#", " ".join(line.split()).lower())
+
+
+def _edge_lines(page: str) -> List[Tuple[int, str]]:
+    """(index, line) of the first and last non-empty lines of a page"""
+    lines = [(i, line) for i, line in enumerate(page.splitlines()) if line.strip()]
+    return [lines[0], lines[-1]] if len(lines) > 1 else lines
+
+
+def _page_number_lines(pages: List[str], cutoff: float) -> List[Set[int]]:
+    """Per page, the indices of lines that are its bare page number
+
+    A bare number at the top or bottom of a page counts only if, on at
+    least ``cutoff`` pages, the number at that edge runs in step with the
+    page index, so numbers that merely sit at a page edge are kept.
+    """
+    candidates = []
+    offsets = Counter()
+    for index, page in enumerate(pages):
+        found = []
+        for edge, (line_index, line) in enumerate(_edge_lines(page)):
+            match = _PAGE_NUMBER.match(line.strip().lower())
+            if match:
+                offset = (edge, int(match.group(1)) - index)
+                found.append((line_index, offset))
+                offsets[offset] += 1
+        candidates.append(found)
+
+    numbering = {offset for offset, count in offsets.items() if count >= cutoff}
+    return [{line_index for line_index, offset in found if offset in numbering} for found in candidates]
+
+
+def build_line_index(pages: List[str]) -> Counter:
+    """Count on how many pages each (normalised) line appears
+
+    Args:
+        pages: Page texts
+
+    Returns:
+        Counter mapping line key to number of pages containing it
+    """
+    index = Counter()
+    for page in pages:
+        index.update({_line_key(line) for line in page.splitlines() if line.strip()} - {None})
+    return index
+
+
+def strip_boilerplate(
+    documents: List[Dict[str, Any]],
+    line_threshold: float = 0.2,
+    min_repeats: int = 3,
+    min_content_chars: int = 200,
+    chunk_size: int = 4000,
+    overlap: int = 200,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Remove repeated lines and near-empty pages from parsed documents
+
+    Every row's text is split into pages (on form feeds). A line with at
+    least MIN_LINE_LETTERS letters counts as boilerplate when it appears on
+    at least ``min_repeats`` pages and on at least ``line_threshold`` of all
+    pages across all rows. Bare page numbers are removed when they follow
+    the page order at the top or bottom of enough pages; other number-only
+    lines (table cells, figures) are kept. After those lines are removed,
+    pages with fewer than ``min_content_chars`` non-whitespace characters
+    are dropped, unless that would drop everything. If less than
+    MIN_KEPT_FRACTION of the content would remain, the documents are
+    returned unchanged with a warning.
+
+    Args:
+        documents: Rows with a "text" field (other fields are kept as is)
+        line_threshold: Fraction of pages a line must appear on to be removed
+        min_repeats: Minimum number of pages a line must appear on to be removed
+        min_content_chars: Pages with less remaining content are dropped
+        chunk_size: Chunk size used to estimate how many requests were saved
+        overlap: Chunk overlap used to estimate how many requests were saved
+
+    Returns:
+        Tuple of (cleaned documents, stats)
+    """
+    row_pages = [doc.get("text", "").split(PAGE_SEPARATOR) for doc in documents]
+    all_pages = [page for pages in row_pages for page in pages]
+    index = build_line_index(all_pages)
+
+    cutoff = max(min_repeats, line_threshold * len(all_pages))
+    boilerplate = {key for key, count in index.items() if count >= cutoff}
+
+    page_numbers = iter(_page_number_lines(all_pages, cutoff))
+
+    def clean(page: str) -> str:
+        numbers = next(page_numbers)
+        return "\n".join(
+            line for i, line in enumerate(page.splitlines())
+            if i not in numbers and _line_key(line) not in boilerplate
+        )
+
+    cleaned_rows = [[clean(page) for page in pages] for pages in row_pages]
+
+    def content_chars(text: str) -> int:
+        return len("".join(text.split()))
+
+    def has_content(page: str) -> bool:
+        return content_chars(page) >= min_content_chars
+
+    kept_rows = [[page for page in pages if has_content(page)] for pages in cleaned_rows]
+    if not any(kept_rows):
+        # Everything is short (e.g. a small text file); keep it rather than drop it all
+        kept_rows = cleaned_rows
+
+    content_before = sum(content_chars(page) for page in all_pages)
+    content_after = sum(content_chars(page) for pages in kept_rows for page in pages)
+    if content_before and content_after < MIN_KEPT_FRACTION * content_before:
+        print(f"Warning: boilerplate filter would keep only {content_after} of {content_before} "
+              f"characters; keeping the documents unfiltered")
+        kept_rows = row_pages
+        boilerplate = set()
+
+    cleaned_documents = []
+    for doc, pages in zip(documents, kept_rows):
+        if pages:
+            cleaned = dict(doc)
+            cleaned["text"] = PAGE_SEPARATOR.join(pages)
+            cleaned_documents.append(cleaned)
+
+    # Estimated from lengths; chunking the whole text twice just for stats is not worth it
+    chars_before = sum(len(doc.get("text", "")) for doc in documents)
+    chars_after = sum(len(doc["text"]) for doc in cleaned_documents)
+    step = max(1, chunk_size - overlap)
+
+    stats = {
+        "pages": len(all_pages),
+        "pages_dropped": len(all_pages) - sum(len(pages) for pages in kept_rows),
+        "boilerplate_lines": len(boilerplate),
+        "chunks_saved": -(-chars_before // step) - -(-chars_after // step),
+        "tokens_saved": (chars_before - chars_after + 3) // 4,
+    }
+    return cleaned_documents, stats
+
+
+def filter_documents(documents: List[Dict[str, Any]],
+                     generation_config: Dict[str, Any],
+                     verbose: bool = False) -> List[Dict[str, Any]]:
+    """Apply ``strip_boilerplate`` with settings from the generation config
+
+    Returns the documents unchanged when ``boilerplate_filter`` is disabled.
+    """
+    if not generation_config.get("boilerplate_filter", True):
+        return documents
+
+    cleaned, stats = strip_boilerplate(
+        documents,
+        line_threshold=generation_config.get("boilerplate_line_threshold", 0.2),
+        min_content_chars=generation_config.get("min_content_chars", 200),
+        chunk_size=generation_config.get("chunk_size", 4000),
+        overlap=generation_config.get("overlap", 200),
+    )
+    if verbose or stats["chunks_saved"] or stats["pages_dropped"]:
+        print(f"Boilerplate filter: removed {stats['boilerplate_lines']} repeated lines, "
+              f"dropped {stats['pages_dropped']}/{stats['pages']} pages, "
+              f"saved {stats['chunks_saved']} chunks (~{stats['tokens_saved']} tokens)")
+    return cleaned
@@ -0,0 +1,340 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Chunk selection: decide which chunks of a document are worth sending to the LLM
+import re
+import zlib
+from typing import List, Optional, Dict, Any, Tuple
+
+import numpy as np
+
+from synthetic_data_kit.utils.text import split_into_chunks
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def hashed_tfidf_matrix(texts: List[str], n_features: int = 1024) -> np.ndarray:
+    """Build an L2-normalised TF-IDF matrix using the hashing trick
+
+    Tokens are hashed with crc32 so that vectors are stable across runs
+    (Python's built-in ``hash`` is salted per process).
+
+    Args:
+        texts: Texts to vectorise
+        n_features: Number of hash buckets (columns)
+
+    Returns:
+        Array of shape (len(texts), n_features) with unit-length rows
+    """
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            continue
+        buckets = np.fromiter(
+            (zlib.crc32(token.encode("utf-8")) % n_features for token in tokens),
+            dtype=np.int64,
+            count=len(tokens),
+        )
+        np.add.at(matrix[row], buckets, 1.0)
+
+    # Sublinear term frequency and smoothed inverse document frequency
+    np.log1p(matrix, out=matrix)
+    doc_freq = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1.0 + len(texts)) / (1.0 + doc_freq)) + 1.0
+    matrix *= idf.astype(np.float32)
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def cluster_chunks(vectors: np.ndarray, num_clusters: int, iterations: int = 10) -> np.ndarray:
+    """Group unit-length vectors with spherical k-means
+
+    Centroids are seeded by farthest-point traversal starting from the first
+    row, which keeps the result deterministic and starts every cluster on
+    content that differs from the others.
+
+    Args:
+        vectors: Array of shape (n, d) with unit-length rows
+        num_clusters: Number of clusters to build
+        iterations: Maximum number of Lloyd iterations
+
+    Returns:
+        Array of length n with the cluster id of each row
+    """
+    n = vectors.shape[0]
+    num_clusters = max(1, min(num_clusters, n))
+    seeds = [0]
+    max_similarity = vectors @ vectors[0]
+    for _ in range(1, num_clusters):
+        seed = int(np.argmin(max_similarity))
+        seeds.append(seed)
+        np.maximum(max_similarity, vectors @ vectors[seed], out=max_similarity)
+    centroids = vectors[seeds].copy()
+    labels = np.zeros(n, dtype=np.int64)
+
+    for iteration in range(iterations):
+        new_labels = np.argmax(vectors @ centroids.T, axis=1)
+        if iteration > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for k in range(num_clusters):
+            members = vectors[labels == k]
+            if len(members) == 0:
+                continue
+            centroid = members.sum(axis=0)
+            norm = np.linalg.norm(centroid)
+            if norm > 0:
+                centroids[k] = centroid / norm
+
+    return labels
+
+
+def _spread_order(n: int, offset: float = 0.0) -> List[int]:
+    """Order range(n) so that every prefix is spread evenly across it
+
+    Uses the base-2 van der Corput sequence (0, n/2, n/4, 3n/4, ...), rotated
+    by ``offset`` (a fraction of n) so that different callers start at
+    different positions.
+    """
+    order = []
+    seen = set()
+    i = 0
+    while len(order) < n:
+        value, denom, k = 0.0, 1.0, i
+        while k:
+            denom *= 2
+            k, remainder = divmod(k, 2)
+            value += remainder / denom
+        index = int(((value + offset) % 1.0) * n)
+        if index not in seen:
+            seen.add(index)
+            order.append(index)
+        i += 1
+    return order
+
+
+def select_chunks(chunks: List[str],
+                  num_chunks: int,
+                  num_clusters: Optional[int] = None,
+                  n_features: int = 1024) -> List[int]:
+    """Pick chunk indices that cover the whole document
+
+    Chunks are clustered by content, then picked round-robin across clusters,
+    and within each cluster at positions spread across the document. The
+    returned order is the dispatch order, so any prefix of it is itself a
+    well-spread sample.
+
+    Args:
+        chunks: Chunk texts in document order
+        num_chunks: Number of chunks to select
+        num_clusters: Number of content clusters (None = sqrt of chunk count)
+        n_features: Hash buckets used for the TF-IDF vectors
+
+    Returns:
+        Indices into ``chunks``, at most ``num_chunks`` long
+    """
+    n = len(chunks)
+    if num_chunks >= n:
+        return list(range(n))
+    if num_chunks <= 0:
+        return []
+
+    if num_clusters is None or num_clusters <= 0:
+        num_clusters = int(np.sqrt(n))
+    num_clusters = max(1, min(num_clusters, num_chunks))
+
+    labels = cluster_chunks(hashed_tfidf_matrix(chunks, n_features), num_clusters)
+
+    # Larger clusters first so they get a pick in every round
+    clusters = [np.flatnonzero(labels == k).tolist() for k in range(num_clusters)]
+    clusters = sorted((c for c in clusters if c), key=lambda c: (-len(c), c[0]))
+
+    # Within each cluster, visit members in a position-spreading order. Each
+    # cluster starts at a different offset so the first round of picks is
+    # spread across the document rather than taking every cluster's head.
+    queues = []
+    for rank, members in enumerate(clusters):
+        order = _spread_order(len(members), offset=rank / len(clusters))
+        queues.append([members[i] for i in order])
+
+    selected = []
+    depth = 0
+    while len(selected) < num_chunks:
+        for queue in queues:
+            if depth < len(queue):
+                selected.append(queue[depth])
+                if len(selected) == num_chunks:
+                    break
+        depth += 1
+    return selected
+
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_NUMBER_PATTERN = re.compile(r"^\d[\d.,%]*$")
+_BOILERPLATE_LINE_PATTERN = re.compile(
+    r"(\.{4,}|\s\d+\s*$|^\s*\[\d+\]|\bet al\.|\bdoi:|https?://|copyright|©|all rights reserved|^\s*page\s+\d+)",
+    re.IGNORECASE,
+)
+
+
+def _boilerplate_ratio(text: str) -> float:
+    """Fraction of non-empty lines that look like headers, footers, TOC
+    entries, page numbers or reference list items"""
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return 1.0
+    flagged = 0
+    for line in lines:
+        words = line.split()
+        alpha = sum(ch.isalpha() for ch in line)
+        if (
+            len(words) <= 2
+            or alpha < 0.5 * len(line.strip())
+            or _BOILERPLATE_LINE_PATTERN.search(line)
+        ):
+            flagged += 1
+    return flagged / len(lines)
+
+
+def score_chunks(chunks: List[str]) -> np.ndarray:
+    """Score how much usable content each chunk holds
+
+    The score combines three cheap, local signals:
+
+    - lexical entropy of the word distribution (repetitive text scores low)
+    - density of numbers and capitalised terms (facts, names, quantities)
+    - share of lines that are not boilerplate (TOC, references, page furniture)
+
+    scaled down for chunks shorter than the median chunk (e.g. a short tail).
+
+    Args:
+        chunks: Chunk texts
+
+    Returns:
+        Array of scores in [0, 1], one per chunk
+    """
+    scores = np.zeros(len(chunks), dtype=np.float64)
+    chunk_words = [_WORD_PATTERN.findall(chunk) for chunk in chunks]
+    median_words = float(np.median([len(words) for words in chunk_words])) if chunks else 0.0
+    for i, (chunk, words) in enumerate(zip(chunks, chunk_words)):
+        if not words:
+            continue
+
+        _, counts = np.unique([w.lower() for w in words], return_counts=True)
+        probs = counts / counts.sum()
+        entropy = float(-(probs * np.log2(probs)).sum())
+        entropy /= max(1.0, np.log2(len(words)))
+
+        facts = sum(1 for w in words if _NUMBER_PATTERN.match(w) or w[:1].isupper())
+        fact_density = min(1.0, 3.0 * facts / len(words))
+
+        content = 1.0 - _boilerplate_ratio(chunk)
+        size = min(1.0, len(words) / max(1.0, median_words))
+
+        scores[i] = (0.6 * entropy + 0.4 * fact_density) * content * size
+    return scores
+
+
+def allocate_pairs(scores: np.ndarray, num_pairs: int, min_score: float = 0.0) -> List[int]:
+    """Split a pair budget across chunks in proportion to their scores
+
+    Chunks scoring below ``min_score`` get nothing (unless that would leave no
+    chunk at all, in which case the best one, or the first when every chunk
+    scores 0, is kept with the whole budget). Every other chunk gets at
+    least one pair (so the total can exceed ``num_pairs`` when there are more
+    eligible chunks than pairs, as with the previous uniform split); the rest
+    of the budget is shared by score using largest remainders.
+
+    Args:
+        scores: Per-chunk scores, e.g. from ``score_chunks``
+        num_pairs: Total number of pairs requested
+        min_score: Floor below which a chunk is skipped
+
+    Returns:
+        Number of pairs to request from each chunk
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    eligible = (scores >= min_score) & (scores > 0)
+    if not eligible.any() and len(scores) and num_pairs > 0:
+        # Never skip a whole document; keep its best chunk
+        eligible[int(np.argmax(scores))] = True
+    allocation = eligible.astype(np.int64)
+
+    extra = num_pairs - int(allocation.sum())
+    weights = np.where(eligible, scores, 0.0)
+    if not weights.any():
+        weights = eligible.astype(np.float64)
+    if extra > 0 and weights.sum() > 0:
+        shares = extra * weights / weights.sum()
+        whole = np.floor(shares).astype(np.int64)
+        allocation += whole
+        leftover = extra - int(whole.sum())
+        if leftover > 0:
+            order = np.argsort(-(shares - whole), kind="stable")
+            allocation[order[:leftover]] += 1
+    return allocation.tolist()
+
+
+def plan_chunks(document_text: str,
+                num_items: int,
+                generation_config: Dict[str, Any],
+                verbose: bool = False) -> Tuple[List[str], List[int], List[int]]:
+    """Split a document and decide which chunks to send and what to ask of each
+
+    Applies the generation config's ``pair_allocation`` (density scoring with
+    a ``min_chunk_density`` floor, or a uniform split) and ``chunk_sampling``
+    (coverage sampling when fewer items than chunks are requested).
+
+    Args:
+        document_text: Full document text
+        num_items: Number of items (QA pairs, CoT examples) requested
+        generation_config: The ``generation`` section of the config
+        verbose: Print what was skipped and selected
+
+    Returns:
+        Tuple of (all chunks, indices of chunks to dispatch in order,
+        number of items to request from each dispatched chunk)
+    """
+    chunks = split_into_chunks(
+        document_text,
+        chunk_size=generation_config.get("chunk_size", 4000),
+        overlap=generation_config.get("overlap", 200)
+    )
+    chunk_sampling = generation_config.get("chunk_sampling", "coverage")
+    pair_allocation = generation_config.get("pair_allocation", "density")
+    chunk_indices = list(range(len(chunks)))
+
+    # Skip chunks that hold too little content to be worth a request
+    if pair_allocation == "density":
+        chunk_scores = score_chunks(chunks)
+        min_density = generation_config.get("min_chunk_density", 0.1)
+        eligible = allocate_pairs(chunk_scores, num_items, min_score=min_density)
+        chunk_indices = [i for i in chunk_indices if eligible[i] > 0]
+        if verbose:
+            print(f"Skipping {len(chunks) - len(chunk_indices)} low-content chunks (density < {min_density})")
+
+    # When far fewer items than chunks are requested, sample chunks across
+    # the whole document instead of working through it from the start
+    if chunk_sampling == "coverage" and num_items < len(chunk_indices):
+        picked = select_chunks(
+            [chunks[i] for i in chunk_indices],
+            num_items,
+            num_clusters=generation_config.get("sampling_clusters")
+        )
+        chunk_indices = [chunk_indices[i] for i in picked]
+        if verbose:
+            print(f"Coverage sampling selected {len(chunk_indices)} of {len(chunks)} chunks")
+
+    # Decide how many items to ask of each chunk
+    if pair_allocation == "density":
+        budgets = allocate_pairs(chunk_scores[chunk_indices], num_items)
+    else:
+        per_chunk = max(1, round(num_items / max(1, len(chunk_indices))))
+        budgets = [per_chunk] * len(chunk_indices)
+
+    return chunks, chunk_indices, budgets
@@ -0,0 +1,514 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Near-duplicate removal for generated QA pairs and CoT examples
+import re
+import zlib
+import importlib
+from collections import deque
+from typing import List, Dict, Any, Tuple, Optional, Callable
+
+import numpy as np
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Upper bound on shingles hashed at once (num_perm x block uint64 values)
+_SHINGLE_BLOCK = 32768
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so trivial edits don't matter"""
+    return _NON_WORD.sub(" ", str(text).lower()).strip()
+
+
+def _shingles(encoded: List[bytes], ngram: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack every byte n-gram of the given texts into one uint64 array
+
+    Args:
+        encoded: Normalised texts as bytes, each at least ``ngram`` long
+        ngram: Shingle size in bytes (at most 8)
+
+    Returns:
+        Tuple of (shingles of all texts concatenated, offset of each text's
+        first shingle)
+    """
+    counts = np.array([len(e) - ngram + 1 for e in encoded], dtype=np.int64)
+    text_starts = np.cumsum([0] + [len(e) for e in encoded[:-1]], dtype=np.int64)
+    offsets = np.concatenate(([0], np.cumsum(counts[:-1]))).astype(np.int64)
+
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    positions = np.arange(int(counts.sum()), dtype=np.int64) + np.repeat(text_starts - offsets, counts)
+    shingles = np.zeros(len(positions), dtype=np.uint64)
+    for k in range(ngram):
+        shingles = (shingles << np.uint64(8)) | buffer[positions + k]
+    return shingles, offsets
+
+
+def minhash_signatures(texts: List[str],
+                       num_perm: int = 128,
+                       ngram: int = 4,
+                       seed: int = 1) -> np.ndarray:
+    """Compute MinHash signatures for many texts at once
+
+    Byte n-grams of the normalised texts are packed into integers and hashed
+    under all permutations in one array operation using multiply-shift
+    hashing ((a * x + b) mod 2**64) >> 32, then reduced per text with
+    ``np.minimum.reduceat``.
+
+    Args:
+        texts: Texts to sign
+        num_perm: Number of hash permutations (signature length)
+        ngram: Shingle size in bytes (at most 8)
+        seed: Seed for the permutation coefficients
+
+    Returns:
+        Array of shape (len(texts), num_perm) with dtype uint32
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.randint(0, 1 << 62, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    # Texts shorter than one shingle are padded so every text has at least one
+    encoded = [normalize_text(text).encode("utf-8").ljust(ngram) for text in texts]
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+
+    start = 0
+    while start < len(encoded):
+        # Group texts until the block holds enough shingles
+        end, size = start, 0
+        while end < len(encoded) and (end == start or size + len(encoded[end]) <= _SHINGLE_BLOCK):
+            size += len(encoded[end])
+            end += 1
+
+        shingles, offsets = _shingles(encoded[start:end], ngram)
+        values = (a[:, None] * shingles[None, :] + b[:, None]) >> np.uint64(32)
+        signatures[start:end] = np.minimum.reduceat(values, offsets, axis=1).T
+        start = end
+    return signatures
+
+
+def lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick (bands, rows) for LSH banding
+
+    The candidate threshold of b bands of r rows is about (1/b)^(1/r). We take
+    the highest one that is still at or below ``threshold``, so that true
+    duplicates are rarely missed; false candidates are removed by comparing
+    signatures afterwards.
+    """
+    options = []
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        options.append(((1.0 / bands) ** (1.0 / rows), bands, rows))
+    below = [o for o in options if o[0] <= threshold]
+    _, bands, rows = max(below) if below else min(options)
+    return bands, rows
+
+
+class MinHashLSH:
+    """Index of MinHash signatures for near-duplicate lookups
+
+    Each signature is split into bands and every band is hashed to one
+    integer; signatures sharing any band hash land in the same bucket and
+    become candidates, so a lookup only touches the few entries in matching
+    buckets instead of the whole index.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self.signatures: List[np.ndarray] = []
+        self._band_weights = np.random.RandomState(0).randint(
+            1, 1 << 62, size=self.rows, dtype=np.int64
+        ).astype(np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Hash each band of each signature, shape (n, bands)"""
+        signatures = np.atleast_2d(signatures)[:, :self.bands * self.rows]
+        bands = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        return (bands * self._band_weights).sum(axis=2, dtype=np.uint64)
+
+    def query(self, signature: np.ndarray, keys: Optional[List[int]] = None) -> List[int]:
+        """Return ids of indexed signatures with estimated Jaccard >= threshold"""
+        if keys is None:
+            keys = self.band_keys(signature)[0].tolist()
+        candidates = set()
+        for bucket, key in zip(self.buckets, keys):
+            candidates.update(bucket.get(key, ()))
+        return [
+            i for i in sorted(candidates)
+            if np.count_nonzero(self.signatures[i] == signature) >= self.threshold * self.num_perm
+        ]
+
+    def insert(self, signature: np.ndarray, keys: Optional[List[int]] = None) -> int:
+        """Add a signature and return its id"""
+        if keys is None:
+            keys = self.band_keys(signature)[0].tolist()
+        item_id = len(self.signatures)
+        self.signatures.append(signature)
+        for bucket, key in zip(self.buckets, keys):
+            bucket.setdefault(key, []).append(item_id)
+        return item_id
+
+    def add_many(self, signatures: np.ndarray) -> List[bool]:
+        """Insert each signature unless it duplicates one already indexed
+        (including earlier ones in the same call)
+
+        Returns:
+            For each signature, True if it was new and has been inserted
+        """
+        added = []
+        for signature, keys in zip(signatures, self.band_keys(signatures).tolist()):
+            is_new = not self.query(signature, keys)
+            if is_new:
+                self.insert(signature, keys)
+            added.append(is_new)
+        return added
+
+
+def deduplicate(items: List[Dict[str, Any]],
+                threshold: float = 0.8,
+                key: str = "question",
+                num_perm: int = 128,
+                index: Optional[MinHashLSH] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Drop items whose ``key`` field nearly duplicates an earlier item's
+
+    Args:
+        items: Items such as QA pairs or CoT examples
+        threshold: Estimated Jaccard similarity at which items count as duplicates
+        key: Field compared between items
+        num_perm: MinHash signature length
+        index: Existing index to check against and extend (e.g. across documents)
+
+    Returns:
+        Tuple of (kept items in their original order, number removed)
+    """
+    if index is None:
+        index = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    signatures = minhash_signatures([item.get(key, "") for item in items], num_perm=index.num_perm)
+    kept = [item for item, is_new in zip(items, index.add_many(signatures)) if is_new]
+    return kept, len(items) - len(kept)
+
+
+def deduplicate_items(items: List[Dict[str, Any]],
+                      generation_config: Dict[str, Any],
+                      verbose: bool = False,
+                      label: str = "QA pairs") -> List[Dict[str, Any]]:
+    """Apply ``deduplicate`` with settings from the generation config
+
+    Returns the items unchanged when ``enable_deduplication`` is disabled.
+    """
+    if not items or not generation_config.get("enable_deduplication", True):
+        return items
+
+    threshold = generation_config.get("similarity_threshold", 0.8)
+    kept, removed = deduplicate(items, threshold=threshold)
+    if verbose or removed:
+        print(f"Deduplication: removed {removed} near-duplicate {label} "
+              f"(similarity >= {threshold}), {len(kept)} remaining")
+    return kept
+
+
+class NoveltyTracker:
+    """Online rate of novel items among the most recently generated ones
+
+    An item is novel when its ``key`` field is not a near-duplicate of an
+    item seen before. Generation loops feed every new item through
+    ``observe`` and stop dispatching once ``saturated`` says the model has
+    mostly started repeating itself; ``dispatch_ranges`` sizes the dispatches
+    so that check runs after the first few chunks.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.8,
+                 floor: float = 0.0,
+                 window: int = 50,
+                 key: str = "question",
+                 check_chunks: int = 4):
+        self.index = MinHashLSH(threshold=threshold)
+        self.floor = floor
+        self.key = key
+        self.recent = deque(maxlen=window)
+        self.seen = 0
+        self.check_chunks = max(1, check_chunks)
+
+    @classmethod
+    def from_config(cls, generation_config: Dict[str, Any], target: Optional[int] = None) -> "NoveltyTracker":
+        """Tracker for a run of ``target`` items; the window never exceeds the
+        target (down to 10 items), so small runs can saturate too"""
+        window = generation_config.get("saturation_window", 50)
+        if target:
+            window = min(window, max(target, 10))
+        return cls(
+            threshold=generation_config.get("similarity_threshold", 0.8),
+            floor=generation_config.get("saturation_floor", 0.1),
+            window=window,
+            check_chunks=generation_config.get("saturation_check_chunks", 4),
+        )
+
+    def dispatch_ranges(self, total: int, batch_size: int) -> List[Tuple[int, int]]:
+        """(start, end) ranges of ``total`` chunks to dispatch, checking saturation between them
+
+        With a floor set, the first range holds ``check_chunks`` chunks and
+        each later one twice as many as the last, up to ``batch_size``, so a
+        document that fits in one batch is still checked early. Otherwise
+        every range is a full batch.
+        """
+        ranges = []
+        size = min(self.check_chunks, batch_size) if self.floor > 0 else batch_size
+        start = 0
+        while start < total:
+            end = min(start + size, total)
+            ranges.append((start, end))
+            start = end
+            size = min(size * 2, batch_size)
+        return ranges
+
+    def observe(self, items: List[Dict[str, Any]]) -> List[bool]:
+        """Record items and return which of them are novel"""
+        items = [item for item in items if isinstance(item, dict)]
+        if not items:
+            return []
+        signatures = minhash_signatures([str(item.get(self.key, "")) for item in items], num_perm=self.index.num_perm)
+        novel = self.index.add_many(signatures)
+        self.recent.extend(novel)
+        self.seen += len(novel)
+        return novel
+
+    @property
+    def rate(self) -> float:
+        """Fraction of novel items in the window (1.0 before anything is seen)"""
+        return sum(self.recent) / len(self.recent) if self.recent else 1.0
+
+    def saturated(self) -> bool:
+        """True once a full window has been seen and its novelty rate is below the floor"""
+        return self.floor > 0 and len(self.recent) == self.recent.maxlen and self.rate < self.floor
+
+    def describe(self) -> str:
+        return (f"novelty rate {self.rate:.0%} over the last {len(self.recent)} items "
+                f"fell below the floor of {self.floor:.0%}")
+
+
+# Maps a batch of texts to an (n, d) array of vectors
+EmbedFn = Callable[[List[str]], np.ndarray]
+
+
+def hashing_embedder(texts: List[str], n_features: int = 512) -> np.ndarray:
+    """Embed texts as hashed word unigram + bigram counts (no model needed)
+
+    The vectors are stateless (no IDF), so texts embedded in different
+    batches are directly comparable.
+
+    Args:
+        texts: Texts to embed
+        n_features: Number of hash buckets (vector dimension)
+
+    Returns:
+        Array of shape (len(texts), n_features), dtype float32
+    """
+    rows, buckets = [], []
+    for row, text in enumerate(texts):
+        words = _WORD.findall(str(text).lower())
+        terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        rows.extend([row] * len(terms))
+        buckets.extend(zlib.crc32(term.encode("utf-8")) % n_features for term in terms)
+
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows, dtype=np.int64), np.asarray(buckets, dtype=np.int64)), 1.0)
+    return np.log1p(matrix, out=matrix)
+
+
+def load_embed_fn(spec: Optional[str]) -> EmbedFn:
+    """Resolve an embedding function from a ``"package.module:function"`` spec
+
+    Returns ``hashing_embedder`` when no spec is given.
+    """
+    if not spec:
+        return hashing_embedder
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Embedding function must be given as 'module:function', got '{spec}'")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def embed_texts(texts: List[str],
+                embed_fn: Optional[EmbedFn] = None,
+                batch_size: int = 8192) -> np.ndarray:
+    """Embed texts in batches and L2-normalise the rows
+
+    Returns:
+        Array of shape (len(texts), d), dtype float32
+    """
+    embed_fn = embed_fn or hashing_embedder
+    batches = [
+        np.asarray(embed_fn(texts[i:i + batch_size]), dtype=np.float32)
+        for i in range(0, len(texts), batch_size)
+    ]
+    if not batches:
+        return np.zeros((0, 0), dtype=np.float32)
+    vectors = np.concatenate(batches)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _greedy_keep(vectors: np.ndarray,
+                 ids: np.ndarray,
+                 threshold: float,
+                 block_size: int) -> np.ndarray:
+    """Keep each id (visited in the given order) unless it is within
+    ``threshold`` cosine of an id kept before it
+
+    Similarities come from blocked matrix products: ``block_size`` rows at a
+    time against ``block_size`` kept vectors at a time.
+    """
+    kept_vectors = np.empty((len(ids), vectors.shape[1]), dtype=vectors.dtype)
+    kept_ids = []
+
+    for start in range(0, len(ids), block_size):
+        block_ids = ids[start:start + block_size]
+        block = vectors[block_ids]
+
+        # Against everything kept in earlier blocks
+        duplicate = np.zeros(len(block_ids), dtype=bool)
+        for kept_start in range(0, len(kept_ids), block_size):
+            kept_end = min(len(kept_ids), kept_start + block_size)
+            similarity = block @ kept_vectors[kept_start:kept_end].T
+            duplicate |= (similarity >= threshold).any(axis=1)
+
+        # Within the block, in visiting order. Only rows with a similar
+        # earlier row need the sequential check; the rest are kept as is.
+        similar = np.triu(block @ block.T >= threshold, k=1)
+        contested = similar.any(axis=0)
+        keep = ~duplicate
+        for row in np.flatnonzero(contested & keep):
+            if (similar[:row, row] & keep[:row]).any():
+                keep[row] = False
+        block_kept = np.flatnonzero(keep)
+
+        kept_vectors[len(kept_ids):len(kept_ids) + len(block_kept)] = block[block_kept]
+        kept_ids.extend(block_ids[block_kept].tolist())
+
+    return np.asarray(kept_ids, dtype=np.int64)
+
+
+def _lsh_tables(num_items: int,
+                threshold: float,
+                exact_limit: int,
+                bucket_size: int,
+                recall: float) -> Tuple[int, int]:
+    """Pick (bits per table, number of tables) for random-hyperplane LSH
+
+    Two vectors at cosine ``threshold`` agree on one hyperplane bit with
+    probability 1 - arccos(threshold) / pi. Bits are chosen so buckets hold
+    about ``bucket_size`` items, and tables so that such a pair shares a
+    bucket in at least one table with probability ``recall``. Small inputs
+    use a single table with no bits, i.e. exact search.
+    """
+    if num_items <= exact_limit:
+        return 0, 1
+    bits = int(np.ceil(np.log2(num_items / bucket_size)))
+    agree = 1.0 - np.arccos(np.clip(threshold, -1.0, 1.0)) / np.pi
+    collide = agree ** bits
+    if collide >= 1.0:
+        return bits, 1
+    tables = int(np.ceil(np.log(1.0 - recall) / np.log(1.0 - collide)))
+    return bits, max(1, tables)
+
+
+def semantic_deduplicate(items: List[Dict[str, Any]],
+                         threshold: float = 0.9,
+                         key: str = "question",
+                         score_key: str = "rating",
+                         embed_fn: Optional[EmbedFn] = None,
+                         block_size: int = 2048,
+                         exact_limit: int = 20000,
+                         bucket_size: int = 1024,
+                         recall: float = 0.9,
+                         seed: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """Keep the highest-scoring item of each group of semantically similar items
+
+    Items are visited from highest to lowest ``score_key``; an item is kept
+    unless its cosine similarity to an already kept item reaches
+    ``threshold``. Up to ``exact_limit`` items every pair is compared with
+    blocked matrix products. Larger inputs are first bucketed by
+    random-hyperplane LSH (several tables, each a sign pattern of random
+    projections) and compared only within buckets, which keeps the cost
+    roughly linear in the number of items.
+
+    Args:
+        items: Items such as rated QA pairs
+        threshold: Cosine similarity at which items count as duplicates
+        key: Field that is embedded and compared
+        score_key: Field deciding which member of a group is kept (missing = 0)
+        embed_fn: Embedding function (default: ``hashing_embedder``)
+        block_size: Rows per matrix product block
+        exact_limit: Largest input searched exhaustively
+        bucket_size: Target LSH bucket size for larger inputs
+        recall: Target probability of catching a pair at ``threshold``
+        seed: Seed for the random hyperplanes
+
+    Returns:
+        Tuple of (kept items in their original order, number removed)
+    """
+    if not items:
+        return [], 0
+
+    vectors = embed_texts([str(item.get(key, "")) for item in items], embed_fn)
+    scores = np.array([float(item.get(score_key) or 0) for item in items])
+    order = np.argsort(-scores, kind="stable")
+
+    bits, tables = _lsh_tables(len(items), threshold, exact_limit, bucket_size, recall)
+    rng = np.random.RandomState(seed)
+    alive = np.ones(len(items), dtype=bool)
+
+    for _ in range(tables):
+        ids = order[alive[order]]
+        if bits:
+            planes = rng.standard_normal((vectors.shape[1], bits)).astype(np.float32)
+            signs = (vectors[ids] @ planes) > 0
+            codes = signs.astype(np.int64) @ (1 << np.arange(bits, dtype=np.int64))
+        else:
+            codes = np.zeros(len(ids), dtype=np.int64)
+
+        # A stable sort keeps score order inside each bucket
+        by_code = np.argsort(codes, kind="stable")
+        ids, codes = ids[by_code], codes[by_code]
+        for bucket in np.split(ids, np.flatnonzero(np.diff(codes)) + 1):
+            if len(bucket) < 2:
+                continue
+            kept = _greedy_keep(vectors, bucket, threshold, block_size)
+            alive[bucket] = False
+            alive[kept] = True
+
+    kept = [item for item, is_kept in zip(items, alive) if is_kept]
+    return kept, len(items) - len(kept)
+
+
+def semantic_deduplicate_items(items: List[Dict[str, Any]],
+                               generation_config: Dict[str, Any],
+                               verbose: bool = False,
+                               label: str = "QA pairs") -> List[Dict[str, Any]]:
+    """Apply ``semantic_deduplicate`` with settings from the generation config
+
+    Returns the items unchanged unless ``semantic_dedup`` is enabled.
+    """
+    if not items or not generation_config.get("semantic_dedup", False):
+        return items
+
+    threshold = generation_config.get("semantic_similarity_threshold", 0.9)
+    embed_fn = load_embed_fn(generation_config.get("embedding_function"))
+    kept, removed = semantic_deduplicate(items, threshold=threshold, embed_fn=embed_fn)
+    if verbose or removed:
+        print(f"Semantic deduplication: removed {removed} paraphrased {label} "
+              f"(cosine >= {threshold}), {len(kept)} remaining")
+    return kept
@@ -59,12 +59,154 @@ def get_supported_files(directory: str, extensions: List[str]) -> List[str]:
     
     return sorted(supported_files)  # Sort for consistent processing order
 
+def _init_ingest_worker(max_memory_mb: Optional[int]) -> None:
+    """Cap the address space of an ingest worker process"""
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows; workers run without a memory cap
+        return
+    limit = int(max_memory_mb) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _ingest_one(file_path: str, output_dir: Optional[str], config: Optional[Dict[str, Any]],
+                multimodal: bool, timeout: Optional[float]) -> str:
+    """Ingest one file in a worker, giving up after ``timeout`` seconds"""
+    import signal
+    from synthetic_data_kit.core.ingest import process_file
+
+    if not timeout or not hasattr(signal, "SIGALRM"):
+        return process_file(file_path, output_dir, None, config, multimodal=multimodal)
+
+    def _timed_out(signum, frame):
+        raise TimeoutError(f"Timed out after {timeout}s")
+
+    previous = signal.signal(signal.SIGALRM, _timed_out)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return process_file(file_path, output_dir, None, config, multimodal=multimodal)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# Seconds past file_timeout before the parent kills a worker stuck in native code
+KILL_GRACE = 5.0
+
+
+def _ingest_in_pool(files: List[str], workers: int, max_memory_mb: Optional[int],
+                    file_timeout: Optional[float], args: tuple,
+                    done: Callable[[str, Optional[str], Optional[Exception]], None]) -> None:
+    """Ingest ``files`` on a process pool, calling ``done(file_path, output_path, error)`` for each
+
+    At most ``workers`` files are in flight, each with its own deadline. A
+    file hung in Python code is stopped by the worker's SIGALRM; SIGALRM
+    never fires inside native code (pdfminer, PyMuPDF, lance), so a file
+    still running ``KILL_GRACE`` seconds past ``file_timeout`` has its pool
+    killed from here. Whenever the pool breaks (a worker segfaults, is
+    OOM-killed or was killed for a timeout) it is rebuilt and unfinished
+    files are resubmitted. Files that were in flight together when a worker
+    crashed are retried one at a time, so only the file that crashes its
+    worker is failed.
+    """
+    import time
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    queue = deque((file_path, False) for file_path in files)
+    # future -> (file_path, retried alone, deadline)
+    in_flight: Dict[Any, tuple] = {}
+    executor = None
+
+    def restart() -> None:
+        nonlocal executor
+        for future in in_flight:
+            future.cancel()
+        # The executor has no public way to stop a busy worker
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.kill()
+        executor.shutdown(wait=True)
+        executor = None
+        in_flight.clear()
+
+    try:
+        while queue or in_flight:
+            if executor is None:
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_ingest_worker,
+                    initargs=(max_memory_mb,),
+                )
+            # A file retried alone runs with nothing else in flight
+            while queue and len(in_flight) < workers and not any(alone for _, alone, _ in in_flight.values()):
+                if queue[0][1] and in_flight:
+                    break
+                file_path, alone = queue.popleft()
+                deadline = time.monotonic() + file_timeout + KILL_GRACE if file_timeout else None
+                future = executor.submit(_ingest_one, file_path, *args, file_timeout)
+                in_flight[future] = (file_path, alone, deadline)
+
+            deadlines = [deadline for _, _, deadline in in_flight.values() if deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            finished, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            crashed = []
+            for future in finished:
+                file_path, alone, _ = in_flight.pop(future)
+                try:
+                    output_path = future.result()
+                except BrokenProcessPool:
+                    crashed.append((file_path, alone))
+                except MemoryError:
+                    done(file_path, None, MemoryError(f"Exceeded {max_memory_mb} MB memory limit"))
+                except Exception as e:
+                    done(file_path, None, e)
+                else:
+                    done(file_path, output_path, None)
+
+            if crashed:
+                # Every unfinished file of a broken pool fails with it
+                crashed.extend((file_path, alone) for file_path, alone, _ in in_flight.values())
+                restart()
+                if len(crashed) == 1:
+                    done(crashed[0][0], None, RuntimeError("Worker process crashed (e.g. segfault or out of memory)"))
+                else:
+                    queue.extendleft((file_path, True) for file_path, _ in reversed(crashed))
+                continue
+
+            now = time.monotonic()
+            expired = [file_path for file_path, _, deadline in in_flight.values()
+                       if deadline is not None and deadline <= now]
+            if expired:
+                others = [(file_path, alone) for file_path, alone, _ in in_flight.values()
+                          if file_path not in expired]
+                restart()
+                for file_path in expired:
+                    done(file_path, None, TimeoutError(f"Timed out after {file_timeout}s; worker killed"))
+                queue.extendleft(reversed(others))
+        if executor is not None:
+            executor.shutdown(wait=True)
+            executor = None
+    finally:
+        if executor is not None:
+            # Interrupted: don't leave workers running
+            restart()
+
+
 def process_directory_ingest(
     directory: str,
     output_dir: Optional[str] = None,
     config: Optional[Dict[str, Any]] = None,
     verbose: bool = False,
     multimodal: bool = False,
+    workers: int = 1,
+    file_timeout: Optional[float] = None,
+    max_memory_mb: Optional[int] = None,
+    force: bool = False,
 ) -> Dict[str, Any]:
     """Process all supported files in directory for ingestion
     
@@ -73,11 +215,16 @@ def process_directory_ingest(
         output_dir: Directory to save processed files
         config: Configuration dictionary
         verbose: Show detailed progress
+        workers: Number of worker processes (1 parses files in this process)
+        file_timeout: Seconds after which a worker gives up on a file
+        max_memory_mb: Address-space limit of each worker process
+        force: Re-parse files the manifest records as up to date
     
     Returns:
-        Dictionary with processing results
+        Dictionary with processing results, in directory order
     """
-    from synthetic_data_kit.core.ingest import process_file
+    from synthetic_data_kit.core.ingest import process_file, ingest_settings
+    from synthetic_data_kit.utils.manifest import Manifest
     
     # Get all supported files
     supported_files = get_supported_files(directory, INGEST_EXTENSIONS)
@@ -89,6 +236,7 @@ def process_directory_ingest(
             "total_files": 0,
             "successful": 0,
             "failed": 0,
+            "skipped": 0,
             "results": [],
             "errors": []
         }
@@ -100,9 +248,66 @@ def process_directory_ingest(
         "total_files": len(supported_files),
         "successful": 0,
         "failed": 0,
+        "skipped": 0,
         "results": [],
         "errors": []
     }
+    order = {file_path: i for i, file_path in enumerate(supported_files)}
+    
+    # Skip files whose parsed output is up to date with their content and parser
+    manifest = Manifest(output_dir) if output_dir else None
+    settings = {file_path: ingest_settings(file_path, config, multimodal) for file_path in supported_files}
+    pending = []
+    for file_path in supported_files:
+        output_path = None if force or manifest is None else manifest.up_to_date(
+            "ingest", file_path, settings[file_path]
+        )
+        if output_path is None:
+            pending.append(file_path)
+            continue
+        results["skipped"] += 1
+        results["results"].append({
+            "input_file": file_path,
+            "output_file": output_path,
+            "status": "skipped"
+        })
+    if results["skipped"]:
+        console.print(f"Skipping {results['skipped']} unchanged files", style="blue")
+    
+    workers = max(1, min(workers or 1, len(pending)))
+    if workers > 1:
+        console.print(f"Using {workers} worker processes", style="blue")
+    
+    def record(file_path: str, output_path: Optional[str] = None, error: Optional[Exception] = None):
+        filename = os.path.basename(file_path)
+        if error is None:
+            # Record success
+            if manifest is not None:
+                manifest.record("ingest", file_path, settings[file_path], output_path)
+            results["successful"] += 1
+            results["results"].append({
+                "input_file": file_path,
+                "output_file": output_path,
+                "status": "success"
+            })
+            
+            if verbose:
+                console.print(f"✓ Processed {filename} -> {os.path.basename(output_path)}", style="green")
+            else:
+                console.print(f"✓ {filename}", style="green")
+        else:
+            # Record failure
+            results["failed"] += 1
+            results["errors"].append({
+                "input_file": file_path,
+                "error": str(error),
+                "status": "failed"
+            })
+            
+            if verbose:
+                console.print(f"✗ Failed to process {filename}: {error}", style="red")
+            else:
+                console.print(f"✗ {filename}: {error}", style="red")
     
     # Process files with progress bar
     with Progress(
@@ -115,49 +320,41 @@ def process_directory_ingest(
         disable=not verbose
     ) as progress:
         
-        task = progress.add_task("Processing files", total=len(supported_files))
+        task = progress.add_task("Processing files", total=len(pending))
         
-        for file_path in supported_files:
-            filename = os.path.basename(file_path)
-            
-            try:
-                # Process individual file
-                output_path = process_file(file_path, output_dir, None, config, multimodal=multimodal)
-                
-                # Record success
-                results["successful"] += 1
-                results["results"].append({
-                    "input_file": file_path,
-                    "output_file": output_path,
-                    "status": "success"
-                })
-                
-                if verbose:
-                    console.print(f"✓ Processed {filename} -> {os.path.basename(output_path)}", style="green")
+        if workers == 1:
+            for file_path in pending:
+                try:
+                    # Process individual file
+                    output_path = process_file(file_path, output_dir, None, config, multimodal=multimodal)
+                except Exception as e:
+                    record(file_path, error=e)
                 else:
-                    console.print(f"✓ {filename}", style="green")
-                
-            except Exception as e:
-                # Record failure
-                results["failed"] += 1
-                results["errors"].append({
-                    "input_file": file_path,
-                    "error": str(e),
-                    "status": "failed"
-                })
-                
-                if verbose:
-                    console.print(f"✗ Failed to process {filename}: {e}", style="red")
-                else:
-                    console.print(f"✗ {filename}: {e}", style="red")
-            
-            progress.update(task, advance=1)
+                    record(file_path, output_path)
+                progress.update(task, advance=1)
+        else:
+            # Files are already spread across processes; don't also split their pages
+            config = dict(config or {})
+            config["ingest"] = dict(config.get("ingest") or {}, pdf_page_workers=1)
+
+            def done(file_path: str, output_path: Optional[str], error: Optional[Exception]) -> None:
+                record(file_path, output_path, error)
+                progress.update(task, advance=1)
+
+            _ingest_in_pool(pending, workers, max_memory_mb, file_timeout,
+                            (output_dir, config, multimodal), done)
+    
+    # Report in directory order however the files finished
+    results["results"].sort(key=lambda item: order[item["input_file"]])
+    results["errors"].sort(key=lambda item: order[item["input_file"]])
     
     # Show summary
     console.print("\n" + "="*50, style="bold")
     console.print(f"Processing Summary:", style="bold blue")
     console.print(f"Total files: {results['total_files']}")
     console.print(f"Successful: {results['successful']}", style="green")
+    if results["skipped"]:
+        console.print(f"Skipped (up to date): {results['skipped']}", style="blue")
     console.print(f"Failed: {results['failed']}", style="red" if results['failed'] > 0 else "green")
     console.print("="*50, style="bold")
     
@@ -223,6 +420,8 @@ def process_directory_create(
     provider: Optional[str] = None,
     chunk_size: Optional[int] = None,
     chunk_overlap: Optional[int] = None,
+    resume: bool = False,
+    force: bool = False,
 ) -> Dict[str, Any]:
     """Process all supported files in directory for content creation
     
@@ -232,15 +431,19 @@ def process_directory_create(
         config_path: Path to configuration file
         api_base: API base URL
         model: Model to use
-        content_type: Type of content to generate (qa, summary, cot, cot-enhance)
+        content_type: Type of content to generate (qa, qa-cot, summary, cot, cot-enhance)
         num_pairs: Target number of QA pairs or examples
         verbose: Show detailed progress
         provider: LLM provider to use
+        resume: Continue interrupted runs from their journals
+        force: Regenerate files the manifest records as up to date
     
     Returns:
         Dictionary with processing results
     """
     from synthetic_data_kit.core.create import process_file
+    from synthetic_data_kit.utils.config import load_config
+    from synthetic_data_kit.utils.manifest import Manifest, settings_fingerprint
     
     # For create command, we process .txt files (output from ingest)
     # For cot-enhance, we process .json files instead
@@ -266,6 +469,7 @@ def process_directory_create(
             "total_files": 0,
             "successful": 0,
             "failed": 0,
+            "skipped": 0,
             "results": [],
             "errors": []
         }
@@ -277,10 +481,33 @@ def process_directory_create(
         "total_files": len(supported_files),
         "successful": 0,
         "failed": 0,
+        "skipped": 0,
         "results": [],
         "errors": []
     }
     
+    # Skip inputs whose generated output is up to date with their content and settings
+    stage = f"create:{content_type}"
+    manifest = Manifest(output_dir) if output_dir else None
+    settings = settings_fingerprint(
+        content_type, model, api_base, provider, num_pairs, chunk_size, chunk_overlap, load_config(config_path)
+    )
+    pending = []
+    for file_path in supported_files:
+        output_path = None if force or manifest is None else manifest.up_to_date(stage, file_path, settings)
+        if output_path is None:
+            pending.append(file_path)
+            continue
+        results["skipped"] += 1
+        results["results"].append({
+            "input_file": file_path,
+            "output_file": output_path,
+            "content_type": content_type,
+            "status": "skipped"
+        })
+    if results["skipped"]:
+        console.print(f"Skipping {results['skipped']} files with up-to-date output", style="blue")
+    
     # Process files with progress bar
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -292,9 +519,9 @@ def process_directory_create(
         disable=not verbose
     ) as progress:
         
-        task = progress.add_task(f"Generating {content_type} content", total=len(supported_files))
+        task = progress.add_task(f"Generating {content_type} content", total=len(pending))
         
-        for file_path in supported_files:
+        for file_path in pending:
             filename = os.path.basename(file_path)
             
             try:
@@ -310,10 +537,13 @@ def process_directory_create(
                     verbose,
                     provider=provider,
                     chunk_size=chunk_size,
-                    chunk_overlap=chunk_overlap
+                    chunk_overlap=chunk_overlap,
+                    resume=resume
                 )
                 
                 # Record success
+                if manifest is not None:
+                    manifest.record(stage, file_path, settings, output_path)
                 results["successful"] += 1
                 results["results"].append({
                     "input_file": file_path,
@@ -349,6 +579,8 @@ def process_directory_create(
     console.print(f"Content Generation Summary ({content_type}):", style="bold blue")
     console.print(f"Total files: {results['total_files']}")
     console.print(f"Successful: {results['successful']}", style="green")
+    if results["skipped"]:
+        console.print(f"Skipped (up to date): {results['skipped']}", style="blue")
     console.print(f"Failed: {results['failed']}", style="red" if results['failed'] > 0 else "green")
     console.print("="*50, style="bold")
     
@@ -363,6 +595,11 @@ def process_directory_curate(
     config_path: Optional[str] = None,
     verbose: bool = False,
     provider: Optional[str] = None,
+    rethreshold: bool = False,
+    top_k: Optional[int] = None,
+    top_k_per_source: bool = False,
+    resume: bool = True,
+    stream: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """Process all supported files in directory for content curation
     
@@ -375,11 +612,21 @@ def process_directory_curate(
         config_path: Path to configuration file
         verbose: Show detailed progress
         provider: LLM provider to use
+        rethreshold: Re-apply the threshold to stored ratings without an LLM
+        top_k: Keep only the ``top_k`` best-rated pairs across the directory
+        top_k_per_source: Apply ``top_k`` to each file (source document) instead
+        resume: Reuse stored ratings (False re-rates every pair)
+        stream: Curate each file in rating windows, writing ``_cleaned.jsonl``
+            outputs (see ``curate_qa_pairs_streaming``)
     
     Returns:
         Dictionary with processing results
     """
-    from synthetic_data_kit.core.curate import curate_qa_pairs
+    from synthetic_data_kit.core.curate import curate_qa_pairs, apply_top_k
+    
+    if stream and top_k and not top_k_per_source:
+        raise ValueError("--top-k across a directory cannot be combined with --stream; "
+                         "use --per-source or --no-stream")
     
     # For curate command, we process .json files (output from create)
     supported_files = get_supported_files(directory, CURATE_EXTENSIONS)  # ['.json']
@@ -397,6 +644,10 @@ def process_directory_curate(
     
     console.print(f"Found {len(supported_files)} JSON files to curate", style="blue")
     
+    # With a fixed dataset size the threshold is only a floor, none by default
+    if top_k and threshold is None:
+        threshold = 0
+    
     # Initialize results tracking
     results = {
         "total_files": len(supported_files),
@@ -442,7 +693,11 @@ def process_directory_curate(
                     model,
                     config_path,
                     verbose,
-                    provider=provider
+                    provider=provider,
+                    rethreshold=rethreshold,
+                    top_k=top_k if top_k_per_source else None,
+                    stream=stream,
+                    resume=resume
                 )
                 
                 # Record success
@@ -476,6 +731,11 @@ def process_directory_curate(
             
             progress.update(task, advance=1)
     
+    # Select the best pairs across all files
+    if top_k and not top_k_per_source and results["results"]:
+        kept = apply_top_k([result["output_file"] for result in results["results"]], top_k)
+        console.print(f"Kept top {kept} pairs across {len(results['results'])} files", style="blue")
+    
     # Show summary
     console.print("\n" + "="*50, style="bold")
     console.print(f"Curation Summary (threshold: {threshold}):", style="bold blue")
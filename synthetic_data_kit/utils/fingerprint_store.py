@@ -0,0 +1,349 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Persistent cross-run store of question fingerprints
+import os
+import json
+import uuid
+import hashlib
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from synthetic_data_kit.utils.dedup import normalize_text, minhash_signatures, MinHashLSH
+
+_STORE_VERSION = 1
+_MAX_LOAD = 0.5
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser, spreads keys over table slots"""
+    x = keys.astype(np.uint64, copy=True)
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+def _open_array(path: Path, dtype, shape: Tuple[int, ...]) -> np.memmap:
+    """Memory-map ``path``, creating or growing it to ``shape`` (new space is zero)"""
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    with open(path, "ab") as f:
+        if f.tell() < size:
+            f.truncate(size)
+    return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+
+class _DiskHashTable:
+    """Open-addressing (linear probing) multimap from uint64 keys to int64
+    values, stored in two memory-mapped files
+
+    Key 0 marks an empty slot, so stored keys always have their low bit set.
+    The table doubles (rehashing into new files) once it is half full, which
+    keeps the expected probe length constant. The capacity is taken from the
+    file size, so it never depends on metadata written later.
+    """
+
+    def __init__(self, directory: Path, name: str, capacity: int, count: int):
+        self.directory = directory
+        self.name = name
+        keys_old = directory / f"{name}.keys.old"
+        if keys_old.exists():
+            # Interrupted while rehashing: the old files are still complete
+            for suffix in ("keys", "values"):
+                old = directory / f"{name}.{suffix}.old"
+                if old.exists():
+                    os.replace(old, directory / f"{name}.{suffix}")
+        elif (directory / f"{name}.values.old").exists():
+            # Interrupted while cleaning up after a finished rehash
+            os.remove(directory / f"{name}.values.old")
+        keys_path = directory / f"{name}.keys"
+        if keys_path.exists() and keys_path.stat().st_size:
+            capacity = keys_path.stat().st_size // np.dtype(np.uint64).itemsize
+        self.capacity = capacity
+        self.count = count
+        self.keys = _open_array(directory / f"{name}.keys", np.uint64, (capacity,))
+        self.values = _open_array(directory / f"{name}.values", np.int64, (capacity,))
+
+    def _place(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Insert keys into free slots, all probes advancing in lockstep"""
+        mask = np.uint64(self.capacity - 1)
+        slots = (_mix(keys) & mask).astype(np.int64)
+        pending = np.arange(len(keys))
+        while len(pending):
+            free = self.keys[slots[pending]] == 0
+            # One winner per free slot; everyone else probes on
+            free_slots, first = np.unique(slots[pending][free], return_index=True)
+            winners = pending[free][first]
+            self.keys[free_slots] = keys[winners]
+            self.values[free_slots] = values[winners]
+            pending = np.setdiff1d(pending, winners, assume_unique=True)
+            slots[pending] = (slots[pending] + 1) & (self.capacity - 1)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while needed > capacity * _MAX_LOAD:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        occupied = self.keys != 0
+        old_keys, old_values = np.array(self.keys[occupied]), np.array(self.values[occupied])
+        self.flush()
+        del self.keys, self.values
+        for suffix in ("keys", "values"):
+            os.replace(self.directory / f"{self.name}.{suffix}", self.directory / f"{self.name}.{suffix}.old")
+        self.capacity = capacity
+        self.keys = _open_array(self.directory / f"{self.name}.keys", np.uint64, (capacity,))
+        self.values = _open_array(self.directory / f"{self.name}.values", np.int64, (capacity,))
+        self._place(old_keys, old_values)
+        self.flush()
+        # keys.old goes last: while it exists the rehash counts as unfinished
+        for suffix in ("values", "keys"):
+            os.remove(self.directory / f"{self.name}.{suffix}.old")
+
+    def reserve(self, n: int) -> None:
+        """Make room for ``n`` more entries and count them as stored"""
+        self._grow(self.count + n)
+        self.count += n
+
+    def insert_many(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Store keys reserved with :meth:`reserve`"""
+        keys = np.asarray(keys, dtype=np.uint64) | np.uint64(1)
+        self._place(keys, np.asarray(values, dtype=np.int64))
+
+    def find(self, key: int) -> List[int]:
+        """All values stored under ``key``"""
+        key = np.uint64(key) | np.uint64(1)
+        slot = int(_mix(np.array([key]))[0] & np.uint64(self.capacity - 1))
+        found = []
+        while True:
+            stored = self.keys[slot]
+            if stored == 0:
+                return found
+            if stored == key:
+                found.append(int(self.values[slot]))
+            slot = (slot + 1) & (self.capacity - 1)
+
+    def flush(self) -> None:
+        self.keys.flush()
+        self.values.flush()
+
+
+def question_key(text: str) -> int:
+    """64-bit exact fingerprint of a normalised question"""
+    digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class FingerprintStore:
+    """Questions seen in earlier runs, kept on disk across runs
+
+    Each question is stored as an exact 64-bit hash and a MinHash signature.
+    Both are indexed in memory-mapped hash tables (the signature by its LSH
+    band keys), so checking a question costs a constant number of probes
+    however large the store grows. Entries remember which run added them, so
+    a run can skip its own entries (e.g. curate after the create that added
+    them).
+
+    Metadata is written before new entries are, reserving their ids, so a
+    crash part-way through :meth:`add` can leave unused ids behind but never
+    hands the same id to two questions.
+
+    The store is meant for one writer at a time.
+    """
+
+    def __init__(self,
+                 path: str,
+                 threshold: float = 0.8,
+                 num_perm: int = 128,
+                 initial_capacity: int = 1 << 16):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != _STORE_VERSION:
+                raise ValueError(f"Unsupported fingerprint store version in {self.path}")
+        else:
+            meta = {
+                "version": _STORE_VERSION,
+                "threshold": threshold,
+                "num_perm": num_perm,
+                "count": 0,
+                "entry_capacity": initial_capacity,
+                "exact": {"capacity": initial_capacity * 2, "count": 0},
+                "bands": {"capacity": initial_capacity * 2, "count": 0},
+                "runs": [],
+            }
+
+        # Signatures must stay comparable with the ones already stored
+        self.threshold = meta["threshold"]
+        self.num_perm = meta["num_perm"]
+        self.lsh = MinHashLSH(threshold=self.threshold, num_perm=self.num_perm)
+        self.count = meta["count"]
+        # Run id -> index stored per entry; meta.json keeps them in index order
+        self.runs = {run_id: index for index, run_id in enumerate(meta["runs"])}
+        self.entry_capacity = meta["entry_capacity"]
+        self.signatures = _open_array(self.path / "signatures.u32", np.uint32, (self.entry_capacity, self.num_perm))
+        self.entry_runs = _open_array(self.path / "runs.u32", np.uint32, (self.entry_capacity,))
+        self.exact = _DiskHashTable(self.path, "exact", meta["exact"]["capacity"], meta["exact"]["count"])
+        self.bands = _DiskHashTable(self.path, "bands", meta["bands"]["capacity"], meta["bands"]["count"])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _band_table_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Band keys made distinct per band, shape (n, bands)"""
+        offsets = np.arange(self.lsh.bands, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        return self.lsh.band_keys(signatures) + offsets
+
+    def _run_index(self, run_id: Optional[str]) -> Optional[int]:
+        return self.runs.get(run_id)
+
+    def contains(self, questions: List[str], exclude_run: Optional[str] = None) -> List[bool]:
+        """Check which questions (exactly or nearly) match a stored one
+
+        Args:
+            questions: Questions to check
+            exclude_run: Ignore entries added by this run
+
+        Returns:
+            One flag per question
+        """
+        excluded = self._run_index(exclude_run)
+        signatures = minhash_signatures(questions, num_perm=self.num_perm)
+        band_keys = self._band_table_keys(signatures).tolist()
+        min_agree = self.threshold * self.num_perm
+
+        def counts(entry: int) -> bool:
+            return excluded is None or self.entry_runs[entry] != excluded
+
+        known = []
+        for question, signature, keys in zip(questions, signatures, band_keys):
+            # Exact match first; only fall back to MinHash candidates if none
+            if any(counts(e) for e in self.exact.find(question_key(question))):
+                known.append(True)
+                continue
+            candidates = set()
+            for key in keys:
+                candidates.update(self.bands.find(key))
+            known.append(any(
+                counts(e) and np.count_nonzero(self.signatures[e] == signature) >= min_agree
+                for e in candidates
+            ))
+        return known
+
+    def add(self, questions: List[str], run_id: str) -> None:
+        """Record questions as seen by ``run_id``
+
+        Questions already stored verbatim are skipped, so re-recording the
+        same pairs (e.g. in curate after create) does not grow the store.
+        """
+        questions = [q for q in questions if not self.exact.find(question_key(q))]
+        if not questions:
+            return
+        run_index = self.runs.setdefault(run_id, len(self.runs))
+
+        needed = self.count + len(questions)
+        if needed > self.entry_capacity:
+            while needed > self.entry_capacity:
+                self.entry_capacity *= 2
+            del self.signatures, self.entry_runs
+            self.signatures = _open_array(self.path / "signatures.u32", np.uint32, (self.entry_capacity, self.num_perm))
+            self.entry_runs = _open_array(self.path / "runs.u32", np.uint32, (self.entry_capacity,))
+
+        # Reserve the ids on disk before anything refers to them
+        ids = np.arange(self.count, needed, dtype=np.int64)
+        self.exact.reserve(len(questions))
+        self.bands.reserve(len(questions) * self.lsh.bands)
+        self.count = needed
+        self._write_meta()
+
+        signatures = minhash_signatures(questions, num_perm=self.num_perm)
+        self.signatures[ids[0]:needed] = signatures
+        self.entry_runs[ids[0]:needed] = run_index
+
+        self.exact.insert_many(np.array([question_key(q) for q in questions], dtype=np.uint64), ids)
+        band_keys = self._band_table_keys(signatures)
+        self.bands.insert_many(band_keys.ravel(), np.repeat(ids, self.lsh.bands))
+
+    def _write_meta(self) -> None:
+        """Atomically replace meta.json with the current metadata"""
+        meta = {
+            "version": _STORE_VERSION,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "count": self.count,
+            "entry_capacity": self.entry_capacity,
+            "exact": {"capacity": self.exact.capacity, "count": self.exact.count},
+            "bands": {"capacity": self.bands.capacity, "count": self.bands.count},
+            "runs": list(self.runs),
+        }
+        tmp_path = self.path / "meta.json.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.path / "meta.json")
+
+    def flush(self) -> None:
+        """Write tables and metadata to disk"""
+        self.signatures.flush()
+        self.entry_runs.flush()
+        self.exact.flush()
+        self.bands.flush()
+        self._write_meta()
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+def _open_store(generation_config: Dict[str, Any]) -> Optional[FingerprintStore]:
+    store_path = generation_config.get("fingerprint_store")
+    if not store_path:
+        return None
+    return FingerprintStore(store_path, threshold=generation_config.get("similarity_threshold", 0.8))
+
+
+def filter_known_items(items: List[Dict[str, Any]],
+                       generation_config: Dict[str, Any],
+                       run_id: str,
+                       update: bool = True,
+                       verbose: bool = False,
+                       label: str = "QA pairs") -> List[Dict[str, Any]]:
+    """Drop items whose question is in the fingerprint store from another run,
+    then record the remaining ones under ``run_id``
+
+    Returns the items unchanged when no ``fingerprint_store`` is configured.
+    """
+    store = _open_store(generation_config) if items else None
+    if store is None:
+        return items
+
+    known = store.contains([item.get("question", "") for item in items], exclude_run=run_id)
+    kept = [item for item, is_known in zip(items, known) if not is_known]
+    if update:
+        store.add([item.get("question", "") for item in kept], run_id)
+        store.flush()
+
+    removed = len(items) - len(kept)
+    if verbose or removed:
+        print(f"Fingerprint store: dropped {removed} {label} already known from earlier runs "
+              f"({len(store)} questions stored)")
+    return kept
+
+
+def record_items(items: List[Dict[str, Any]],
+                 generation_config: Dict[str, Any],
+                 run_id: str) -> None:
+    """Record the items' questions in the fingerprint store (if configured)"""
+    store = _open_store(generation_config) if items else None
+    if store is None:
+        return
+    store.add([item.get("question", "") for item in items], run_id)
+    store.flush()
@@ -0,0 +1,104 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Lexical grounding: how much of an answer is supported by the source text
+import os
+import re
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from synthetic_data_kit.utils.text import split_into_chunks, PromptCompactor
+from synthetic_data_kit.utils.boilerplate import filter_documents
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Function words carry no evidence that an answer came from the text
+_STOPWORDS = frozenset("""
+a an the and or but if then else of to in on at by for with from into onto over under about as
+is are was were be been being am do does did done has have had having it its this that these those
+there here which who whom whose what when where why how not no nor so than too very can could
+may might must shall should will would i you he she we they me him her us them my your his our their
+""".split())
+
+
+def content_terms(text: str) -> List[str]:
+    """Content-word unigrams and bigrams of a text"""
+    words = [w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class GroundingIndex:
+    """Inverted index from content n-grams to the chunks containing them
+
+    An answer's grounding score is the largest fraction of its distinct
+    content n-grams (unigrams and bigrams, stopwords removed) found together
+    in a single chunk. Scores are in [0, 1]; answers without content words
+    score 1.0 since there is nothing to contradict.
+    """
+
+    def __init__(self, chunks: List[str]):
+        self.num_chunks = len(chunks)
+        postings: Dict[str, List[int]] = {}
+        for chunk_id, chunk in enumerate(chunks):
+            for term in set(content_terms(chunk)):
+                postings.setdefault(term, []).append(chunk_id)
+
+        # Flatten postings into one array (CSR layout) so a lookup is a slice
+        self.term_ids = {term: i for i, term in enumerate(postings)}
+        lengths = np.fromiter((len(p) for p in postings.values()), dtype=np.int64, count=len(postings))
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.chunk_ids = np.fromiter(
+            (c for p in postings.values() for c in p), dtype=np.int64, count=int(lengths.sum())
+        )
+
+    def score(self, text: str, chunk_id: Optional[int] = None) -> float:
+        """Score one answer against its best chunk (or against ``chunk_id``)"""
+        terms = set(content_terms(text))
+        if not terms:
+            return 1.0
+        if self.num_chunks == 0:
+            return 0.0
+        ids = [self.term_ids[t] for t in terms if t in self.term_ids]
+        if not ids:
+            return 0.0
+        hits = np.concatenate([self.chunk_ids[self.offsets[i]:self.offsets[i + 1]] for i in ids])
+        counts = np.bincount(hits, minlength=self.num_chunks)
+        supported = counts[chunk_id] if chunk_id is not None else counts.max()
+        return float(supported) / len(terms)
+
+    def score_pairs(self, qa_pairs: List[Dict[str, Any]]) -> np.ndarray:
+        """Grounding score of each pair's answer"""
+        return np.array([
+            self.score(str(pair.get("answer") or ""), pair.get("chunk_id"))
+            for pair in qa_pairs
+        ])
+
+
+def load_source_chunks(source_path: str, generation_config: Dict[str, Any]) -> Optional[List[str]]:
+    """Rebuild the chunks a document was split into during generation
+
+    Applies the same boilerplate filter, prompt compaction and chunking as
+    ``create``, so the chunks match what the generator saw as long as the
+    config is unchanged. Returns None if the source can't be found.
+    """
+    if not source_path or not os.path.exists(source_path):
+        return None
+
+    if source_path.endswith(".lance"):
+        from synthetic_data_kit.utils.lance_utils import load_lance_dataset
+        documents = load_lance_dataset(source_path).to_table(columns=["text"]).to_pylist()
+    else:
+        with open(source_path, "r", encoding="utf-8") as f:
+            documents = [{"text": f.read()}]
+
+    documents = filter_documents(documents, generation_config)
+    compactor = PromptCompactor(generation_config.get("compact_prompts", True))
+    text = compactor.text(" ".join(doc["text"] or "" for doc in documents))
+    return split_into_chunks(
+        text,
+        chunk_size=generation_config.get("chunk_size", 4000),
+        overlap=generation_config.get("overlap", 200)
+    )
@@ -0,0 +1,150 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Store each distinct image once per corpus and each page's text once
+import io
+import os
+import hashlib
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set
+
+INDEX_DIR = ".image_index"
+
+
+def image_id(data: bytes) -> str:
+    """Content hash identifying an image"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def image_size(data: bytes) -> Optional[tuple]:
+    """(width, height) read from the image header, or None if it can't be decoded"""
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+class ImageRegistry:
+    """Corpus-wide record of which dataset stores each image
+
+    One marker file per image under ``<directory>/.image_index`` names the
+    dataset that stores its bytes; other datasets of the directory only
+    reference the image by id, and ``resolve`` loads the bytes back from the
+    owner. Claims are only written by ``commit``, once the dataset they
+    belong to has been written, and a marker whose dataset no longer exists
+    is taken over. Concurrent ingest workers may both store a new image;
+    O_EXCL on commit keeps a single owner.
+    """
+
+    def __init__(self, directory: str, owner: str):
+        self.root = os.path.join(directory, INDEX_DIR)
+        self.owner = os.path.abspath(owner)
+        self._owned: Dict[str, bool] = {}
+
+    def _marker(self, image: str) -> str:
+        return os.path.join(self.root, image[:2], image)
+
+    def owner_of(self, image: str) -> Optional[str]:
+        """Dataset storing ``image``, or None if no existing dataset claims it"""
+        try:
+            with open(self._marker(image), "r", encoding="utf-8") as f:
+                owner = f.read()
+        except FileNotFoundError:
+            return None
+        return owner if os.path.exists(owner) else None
+
+    def claim(self, image: str) -> bool:
+        """True if this dataset should store ``image`` (it is unclaimed, or already ours)"""
+        if image not in self._owned:
+            owner = self.owner_of(image)
+            self._owned[image] = owner is None or owner == self.owner
+        return self._owned[image]
+
+    def commit(self) -> None:
+        """Record this dataset as the owner of the images it stored; call after writing it"""
+        for image, owned in self._owned.items():
+            if not owned:
+                continue
+            marker = self._marker(image)
+            os.makedirs(os.path.dirname(marker), exist_ok=True)
+            try:
+                fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self.owner_of(image) is not None:
+                    # Ours already, or stored by a concurrent worker too
+                    continue
+                # The previous owner is gone
+                fd = os.open(marker, os.O_CREAT | os.O_TRUNC | os.O_WRONLY)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.owner)
+
+    def resolve(self, images: Iterable[str]) -> Dict[str, bytes]:
+        """Bytes of referenced images, loaded from their owning datasets
+
+        Images whose owner is missing or no longer stores them are left out.
+        """
+        from synthetic_data_kit.utils.lance_utils import load_lance_dataset
+
+        by_owner: Dict[str, List[str]] = {}
+        for image in set(images):
+            owner = self.owner_of(image)
+            if owner is not None and owner != self.owner:
+                by_owner.setdefault(owner, []).append(image)
+
+        resolved = {}
+        for owner, owned in by_owner.items():
+            dataset = load_lance_dataset(owner)
+            if dataset is None or "image_id" not in dataset.schema.names:
+                continue
+            ids = ", ".join("'" + image + "'" for image in owned)
+            table = dataset.to_table(columns=["image_id", "image"],
+                                     filter=f"image_id IN ({ids}) AND image IS NOT NULL")
+            for image, data in zip(table.column("image_id").to_pylist(), table.column("image").to_pylist()):
+                resolved.setdefault(image, data)
+        return resolved
+
+
+def dedupe_rows(rows: Iterable[Dict[str, Any]], registry: Optional[ImageRegistry] = None,
+                min_image_size: int = 0) -> Iterator[Dict[str, Any]]:
+    """Normalise parsed multimodal rows
+
+    - A page's text is kept on its first row; later rows of the same page
+      (one per image) carry an empty string instead of repeating it.
+    - Images smaller than ``min_image_size`` pixels on either side are dropped.
+    - Every image row gets an ``image_id``. Its bytes are kept on the first
+      row that has them in this dataset, unless ``registry`` says another
+      dataset of the corpus already stores them; other occurrences are
+      references with ``image`` set to None.
+    """
+    stored: Set[str] = set()
+    previous = None
+    for row in rows:
+        row = dict(row)
+        data = row.get("image")
+        if data is not None and min_image_size and "image_id" not in row:
+            # Parsers that know image sizes filter before extracting and set image_id
+            size = image_size(data)
+            if size is not None and min(size) < min_image_size:
+                data = row["image"] = None
+        if data is not None:
+            row["image_id"] = row.get("image_id") or image_id(data)
+            if row["image_id"] in stored or (registry is not None and not registry.claim(row["image_id"])):
+                row["image"] = None
+            else:
+                stored.add(row["image_id"])
+        else:
+            row.setdefault("image_id", None)
+
+        position = (row.get("page"), row["text"])
+        if previous == position:
+            if row["image_id"] is None:
+                # Nothing left on this row once its text is deduplicated
+                continue
+            row["text"] = ""
+        else:
+            previous = position
+        yield row
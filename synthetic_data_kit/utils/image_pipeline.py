@@ -0,0 +1,152 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Shrink images before they are sent to vision models
+import io
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from PIL import Image, UnidentifiedImageError
+
+_MIME = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+
+class ImagePipeline:
+    """Resize, re-encode and base64 images for vision requests
+
+    Images are scaled so their longest side is at most ``max_size`` (more
+    resolution than the model uses only costs upload and prefill time) and
+    re-encoded as JPEG or WebP at ``quality``. Compressed images already
+    within ``max_size`` and at most ``passthrough_bytes`` long are sent
+    as-is. Results are cached by content hash, so an image repeated across
+    requests is encoded once, and ``encode_many`` encodes a batch on a thread
+    pool (PIL releases the GIL while resizing and encoding). An image PIL
+    can't process is sent as its original bytes when they are in a format
+    the model accepts, and otherwise skipped (None) with a warning.
+    """
+
+    def __init__(self, max_size: int = 1024, image_format: str = "jpeg", quality: int = 85,
+                 passthrough_bytes: int = 256 * 1024, workers: int = 8, cache_size: int = 1024):
+        self.max_size = max_size
+        self.format = image_format.upper()
+        if self.format not in ("JPEG", "WEBP"):
+            raise ValueError(f"Unsupported image format: {image_format}. Choose jpeg or webp")
+        self.quality = quality
+        self.passthrough_bytes = passthrough_bytes
+        self.workers = max(1, workers)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"encoded": 0, "passed_through": 0, "cache_hits": 0, "failed": 0, "bytes_in": 0, "bytes_out": 0}
+
+    @classmethod
+    def from_config(cls, generation_config: Dict[str, Any]) -> "ImagePipeline":
+        return cls(
+            max_size=generation_config.get("image_max_size", 1024),
+            image_format=generation_config.get("image_format", "jpeg"),
+            quality=generation_config.get("image_quality", 85),
+            passthrough_bytes=generation_config.get("image_passthrough_bytes", 256 * 1024),
+            workers=generation_config.get("image_workers", 8),
+        )
+
+    @staticmethod
+    def _key(image: Any) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(image, (bytes, bytearray)):
+            digest.update(image)
+        else:
+            digest.update(f"{image.mode}{image.size}".encode("utf-8"))
+            digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def encode(self, image: Any, key: Optional[str] = None) -> Optional[str]:
+        """Data URL for an image given as encoded bytes or a PIL image
+
+        None for None, and for an image that can't be decoded or re-encoded.
+        """
+        if image is None:
+            return None
+        key = key or self._key(image)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return self._cache[key]
+
+        try:
+            url = self._encode(image)
+        except (UnidentifiedImageError, OSError, ValueError) as e:
+            url = self._fallback(image, e)
+
+        with self._lock:
+            self._cache[key] = url
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return url
+
+    def encode_many(self, images: Iterable[Any]) -> List[Optional[str]]:
+        """Data URLs for a batch of images, in order, encoded in parallel"""
+        images = list(images)
+        keys = [None if image is None else self._key(image) for image in images]
+        # Encode each distinct image once even when it repeats within the batch
+        unique = {key: image for key, image in zip(keys, images) if key is not None}
+        if self.workers == 1 or len(unique) < 2:
+            urls = {key: self.encode(image, key) for key, image in unique.items()}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(unique))) as executor:
+                urls = dict(zip(unique, executor.map(self.encode, unique.values(), unique)))
+        return [urls.get(key) for key in keys]
+
+    def _encode(self, image: Any) -> str:
+        data = bytes(image) if isinstance(image, (bytes, bytearray)) else None
+        # Raw RGB size stands in for the input size of in-memory images
+        size_in = len(data) if data is not None else image.width * image.height * 3
+        if data is not None:
+            image = Image.open(io.BytesIO(data))
+            if (image.format in _MIME and len(data) <= self.passthrough_bytes
+                    and max(image.size) <= self.max_size):
+                return self._url(data, _MIME[image.format], len(data), passed_through=True)
+
+        image.load()
+        if max(image.size) > self.max_size:
+            image = image.copy()
+            image.thumbnail((self.max_size, self.max_size), Image.LANCZOS)
+        if image.mode not in ("RGB", "L"):
+            # Flatten transparency onto white; JPEG has no alpha channel
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, (255, 255, 255))
+            image.paste(rgba, mask=rgba.getchannel("A"))
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=self.format, quality=self.quality)
+        return self._url(buffer.getvalue(), _MIME[self.format], size_in, passed_through=False)
+
+    def _fallback(self, image: Any, error: Exception) -> Optional[str]:
+        """Original bytes of an image that failed to process, if their format is known"""
+        data = bytes(image) if isinstance(image, (bytes, bytearray)) else None
+        image_format = None
+        if data is not None:
+            try:
+                image_format = Image.open(io.BytesIO(data)).format
+            except (UnidentifiedImageError, OSError, ValueError):
+                pass
+        if image_format in _MIME:
+            print(f"Warning: sending an image unprocessed ({error})")
+            return self._url(data, _MIME[image_format], len(data), passed_through=True)
+        print(f"Warning: skipping an image that could not be processed ({error})")
+        with self._lock:
+            self.stats["failed"] += 1
+        return None
+
+    def _url(self, encoded: bytes, mime: str, size_in: int, passed_through: bool) -> str:
+        with self._lock:
+            self.stats["passed_through" if passed_through else "encoded"] += 1
+            self.stats["bytes_in"] += size_in
+            self.stats["bytes_out"] += len(encoded)
+        return f"data:{mime};base64,{base64.b64encode(encoded).decode('utf-8')}"
@@ -0,0 +1,122 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Append-only journal of completed work units, so interrupted runs can resume
+import os
+import json
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+
+class RunJournal:
+    """JSONL file recording each completed unit of a run and its result
+
+    The first line holds a fingerprint of the run's inputs and settings; a
+    journal is only resumed from when the fingerprint matches. Every record
+    is flushed and fsync'd before the next unit starts, so at most the unit in
+    flight is lost when the process dies.
+    """
+
+    def __init__(self, path: str, fingerprint: str, resume: bool = False):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.units: Dict[str, Any] = {}
+        self._torn = False
+        # Opened on the first record, so runs that record nothing leave no file
+        self._file = None
+
+        self._loaded = resume and os.path.exists(path) and self._load()
+        if resume and not self._loaded and os.path.exists(path):
+            print(f"Journal {path} is from a different run configuration, starting over")
+        if self.units:
+            print(f"Resuming from {path}: {len(self.units)} completed units")
+
+    @staticmethod
+    def make_fingerprint(*parts: Any) -> str:
+        """Stable hash of the inputs and settings that determine a run's work"""
+        encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    def _load(self) -> bool:
+        with open(self.path, "r", encoding="utf-8") as f:
+            content = f.read()
+        lines = content.splitlines()
+        self._torn = bool(content) and not content.endswith("\n")
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except json.JSONDecodeError:
+            return False
+        if header.get("fingerprint") != self.fingerprint:
+            return False
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The unit in flight when the process died
+                continue
+            self.units[record["unit"]] = record["result"]
+        return True
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a" if self._loaded else "w", encoding="utf-8")
+            if not self._loaded:
+                self._file.write(json.dumps({"fingerprint": self.fingerprint}) + "\n")
+            elif self._torn:
+                # Terminate the partial last line so the next record starts cleanly
+                self._file.write("\n")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def __contains__(self, unit: str) -> bool:
+        return unit in self.units
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def get(self, unit: str) -> Any:
+        return self.units[unit]
+
+    def record(self, unit: str, result: Any) -> None:
+        """Durably record a completed unit"""
+        self.units[unit] = result
+        self._write({"unit": unit, "result": result})
+
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def finish(self) -> None:
+        """Remove the journal once the run's output is safely written"""
+        self.close()
+        if self._file is not None or self._loaded:
+            os.remove(self.path)
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        if exc_type is KeyboardInterrupt and (self._file is not None or self._loaded):
+            print(f"\nInterrupted: {len(self.units)} completed units saved to {self.path}; "
+                  f"rerun with --resume to continue")
+        return False
+
+
+def journaled(journal: Optional[RunJournal], unit: str, compute: Callable[[], Any]) -> Any:
+    """Result of ``unit`` from the journal, or computed and recorded now"""
+    if journal is None:
+        return compute()
+    if unit in journal:
+        return journal.get(unit)
+    result = compute()
+    journal.record(unit, result)
+    return result
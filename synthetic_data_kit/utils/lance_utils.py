@@ -4,33 +4,110 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
+import itertools
 import lance
 import pyarrow as pa
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Union
 import os
 
-def create_lance_dataset(
-    data: List[Dict[str, Any]],
+# Rows are written in record batches of at most this many rows or image bytes
+BATCH_ROWS = 1024
+BATCH_BYTES = 16 * 1024 * 1024
+# Data files are closed and a new fragment started past this size
+FRAGMENT_BYTES = 512 * 1024 * 1024
+
+Rows = Iterable[Union[Dict[str, Any], pa.RecordBatch]]
+
+
+def _record_batches(data: Rows, schema: pa.Schema) -> Iterator[pa.RecordBatch]:
+    """Group rows into bounded record batches; batches pass through as they are"""
+    batch, size = [], 0
+    for item in data:
+        if isinstance(item, pa.RecordBatch):
+            if batch:
+                yield pa.RecordBatch.from_pylist(batch, schema=schema)
+                batch, size = [], 0
+            yield item if item.schema.equals(schema) else item.select(schema.names).cast(schema)
+            continue
+        batch.append(item)
+        size += len(item.get("image") or b"")
+        if len(batch) >= BATCH_ROWS or size >= BATCH_BYTES:
+            yield pa.RecordBatch.from_pylist(batch, schema=schema)
+            batch, size = [], 0
+    if batch:
+        yield pa.RecordBatch.from_pylist(batch, schema=schema)
+
+
+def write_lance_stream(
+    data: Rows,
     output_path: str,
     schema: Optional[pa.Schema] = None
-) -> None:
-    """Create a Lance dataset from a list of dictionaries.
+) -> int:
+    """Write rows or record batches to a Lance dataset as they arrive
+
+    Rows are grouped into record batches of bounded size and streamed to the
+    writer, which closes a data file (fragment) every FRAGMENT_BYTES, so
+    memory holds one batch rather than the whole dataset. Nothing is written
+    if ``data`` is empty.
 
     Args:
-        data (List[Dict[str, Any]]): A list of dictionaries, where each dictionary represents a row.
+        data (Rows): Rows (dicts) or pa.RecordBatch objects, e.g. a parser's generator.
         output_path (str): The path to save the Lance dataset.
-        schema (Optional[pa.Schema], optional): The PyArrow schema. If not provided, it will be inferred. Defaults to None.
+        schema (Optional[pa.Schema], optional): The PyArrow schema. If not provided, it is
+            inferred from the first batch. Defaults to None.
+
+    Returns:
+        int: The number of rows written.
     """
-    if not data:
-        return
+    items = iter(data)
+    first = next(items, None)
+    if first is None:
+        return 0
+    items = itertools.chain([first], items)
+    if schema is None:
+        if isinstance(first, pa.RecordBatch):
+            schema = first.schema
+        else:
+            # Infer from the first batch of rows
+            head = list(itertools.islice(items, BATCH_ROWS))
+            schema = pa.RecordBatch.from_pylist(head).schema
+            items = itertools.chain(head, items)
 
     # Ensure the output directory exists
     output_dir = os.path.dirname(output_path)
-    if not os.path.exists(output_dir):
+    if output_dir and not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    table = pa.Table.from_pylist(data, schema=schema)
-    lance.write_dataset(table, output_path, mode="overwrite")
+    written = 0
+
+    def counted(batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+        nonlocal written
+        for batch in batches:
+            written += batch.num_rows
+            yield batch
+
+    reader = pa.RecordBatchReader.from_batches(schema, counted(_record_batches(items, schema)))
+    lance.write_dataset(reader, output_path, schema=schema, mode="overwrite",
+                        max_bytes_per_file=FRAGMENT_BYTES)
+    return written
+
+
+def create_lance_dataset(
+    data: Rows,
+    output_path: str,
+    schema: Optional[pa.Schema] = None
+) -> None:
+    """Create a Lance dataset from a list of dictionaries.
+
+    Also accepts any iterable of rows or record batches, which is written
+    incrementally (see ``write_lance_stream``).
+
+    Args:
+        data (Rows): A list of dictionaries, where each dictionary represents a row.
+        output_path (str): The path to save the Lance dataset.
+        schema (Optional[pa.Schema], optional): The PyArrow schema. If not provided, it will be inferred. Defaults to None.
+    """
+    write_lance_stream(data, output_path, schema=schema)
 
 def load_lance_dataset(
     dataset_path: str
@@ -46,3 +123,30 @@ def load_lance_dataset(
     if not os.path.exists(dataset_path):
         return None
     return lance.dataset(dataset_path)
+
+
+def iter_lance_rows(
+    dataset,
+    columns: Union[List[str], Dict[str, str]],
+    batch_size: int = BATCH_ROWS
+) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a Lance dataset, reading only the given columns.
+
+    Rows are read one record batch at a time, so columns that are not
+    projected (e.g. image bytes) are never loaded.
+
+    Args:
+        dataset: The Lance dataset.
+        columns (Union[List[str], Dict[str, str]]): Column names, or a mapping of output
+            names to SQL expressions such as ``{"has_image": "image IS NOT NULL"}``.
+        batch_size (int, optional): Rows per record batch. Defaults to BATCH_ROWS.
+    """
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def take_column(dataset, column: str, positions: List[int]) -> List[Any]:
+    """Values of one column at the given row positions, in the order given."""
+    if not positions:
+        return []
+    return dataset.take(positions, columns=[column]).column(column).to_pylist()
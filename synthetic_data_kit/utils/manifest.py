@@ -0,0 +1,125 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Manifest of processed inputs, so re-runs skip files whose output is up to date
+import os
+import json
+import hashlib
+from typing import Dict, Any, Optional, Tuple
+
+from synthetic_data_kit.utils.journal import RunJournal
+
+MANIFEST_NAME = ".manifest.jsonl"
+
+# Stable hash of the settings an output depends on
+settings_fingerprint = RunJournal.make_fingerprint
+
+
+def file_signature(path: str) -> Tuple[int, int]:
+    """(size, mtime_ns) of a file, or totals over a directory such as a .lance dataset"""
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    size, mtime = 0, os.stat(path).st_mtime_ns
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            size += stat.st_size
+            mtime = max(mtime, stat.st_mtime_ns)
+    return size, mtime
+
+
+def content_hash(path: str) -> str:
+    """blake2b of a file's bytes, or of every file under a directory in path order"""
+    digest = hashlib.blake2b(digest_size=16)
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+        )
+    else:
+        files = [path]
+    for file_path in files:
+        digest.update(os.path.relpath(file_path, path).encode("utf-8"))
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Append-only JSONL file mapping each input to the output made from it
+
+    Each line holds the ``stage`` (ingest, create:<type>), the input's absolute
+    path, size, mtime and content hash, a fingerprint of the ``settings`` that
+    produced the output (parser version, model, config), and the output path.
+    The last line for an input wins.
+
+    An input is up to date when its settings match and its output exists, and
+    either its size and mtime are unchanged (a stat, no read) or its content
+    hash is unchanged (a touched but identical file).
+    """
+
+    def __init__(self, directory: str, name: str = MANIFEST_NAME):
+        self.path = os.path.join(directory, name)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._torn = False
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._torn = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from an interrupted run
+                        continue
+                    self.entries[self._key(entry["stage"], entry["input"])] = entry
+
+    @staticmethod
+    def _key(stage: str, input_path: str) -> str:
+        return f"{stage}:{os.path.abspath(input_path)}"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def up_to_date(self, stage: str, input_path: str, settings: str) -> Optional[str]:
+        """Output path recorded for ``input_path`` if it is still current, else None"""
+        entry = self.entries.get(self._key(stage, input_path))
+        if entry is None or entry["settings"] != settings or not os.path.exists(entry["output"]):
+            return None
+        size, mtime = file_signature(input_path)
+        if (size, mtime) == (entry["size"], entry["mtime_ns"]):
+            return entry["output"]
+        if size != entry["size"] or content_hash(input_path) != entry["hash"]:
+            return None
+        # Same bytes under a new mtime; remember it so the next check is a stat again
+        self._append(dict(entry, mtime_ns=mtime))
+        return entry["output"]
+
+    def record(self, stage: str, input_path: str, settings: str, output_path: str) -> None:
+        """Record that ``output_path`` was made from the current ``input_path``"""
+        if not output_path or not os.path.exists(output_path):
+            return
+        size, mtime = file_signature(input_path)
+        self._append({
+            "stage": stage,
+            "input": os.path.abspath(input_path),
+            "size": size,
+            "mtime_ns": mtime,
+            "hash": content_hash(input_path),
+            "settings": settings,
+            "output": os.path.abspath(output_path),
+        })
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self.entries[self._key(entry["stage"], entry["input"])] = entry
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if self._torn:
+                # Terminate the partial last line of an interrupted write
+                f.write("\n")
+                self._torn = False
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -0,0 +1,46 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Extract page ranges of a document across processes, in page order
+import itertools
+from collections import deque
+from typing import Any, Callable, Iterator, List
+
+# Pages per unit of work; bounds what one range holds in memory
+MAX_PAGES_PER_RANGE = 16
+
+
+def iter_page_ranges(extract: Callable[..., List[Any]], file_path: str, page_count: int, workers: int,
+                     parallel_min_pages: int, *args: Any) -> Iterator[List[Any]]:
+    """Yield ``extract(file_path, start, stop, *args)`` for consecutive page ranges
+
+    Documents of at least ``parallel_min_pages`` pages are split into a few
+    ranges per worker and extracted by a process pool (``extract`` must be a
+    module-level function; each call opens the document itself). At most two
+    ranges per worker are in flight, and results are yielded in page order as
+    they complete, so memory is bounded by the ranges in flight rather than
+    the document.
+    """
+    workers = min(workers, page_count)
+    if workers <= 1 or page_count < parallel_min_pages:
+        for start in range(0, page_count, MAX_PAGES_PER_RANGE):
+            yield extract(file_path, start, min(start + MAX_PAGES_PER_RANGE, page_count), *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # A few ranges per worker so uneven pages balance out
+    step = max(1, min(MAX_PAGES_PER_RANGE, -(-page_count // (workers * 4))))
+    ranges = ((start, min(start + step, page_count)) for start in range(0, page_count, step))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque(
+            executor.submit(extract, file_path, start, stop, *args)
+            for start, stop in itertools.islice(ranges, workers * 2)
+        )
+        while in_flight:
+            result = in_flight.popleft().result()
+            for start, stop in itertools.islice(ranges, 1):
+                in_flight.append(executor.submit(extract, file_path, start, stop, *args))
+            yield result
@@ -0,0 +1,83 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Cheap rule-based rejection of QA pairs before they are sent to the LLM judge
+import re
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+# Rules in the order they are applied; a pair is counted under the first rule it fails
+PREFILTER_RULES = ("empty_answer", "no_question_mark", "restates_question", "too_long")
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_QUESTION_MARKS = ("?", "？", "¿", "؟")
+
+
+def _word_set(text: str) -> set:
+    return set(_WORD.findall(text.lower()))
+
+
+def prefilter_pairs(qa_pairs: List[Dict[str, Any]],
+                    curate_config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Reject pairs that would fail rating anyway, without calling the LLM
+
+    Rules (each configurable in the ``curate`` config):
+
+    - ``empty_answer``: answer shorter than ``min_answer_chars`` after stripping
+    - ``no_question_mark``: question has no question mark (``require_question_mark``)
+    - ``restates_question``: at least ``max_restatement_overlap`` of the answer's
+      words already appear in the question
+    - ``too_long``: question + answer longer than ``max_pair_chars``
+
+    Args:
+        qa_pairs: Pairs to check
+        curate_config: The ``curate`` section of the config
+
+    Returns:
+        Tuple of (pairs that passed, rejection count per rule)
+    """
+    counts = {rule: 0 for rule in PREFILTER_RULES}
+    if not qa_pairs:
+        return [], counts
+
+    questions = np.array([str(pair.get("question") or "") for pair in qa_pairs], dtype=str)
+    answers = np.char.strip(np.array([str(pair.get("answer") or "") for pair in qa_pairs], dtype=str))
+    question_lengths = np.char.str_len(questions)
+    answer_lengths = np.char.str_len(answers)
+
+    failures = {}
+    failures["empty_answer"] = answer_lengths < curate_config.get("min_answer_chars", 1)
+
+    if curate_config.get("require_question_mark", True):
+        has_mark = np.zeros(len(qa_pairs), dtype=bool)
+        for mark in _QUESTION_MARKS:
+            has_mark |= np.char.find(questions, mark) >= 0
+        failures["no_question_mark"] = ~has_mark
+    else:
+        failures["no_question_mark"] = np.zeros(len(qa_pairs), dtype=bool)
+
+    max_overlap = curate_config.get("max_restatement_overlap", 0.9)
+    overlap = np.zeros(len(qa_pairs))
+    for i, (question, answer) in enumerate(zip(questions, answers)):
+        answer_words = _word_set(answer)
+        if answer_words:
+            overlap[i] = len(answer_words & _word_set(question)) / len(answer_words)
+    failures["restates_question"] = overlap >= max_overlap
+
+    max_chars = curate_config.get("max_pair_chars")
+    if max_chars:
+        failures["too_long"] = question_lengths + answer_lengths > max_chars
+    else:
+        failures["too_long"] = np.zeros(len(qa_pairs), dtype=bool)
+
+    rejected = np.zeros(len(qa_pairs), dtype=bool)
+    for rule in PREFILTER_RULES:
+        newly = failures[rule] & ~rejected
+        counts[rule] = int(newly.sum())
+        rejected |= newly
+
+    kept = [pair for pair, is_rejected in zip(qa_pairs, rejected) if not is_rejected]
+    return kept, counts
@@ -0,0 +1,173 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Read QA pairs one at a time from JSONL or from the qa_pairs array of a JSON file
+import os
+import json
+from typing import Dict, Any, Iterator, Tuple
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonScanner:
+    """Incremental reader of JSON values from a file, holding one value at a time"""
+
+    def __init__(self, f, read_size: int = 1 << 16):
+        self.f = f
+        self.read_size = read_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        data = self.f.read(self.read_size)
+        if not data:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer stays small
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next value, reading more of the file until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next read
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        """Values of the array starting at the current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+    def skip(self) -> None:
+        """Skip the next value; arrays are skipped one element at a time"""
+        if self.peek() == "[":
+            for _ in self.items():
+                pass
+        else:
+            self.value()
+
+    def members(self, array_key: str) -> Iterator[Tuple[str, Any]]:
+        """(key, value) pairs of the top-level object; ``array_key``'s value is
+        the scanner itself, positioned at the array, and must be consumed or
+        skipped before continuing"""
+        self.expect("{")
+        if self.peek() == "}":
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            if key == array_key and self.peek() == "[":
+                yield key, self
+            else:
+                yield key, self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def metadata_path(path: str) -> str:
+    """Sidecar holding the top-level fields (source, run id, ...) of a JSONL QA file"""
+    return os.path.splitext(path)[0] + ".meta.json"
+
+
+def read_metadata(path: str, key: str = "qa_pairs") -> Dict[str, Any]:
+    """Top-level fields of a QA file other than ``key``
+
+    For JSONL they come from the ``metadata_path`` sidecar (empty without one).
+    """
+    if path.endswith(".jsonl"):
+        sidecar = metadata_path(path)
+        if not os.path.exists(sidecar):
+            return {}
+        with open(sidecar, "r", encoding="utf-8") as f:
+            return json.load(f)
+    metadata = {}
+    with open(path, "r", encoding="utf-8") as f:
+        scanner = _JsonScanner(f)
+        if scanner.peek() != "{":
+            return {}
+        for name, value in scanner.members(key):
+            if value is scanner:
+                scanner.skip()
+            else:
+                metadata[name] = value
+    return metadata
+
+
+def iter_qa_pairs(path: str, key: str = "qa_pairs") -> Iterator[Dict[str, Any]]:
+    """Yield QA pairs one at a time
+
+    Reads one pair per line from ``.jsonl`` files; from ``.json`` files, reads
+    the ``key`` array (or a top-level array) element by element, so memory
+    does not grow with the file.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        scanner = _JsonScanner(f)
+        if scanner.peek() == "[":
+            yield from scanner.items()
+            return
+        for name, value in scanner.members(key):
+            if value is scanner:
+                yield from scanner.items()
+                return
+
+
+def append_jsonl(path: str, items) -> None:
+    """Append items to a JSONL file and flush them to disk"""
+    if not items:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items))
+        f.flush()
+        os.fsync(f.fileno())
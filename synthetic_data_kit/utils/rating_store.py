@@ -0,0 +1,140 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Side file of judge ratings so re-curating never re-rates a pair
+import os
+import json
+import hashlib
+from typing import List, Dict, Any, Optional, Tuple
+
+# Keys the judge adds to a pair; they are not part of the pair's identity
+_RATING_KEYS = ("rating", "scores")
+
+
+def pair_hash(pair: Dict[str, Any]) -> str:
+    """Content hash of a pair, ignoring any rating already attached"""
+    content = {key: value for key, value in pair.items() if key not in _RATING_KEYS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def default_store_path(input_path: str) -> str:
+    """Side file next to the curate input"""
+    return os.path.splitext(input_path)[0] + ".ratings.jsonl"
+
+
+def align_ratings(sent: List[Dict[str, Any]], rated: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach the judge's ratings to the pairs that were sent
+
+    The judge echoes pairs back and may rewrite them, so a response with one
+    rating per pair sent is matched by position; otherwise by question, and
+    ratings matching no sent pair are dropped. Extra numeric fields the judge
+    returned are kept as sub-scores.
+
+    Returns:
+        The sent pairs with ``rating`` (and ``scores``) attached
+    """
+    if len(rated) == len(sent):
+        matched = zip(sent, rated)
+    else:
+        by_question = {pair.get("question"): pair for pair in sent}
+        matched = ((by_question.get(item.get("question")), item) for item in rated)
+
+    aligned = []
+    for pair, item in matched:
+        if pair is None or "rating" not in item:
+            continue
+        scores = dict(item.get("scores") or {})
+        scores.update({
+            key: value for key, value in item.items()
+            if key not in pair and key not in _RATING_KEYS
+            and isinstance(value, (int, float)) and not isinstance(value, bool)
+        })
+        rated_pair = dict(pair, rating=item["rating"])
+        if scores:
+            rated_pair["scores"] = scores
+        aligned.append(rated_pair)
+    return aligned
+
+
+class RatingStore:
+    """Append-only JSONL file of ratings keyed by pair hash
+
+    Each line holds ``hash``, ``rating``, sub-scores under ``scores``, the
+    ``judge`` model and ``config``, a fingerprint of the judge settings
+    (model, rating prompt, ...). Only lines whose ``config`` matches
+    ``fingerprint`` are reused, so changing the judge re-rates every pair;
+    with ``fingerprint`` None (re-thresholding) every line is. When a hash
+    appears more than once the last line wins.
+    """
+
+    def __init__(self, path: str, fingerprint: Optional[str] = None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._torn = False
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._torn = not line.endswith("\n")
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from an interrupted run
+                        continue
+                    if fingerprint is None or entry.get("config") == fingerprint:
+                        self.entries[entry["hash"]] = entry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, qa_pairs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split pairs into (already rated, with stored ratings attached) and unrated"""
+        rated, unrated = [], []
+        for pair in qa_pairs:
+            entry = self.entries.get(pair_hash(pair))
+            if entry is None:
+                unrated.append(pair)
+                continue
+            rated_pair = dict(pair, rating=entry["rating"])
+            if entry.get("scores"):
+                rated_pair["scores"] = entry["scores"]
+            rated.append(rated_pair)
+        return rated, unrated
+
+    def record(self, rated_pairs: List[Dict[str, Any]], judge: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Store ratings of pairs as they were sent (see ``align_ratings``)
+
+        Returns:
+            ``rated_pairs``
+        """
+        lines = []
+        for pair in rated_pairs:
+            entry = {"hash": pair_hash(pair), "rating": pair["rating"]}
+            if pair.get("scores"):
+                entry["scores"] = pair["scores"]
+            if judge:
+                entry["judge"] = judge
+            if self.fingerprint:
+                entry["config"] = self.fingerprint
+            self.entries[entry["hash"]] = entry
+            lines.append(json.dumps(entry, ensure_ascii=False))
+
+        if lines:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if self._torn:
+                    # Terminate the partial last line of an interrupted write
+                    f.write("\n")
+                    self._torn = False
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        return rated_pairs
@@ -34,6 +34,10 @@ def split_into_chunks(text: str, chunk_size: int = 4000, overlap: int = 200) ->
     
     return chunks
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about 4 characters per token)"""
+    return (len(text) + 3) // 4
+
 def extract_json_from_text(text: str) -> Dict[str, Any]:
     """Extract JSON from text that might contain markdown or other content"""
     text = text.strip()
@@ -63,4 +67,66 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
         except json.JSONDecodeError:
             pass
     
-    raise ValueError("Could not extract valid JSON from the response")
\ No newline at end of file
+    raise ValueError("Could not extract valid JSON from the response")
+
+_HYPHENATED_BREAK = re.compile(r"([a-z])-[ \t]*\n[ \t]*([a-z])")
+_INLINE_SPACE = re.compile(r"[ \t\u00a0]+")
+_SPACE_AROUND_NEWLINE = re.compile(r" *\n *")
+_EXTRA_NEWLINES = re.compile(r"\n{3,}")
+
+def compact_text(text: str) -> str:
+    """Normalise extracted text without changing its content
+
+    Re-joins words hyphenated across line breaks, collapses runs of spaces
+    and tabs, trims spaces around newlines and limits blank lines to one
+    (paragraph breaks and form feeds are kept for chunking).
+    """
+    text = _HYPHENATED_BREAK.sub(r"\1\2", text)
+    text = _INLINE_SPACE.sub(" ", text)
+    text = _SPACE_AROUND_NEWLINE.sub("\n", text)
+    text = _EXTRA_NEWLINES.sub("\n\n", text)
+    return text.strip()
+
+def compact_json(data: Any) -> str:
+    """Serialise data for embedding in a prompt with no indentation or padding"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+class PromptCompactor:
+    """Applies prompt compaction and keeps count of the tokens it saved"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def _track(self, before: str, after: str) -> str:
+        self.tokens_before += estimate_tokens(before)
+        self.tokens_after += estimate_tokens(after)
+        return after
+
+    def text(self, text: str) -> str:
+        """Compact document or chunk text"""
+        if not self.enabled:
+            return text
+        return self._track(text, compact_text(text))
+
+    def json(self, data: Any, ensure_ascii: bool = True) -> str:
+        """Serialise data for a prompt (indented as before when disabled)
+
+        ``ensure_ascii`` only applies when disabled, matching what the caller
+        used to send; compact JSON always keeps non-ASCII text as is.
+        """
+        indented = json.dumps(data, ensure_ascii=ensure_ascii, indent=2)
+        if not self.enabled:
+            return indented
+        return self._track(indented, compact_json(data))
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    def report(self) -> None:
+        """Print the tokens saved so far, if any"""
+        if self.enabled and self.tokens_saved > 0:
+            percent = 100 * self.tokens_saved / max(1, self.tokens_before)
+            print(f"Prompt compaction saved ~{self.tokens_saved} input tokens ({percent:.0f}%)")
@@ -0,0 +1,58 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+# Streaming top-K selection of rated items in O(K) memory
+import heapq
+import itertools
+from typing import List, Dict, Any, Optional, Iterable, Hashable, Tuple
+
+
+class TopKSelector:
+    """Keep the K highest-scoring items seen so far, optionally per group
+
+    Items are pushed one at a time; each group holds a min-heap of at most K
+    entries, so memory is O(K) per group however many items stream past. Ties
+    are broken in favour of the item seen first.
+    """
+
+    def __init__(self, k: int):
+        if k <= 0:
+            raise ValueError(f"k must be positive, got {k}")
+        self.k = k
+        self.seen = 0
+        self._heaps: Dict[Hashable, List[Tuple[float, int, Any]]] = {}
+        self._counter = itertools.count()
+
+    def push(self, item: Any, score: float, group: Hashable = None) -> None:
+        """Offer an item; it is kept only if it is among the group's top K so far"""
+        self.seen += 1
+        heap = self._heaps.setdefault(group, [])
+        # Negated sequence number: among equal scores the latest item is evicted first
+        entry = (score, -next(self._counter), item)
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def results(self, group: Hashable = None) -> List[Any]:
+        """Kept items of a group, best first"""
+        return [item for _, _, item in sorted(self._heaps.get(group, []), reverse=True)]
+
+    def groups(self) -> List[Hashable]:
+        return list(self._heaps)
+
+
+def select_top_k(items: Iterable[Dict[str, Any]], k: int, score_key: str = "rating",
+                 group_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Top ``k`` items by ``score_key`` (per ``group_key`` value if given), in input order"""
+    selector = TopKSelector(k)
+    for position, item in enumerate(items):
+        group = item.get(group_key) if group_key else None
+        selector.push((position, item), item.get(score_key, 0), group)
+    kept = [entry for group in selector.groups() for entry in selector.results(group)]
+    return [item for _, item in sorted(kept, key=lambda entry: entry[0])]
@@ -186,7 +186,7 @@ def test_preview_mode_empty_directory(patch_config):
 
 
 @pytest.mark.functional
-def test_preview_mode_single_file_warning(patch_config):
+def test_preview_mode_single_file_warning(patch_config, tmp_path):
     """Test that preview mode shows warning for single files."""
     with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
         f.write("Test content")
@@ -198,7 +198,7 @@ def test_preview_mode_single_file_warning(patch_config):
         from typer.testing import CliRunner
         
         runner = CliRunner()
-        result = runner.invoke(app, ['ingest', temp_file, '--preview'])
+        result = runner.invoke(app, ['ingest', temp_file, '--preview', '--output-dir', str(tmp_path)])
         
         # Should show warning that preview is only for directories
         assert result.exit_code == 0
@@ -9,6 +9,7 @@ import pytest
 
 from synthetic_data_kit.utils.directory_processor import (
     process_directory_ingest,
+    process_directory_curate,
     process_directory_save_as,
     get_directory_stats,
     INGEST_EXTENSIONS,
@@ -227,4 +228,128 @@ def test_directory_with_subdirectories():
         os.unlink(os.path.join(sub_dir, "sub.txt"))
         os.rmdir(sub_dir)
         os.unlink(main_file)
-        os.rmdir(temp_dir)
\ No newline at end of file
+        os.rmdir(temp_dir)
+
+@pytest.mark.integration
+def test_parallel_ingest_keeps_directory_order(tmp_path):
+    """Test that ingest with worker processes reports results in directory order."""
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    for name in ["c.txt", "a.txt", "b.txt"]:
+        (input_dir / name).write_text(f"Content of {name}")
+    (input_dir / "broken.html").write_bytes(b"\xff\xfe\x00")
+
+    with patch("synthetic_data_kit.parsers.html_parser.HTMLParser.parse", side_effect=ValueError("bad html")):
+        serial = process_directory_ingest(str(input_dir), str(tmp_path / "serial"), workers=1)
+    parallel = process_directory_ingest(str(input_dir), str(output_dir), workers=3, file_timeout=60)
+
+    assert parallel["total_files"] == 4
+    assert parallel["successful"] == 3
+    assert [r["input_file"] for r in parallel["results"]] == [r["input_file"] for r in serial["results"]]
+    assert [os.path.basename(r["output_file"]) for r in parallel["results"]] == ["a.lance", "b.lance", "c.lance"]
+    assert parallel["failed"] == 1
+    assert parallel["errors"][0]["input_file"].endswith("broken.html")
+
+
+@pytest.mark.integration
+def test_ingest_file_timeout():
+    """Test that a file exceeding the per-file timeout fails instead of hanging."""
+    import time
+    from synthetic_data_kit.utils.directory_processor import _ingest_one
+
+    with patch("synthetic_data_kit.core.ingest.process_file", side_effect=lambda *a, **k: time.sleep(5)):
+        start = time.time()
+        with pytest.raises(TimeoutError):
+            _ingest_one("slow.pdf", None, None, False, 0.2)
+    assert time.time() - start < 2
+
+
+@pytest.mark.integration
+def test_ingest_skips_unchanged_files(tmp_path):
+    """Test that re-ingesting a directory only parses new or modified files."""
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    (input_dir / "a.txt").write_text("First document")
+    (input_dir / "b.txt").write_text("Second document")
+
+    first = process_directory_ingest(str(input_dir), str(output_dir))
+    assert first["successful"] == 2
+
+    # Touched but identical, and modified
+    os.utime(input_dir / "a.txt", ns=(0, 0))
+    (input_dir / "b.txt").write_text("Second document, revised")
+    (input_dir / "c.txt").write_text("Third document")
+
+    from synthetic_data_kit.core import ingest
+    with patch("synthetic_data_kit.core.ingest.process_file", wraps=ingest.process_file) as mock_process:
+        second = process_directory_ingest(str(input_dir), str(output_dir))
+    parsed = sorted(os.path.basename(call.args[0]) for call in mock_process.call_args_list)
+    assert parsed == ["b.txt", "c.txt"]
+    assert second["skipped"] == 1
+    assert second["successful"] == 2
+
+    forced = process_directory_ingest(str(input_dir), str(output_dir), force=True)
+    assert forced["skipped"] == 0
+    assert forced["successful"] == 3
+
+
+def _crash_or_hang(file_path, *args, **kwargs):
+    """Stand-in parser: killed (as by the OOM killer) on crash.txt, hangs in "native code" on hang.txt"""
+    import signal
+    import time
+    name = os.path.basename(file_path)
+    if name == "crash.txt":
+        os.kill(os.getpid(), signal.SIGKILL)
+    if name == "hang.txt":
+        # Like a hang inside C code: the worker's SIGALRM never gets to run
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(60)
+    return f"{file_path}.lance"
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="workers inherit the patched parser through fork")
+def test_parallel_ingest_isolates_crashes_and_native_hangs(tmp_path, monkeypatch):
+    """Test that a crashed or hung worker only fails its own file."""
+    import multiprocessing
+    import time
+    from synthetic_data_kit.utils import directory_processor
+
+    if multiprocessing.get_start_method() != "fork":
+        pytest.skip("workers inherit the patched parser through fork")
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ["a.txt", "b.txt", "crash.txt", "d.txt", "e.txt", "hang.txt", "g.txt"]:
+        (input_dir / name).write_text(name)
+
+    monkeypatch.setattr(directory_processor, "KILL_GRACE", 0.5)
+    with patch("synthetic_data_kit.core.ingest.process_file", side_effect=_crash_or_hang):
+        start = time.time()
+        results = process_directory_ingest(str(input_dir), str(tmp_path / "output"), workers=3, file_timeout=1)
+
+    assert time.time() - start < 30
+    assert results["successful"] == 5
+    assert [os.path.basename(e["input_file"]) for e in results["errors"]] == ["crash.txt", "hang.txt"]
+    assert "crashed" in results["errors"][0]["error"]
+    assert "Timed out" in results["errors"][1]["error"]
+
+
+@pytest.mark.integration
+def test_directory_curate_passes_stream(tmp_path):
+    """Test that --stream reaches every file in directory mode."""
+    for name in ("a.json", "b.json"):
+        (tmp_path / name).write_text(json.dumps({"qa_pairs": [{"question": "Q?", "answer": "A."}]}))
+    output_dir = tmp_path / "curated"
+
+    with patch("synthetic_data_kit.core.curate.curate_qa_pairs") as mock_curate:
+        mock_curate.side_effect = lambda path, output, *args, **kwargs: output
+        results = process_directory_curate(str(tmp_path), str(output_dir), threshold=7.0, stream=True)
+
+    assert results["successful"] == 2
+    assert [call.kwargs["stream"] for call in mock_curate.call_args_list] == [True, True]
+
+    # Directory-wide top-k rewrites JSON outputs, so it cannot stream
+    with pytest.raises(ValueError, match="--stream"):
+        process_directory_curate(str(tmp_path), str(output_dir), top_k=5, stream=True)
@@ -0,0 +1,94 @@
+"""Unit tests for the boilerplate filter."""
+
+import pytest
+
+from synthetic_data_kit.utils import boilerplate
+
+
+def _page(number, body):
+    return f"ACME Corp Annual Report\n{body}\nCopyright 2024 ACME. All rights reserved.\nPage {number}"
+
+
+@pytest.mark.unit
+def test_build_line_index_counts_pages_not_occurrences():
+    """Test that a line is counted once per page and digits are normalised."""
+    pages = ["Header\nHeader\nPage 1", "Header\nPage 2"]
+    index = boilerplate.build_line_index(pages)
+
+    assert index["header"] == 2
+    assert index["page #"] == 2
+
+
+@pytest.mark.unit
+def test_strip_boilerplate_removes_repeated_lines_and_empty_pages():
+    """Test stripping running headers/footers and dropping near-empty pages."""
+    regions = ["north", "south", "east", "west", "central", "coastal", "alpine", "urban", "rural"]
+    pages = [
+        _page(i + 1, f"Revenue grew in the {region} region thanks to the new product line. " * 5)
+        for i, region in enumerate(regions)
+    ]
+    pages.append(_page(10, "Notes"))
+    documents = [{"text": boilerplate.PAGE_SEPARATOR.join(pages), "image": None}]
+
+    cleaned, stats = boilerplate.strip_boilerplate(documents, chunk_size=400, overlap=0)
+
+    text = cleaned[0]["text"]
+    assert "ACME Corp Annual Report" not in text
+    assert "All rights reserved" not in text
+    assert "Page 3" not in text
+    assert "Revenue grew" in text
+    # Other fields are preserved
+    assert cleaned[0]["image"] is None
+    assert stats["pages"] == 10
+    assert stats["pages_dropped"] == 1
+    assert stats["boilerplate_lines"] == 3
+    assert stats["tokens_saved"] > 0
+
+
+@pytest.mark.unit
+def test_strip_boilerplate_keeps_short_single_document():
+    """Test that a short document is not dropped entirely."""
+    documents = [{"text": "A short note."}]
+    cleaned, stats = boilerplate.strip_boilerplate(documents)
+
+    assert cleaned == documents
+    assert stats["chunks_saved"] == 0
+
+
+@pytest.mark.unit
+def test_filter_documents_can_be_disabled():
+    """Test that the filter is a no-op when disabled in config."""
+    documents = [{"text": "Header\fHeader\fHeader"}]
+    assert boilerplate.filter_documents(documents, {"boilerplate_filter": False}) is documents
+
+
+@pytest.mark.unit
+def test_strip_boilerplate_keeps_numeric_table_cells():
+    """Test that number-only lines are kept unless they are the page numbers."""
+    regions = ["north", "south", "east", "west", "central", "coastal"]
+    pages = [f"Results for the {region} region are in the table below.\nRevenue\n12\n3.4\n2021\n{i + 7}"
+             for i, region in enumerate(regions)]
+    documents = [{"text": boilerplate.PAGE_SEPARATOR.join(pages)}]
+
+    cleaned, stats = boilerplate.strip_boilerplate(documents)
+
+    for page in cleaned[0]["text"].split(boilerplate.PAGE_SEPARATOR):
+        # Page numbers 7-12 are gone from the bottom; the table cells stay
+        assert page.splitlines()[1:] == ["12", "3.4", "2021"]
+    # Only the repeated "Revenue" heading is a repeated line
+    assert stats["boilerplate_lines"] == 1
+
+
+@pytest.mark.unit
+def test_strip_boilerplate_keeps_text_made_of_repeated_lines(capsys):
+    """Test that a document whose lines all repeat is returned unfiltered."""
+    page = "Terms and conditions apply to every order.\nPrices include sales tax."
+    documents = [{"text": boilerplate.PAGE_SEPARATOR.join([page] * 5)}]
+
+    cleaned, stats = boilerplate.strip_boilerplate(documents)
+
+    assert cleaned == documents
+    assert stats["pages_dropped"] == 0
+    assert stats["boilerplate_lines"] == 0
+    assert stats["tokens_saved"] == 0
+    assert "keeping the documents unfiltered" in capsys.readouterr().out
@@ -0,0 +1,111 @@
+"""Unit tests for chunk selection utilities."""
+
+import numpy as np
+import pytest
+
+from synthetic_data_kit.utils import chunk_selection
+
+
+def _topic_chunks():
+    """Three topics, each repeated across the whole document."""
+    topics = [
+        "photosynthesis chlorophyll leaves sunlight plants glucose",
+        "compiler parser tokens syntax grammar bytecode",
+        "volcano magma eruption lava tectonic crust",
+    ]
+    return [f"{topics[i % 3]} section {i}" for i in range(30)]
+
+
+@pytest.mark.unit
+def test_hashed_tfidf_matrix_is_normalised_and_stable():
+    """Test that TF-IDF rows are unit length and deterministic."""
+    texts = ["alpha beta gamma", "beta gamma delta", ""]
+    first = chunk_selection.hashed_tfidf_matrix(texts, n_features=64)
+    second = chunk_selection.hashed_tfidf_matrix(texts, n_features=64)
+
+    assert first.shape == (3, 64)
+    assert np.allclose(np.linalg.norm(first[:2], axis=1), 1.0)
+    # Empty text stays a zero vector
+    assert not first[2].any()
+    assert np.array_equal(first, second)
+
+
+@pytest.mark.unit
+def test_cluster_chunks_separates_topics():
+    """Test that chunks about the same topic share a cluster."""
+    chunks = _topic_chunks()
+    labels = chunk_selection.cluster_chunks(chunk_selection.hashed_tfidf_matrix(chunks), 3)
+
+    for topic in range(3):
+        assert len(set(labels[topic::3])) == 1
+    assert len(set(labels)) == 3
+
+
+@pytest.mark.unit
+def test_select_chunks_covers_topics_and_positions():
+    """Test that a small selection spans every topic and the whole document."""
+    chunks = _topic_chunks()
+    selected = chunk_selection.select_chunks(chunks, 6, num_clusters=3)
+
+    assert len(selected) == 6
+    assert len(set(selected)) == 6
+    # Every topic is represented
+    assert {i % 3 for i in selected} == {0, 1, 2}
+    # Not just the first few chunks
+    assert max(selected) >= len(chunks) // 2
+
+
+@pytest.mark.unit
+def test_select_chunks_edge_cases():
+    """Test selecting more chunks than exist and selecting none."""
+    chunks = ["one", "two", "three"]
+    assert chunk_selection.select_chunks(chunks, 5) == [0, 1, 2]
+    assert chunk_selection.select_chunks(chunks, 0) == []
+
+
+@pytest.mark.unit
+def test_score_chunks_ranks_content_above_boilerplate():
+    """Test that dense prose outscores a table of contents and a reference list."""
+    methods = (
+        "The Falcon 9 engine produced 845 kN of thrust at sea level in 2018. "
+        "Engineers at SpaceX tested the Merlin turbopump at 3,000 psi before "
+        "integration, and NASA reviewed telemetry from 12 static fires."
+    )
+    toc = "\n".join(f"Chapter {i} ........ {i * 10}" for i in range(1, 12))
+    references = "\n".join(f"[{i}] Smith et al. doi:10.1000/{i}" for i in range(1, 12))
+
+    scores = chunk_selection.score_chunks([methods, toc, references, ""])
+
+    assert scores[0] > scores[1]
+    assert scores[0] > scores[2]
+    assert scores[3] == 0
+    assert all(0.0 <= s <= 1.0 for s in scores)
+
+
+@pytest.mark.unit
+def test_allocate_pairs_proportional_with_floor():
+    """Test that the budget follows the scores and low scorers are skipped."""
+    allocation = chunk_selection.allocate_pairs(np.array([0.8, 0.4, 0.05, 0.0]), 12, min_score=0.1)
+
+    assert allocation[2] == 0
+    assert allocation[3] == 0
+    assert sum(allocation) == 12
+    assert allocation[0] > allocation[1] >= 1
+
+
+@pytest.mark.unit
+def test_allocate_pairs_keeps_best_chunk_when_all_below_floor():
+    """Test that a document is never skipped entirely."""
+    allocation = chunk_selection.allocate_pairs(np.array([0.02, 0.05]), 3, min_score=0.5)
+
+    assert allocation == [0, 3]
+
+
+@pytest.mark.unit
+def test_allocate_pairs_all_zero_scores():
+    """Test that a document whose chunks all score 0 still gets its pairs."""
+    assert chunk_selection.allocate_pairs(np.zeros(3), 4, min_score=0.1) == [4, 0, 0]
+    assert chunk_selection.allocate_pairs(np.zeros(3), 0) == [0, 0, 0]
+
+    chunks, indices, budgets = chunk_selection.plan_chunks("the the the", 2, {"min_chunk_density": 0.1})
+    assert indices == [0] and budgets == [2]
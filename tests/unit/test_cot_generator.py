@@ -259,6 +259,30 @@ def test_enhance_with_cot(patch_config):
     )
 
 
+@pytest.mark.unit
+def test_enhance_with_cot_keeps_non_ascii_without_compaction(patch_config):
+    """Test that non-ASCII text reaches the prompt unescaped when compaction is off."""
+    mock_client = MagicMock()
+    mock_client.config = {
+        "prompts": {
+            "cot_enhancement": "Include_simple_steps: {include_simple_steps}\n\nConversations:\n{conversations}",
+        },
+        "generation": {"batch_size": 1, "compact_prompts": False},
+    }
+    conversations = [[
+        {"role": "user", "content": "Qu'est-ce qu'un café ?"},
+        {"role": "assistant", "content": "Un établissement."},
+    ]]
+    mock_client.chat_completion.return_value = json.dumps(conversations)
+
+    generator = COTGenerator(client=mock_client)
+    generator.enhance_with_cot(conversations)
+
+    prompt = mock_client.chat_completion.call_args_list[0][0][0][0]["content"]
+    assert "café" in prompt and "établissement" in prompt
+    assert "\\u00e9" not in prompt
+
+
 @pytest.mark.unit
 def test_process_document(patch_config):
     """Test processing a document to generate COT examples."""
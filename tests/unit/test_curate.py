@@ -0,0 +1,258 @@
+"""Unit tests for curate."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from synthetic_data_kit.core import curate
+from synthetic_data_kit.utils.config import load_config
+
+
+def _pairs_in_prompt(messages):
+    """Recover the QA pairs embedded in a rating prompt."""
+    content = messages[0]["content"]
+    start = content.index("[{") if "[{" in content else content.index("{")
+    pairs, _ = json.JSONDecoder().raw_decode(content[start:])
+    return pairs if isinstance(pairs, list) else [pairs]
+
+
+def _mock_client(rate, config=None, model="judge"):
+    """LLM client whose judge rates each pair with ``rate(pair)``."""
+    client = MagicMock()
+    client.config = config or load_config()
+    client.model = model
+    client.batch_completion.side_effect = lambda batches, **kwargs: [
+        json.dumps([dict(pair, rating=rate(pair)) for pair in _pairs_in_prompt(messages)])
+        for messages in batches
+    ]
+    return client
+
+
+def _write_input(tmp_path, qa_pairs):
+    input_path = tmp_path / "doc_qa_pairs.json"
+    input_path.write_text(json.dumps({"summary": "A summary.", "qa_pairs": qa_pairs}))
+    return str(input_path)
+
+
+@pytest.mark.unit
+def test_curate_prefilter_skips_judge(tmp_path):
+    """Test that rule violations are rejected without being sent for rating."""
+    qa_pairs = [
+        {"question": "What is DNA?", "answer": "A molecule carrying genetic instructions."},
+        {"question": "What is RNA?", "answer": ""},
+        {"question": "Describe ATP", "answer": "The energy currency of the cell."},
+    ]
+    client = _mock_client(lambda pair: 8)
+
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        output_path = curate.curate_qa_pairs(_write_input(tmp_path, qa_pairs), str(tmp_path / "out" / "cleaned.json"))
+
+    with open(output_path) as f:
+        result = json.load(f)
+
+    rated = [pair for call in client.batch_completion.call_args_list for messages in call[0][0]
+             for pair in _pairs_in_prompt(messages)]
+    assert [pair["question"] for pair in rated] == ["What is DNA?"]
+    assert result["metrics"]["prefilter_rejected"]["empty_answer"] == 1
+    assert result["metrics"]["prefilter_rejected"]["no_question_mark"] == 1
+    assert [pair["question"] for pair in result["qa_pairs"]] == ["What is DNA?"]
+
+
+@pytest.mark.unit
+def test_curate_grounding_filter(tmp_path):
+    """Test that answers unsupported by the source are rejected before rating."""
+    source = tmp_path / "doc.txt"
+    source.write_text("DNA is a molecule carrying genetic instructions for all known organisms.")
+    qa_pairs = [
+        {"question": "What is DNA?", "answer": "A molecule carrying genetic instructions."},
+        {"question": "What is ATP?", "answer": "The energy currency of the cell."},
+    ]
+    input_path = tmp_path / "doc_qa_pairs.json"
+    input_path.write_text(json.dumps({"summary": "", "qa_pairs": qa_pairs, "source": str(source)}))
+    config = load_config()
+    config["curate"]["min_grounding"] = 0.5
+    client = _mock_client(lambda pair: 8, config)
+
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        output_path = curate.curate_qa_pairs(str(input_path), str(tmp_path / "out" / "cleaned.json"))
+
+    with open(output_path) as f:
+        result = json.load(f)
+
+    assert [pair["question"] for pair in result["qa_pairs"]] == ["What is DNA?"]
+    assert result["metrics"]["grounding_rejected"] == 1
+    assert result["metrics"]["avg_grounding"] == 0.5
+
+
+@pytest.mark.unit
+def test_curate_cascade_escalates_only_borderline(tmp_path):
+    """Test that only pairs the cheap judge rates near the threshold reach the main judge."""
+    qa_pairs = [
+        {"question": "What is DNA?", "answer": "A molecule carrying genetic instructions."},
+        {"question": "What is RNA?", "answer": "A nucleic acid."},
+        {"question": "What is ATP?", "answer": "The energy currency of the cell."},
+    ]
+    screen_ratings = {"What is DNA?": 9, "What is RNA?": 2, "What is ATP?": 7}
+    config = load_config()
+    config["curate"]["cascade"] = {"enabled": True, "model": "small", "band": 1.0}
+    judge = _mock_client(lambda pair: 5, config)
+    screen = _mock_client(lambda pair: screen_ratings[pair["question"]], config, model="small")
+
+    with patch("synthetic_data_kit.core.curate.LLMClient", side_effect=[judge, screen]):
+        output_path = curate.curate_qa_pairs(_write_input(tmp_path, qa_pairs), str(tmp_path / "out" / "cleaned.json"),
+                                             threshold=7.0)
+
+    with open(output_path) as f:
+        result = json.load(f)
+
+    judged = [pair for call in judge.batch_completion.call_args_list for messages in call[0][0]
+              for pair in _pairs_in_prompt(messages)]
+    assert [pair["question"] for pair in judged] == ["What is ATP?"]
+    assert "rating" not in judged[0]
+    assert [pair["question"] for pair in result["qa_pairs"]] == ["What is DNA?"]
+    assert result["metrics"]["cascade"] == {
+        "screen_model": "small", "screened": 3, "accepted": 1, "rejected": 1, "escalated": 1
+    }
+
+
+@pytest.mark.unit
+def test_curate_reuses_stored_ratings(tmp_path):
+    """Test that re-curation only rates new pairs and rethreshold needs no client."""
+    qa_pairs = [
+        {"question": "What is DNA?", "answer": "A molecule carrying genetic instructions."},
+        {"question": "What is ATP?", "answer": "The energy currency of the cell."},
+    ]
+    ratings = {"What is DNA?": 8, "What is ATP?": 6, "What is RNA?": 9}
+    input_path = _write_input(tmp_path, qa_pairs)
+    output_path = str(tmp_path / "out" / "cleaned.json")
+
+    client = _mock_client(lambda pair: ratings[pair["question"]])
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        curate.curate_qa_pairs(input_path, output_path, threshold=7.0)
+
+    # A new pair is the only one sent to the judge
+    input_path = _write_input(tmp_path, qa_pairs + [{"question": "What is RNA?", "answer": "A nucleic acid."}])
+    client = _mock_client(lambda pair: ratings[pair["question"]])
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        curate.curate_qa_pairs(input_path, output_path, threshold=7.0)
+    rated = [pair for call in client.batch_completion.call_args_list for messages in call[0][0]
+             for pair in _pairs_in_prompt(messages)]
+    assert [pair["question"] for pair in rated] == ["What is RNA?"]
+
+    # A lower threshold is applied to stored ratings without any client
+    with patch("synthetic_data_kit.core.curate.LLMClient", side_effect=AssertionError("no LLM")):
+        curate.curate_qa_pairs(input_path, output_path, threshold=6.0, rethreshold=True)
+    with open(output_path) as f:
+        result = json.load(f)
+    assert [pair["question"] for pair in result["qa_pairs"]] == ["What is DNA?", "What is ATP?", "What is RNA?"]
+    assert result["metrics"]["stored_ratings_used"] == 3
+    assert result["metrics"]["unrated"] == 0
+
+    # A different judge model rates everything again
+    client = _mock_client(lambda pair: ratings[pair["question"]], model="other-judge")
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        curate.curate_qa_pairs(input_path, output_path, threshold=7.0)
+    rated = [pair for call in client.batch_completion.call_args_list for messages in call[0][0]
+             for pair in _pairs_in_prompt(messages)]
+    assert len(rated) == 3
+
+
+@pytest.mark.unit
+def test_curate_top_k(tmp_path):
+    """Test top-K within a file and across curated outputs."""
+    topics = ["photosynthesis", "gravity", "volcanoes", "inflation", "tides"]
+    qa_pairs = [{"question": f"What causes {topic}?", "answer": f"Several things cause {topic}."} for topic in topics]
+    ratings = {pair["question"]: rating for pair, rating in zip(qa_pairs, [3, 9, 5, 8, 6])}
+    client = _mock_client(lambda pair: ratings[pair["question"]])
+
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        output_path = curate.curate_qa_pairs(_write_input(tmp_path, qa_pairs), str(tmp_path / "out" / "a.json"),
+                                             top_k=3)
+
+    with open(output_path) as f:
+        result = json.load(f)
+    # No threshold by default, exactly K pairs in input order
+    assert [pair["question"] for pair in result["qa_pairs"]] == [
+        "What causes gravity?", "What causes inflation?", "What causes tides?"
+    ]
+    assert result["metrics"]["top_k_dropped"] == 2
+
+    # Across files, the best pairs win wherever they are
+    other_path = tmp_path / "out" / "b.json"
+    other_path.write_text(json.dumps({"qa_pairs": [{"question": "Q?", "answer": "A.", "rating": 10}],
+                                      "metrics": {"total": 1}}))
+    assert curate.apply_top_k([output_path, str(other_path)], 2) == 2
+    with open(output_path) as f:
+        assert [pair["question"] for pair in json.load(f)["qa_pairs"]] == ["What causes gravity?"]
+    with open(other_path) as f:
+        assert len(json.load(f)["conversations"]) == 1
+
+
+@pytest.mark.unit
+def test_curate_streaming_appends_per_window(tmp_path, monkeypatch):
+    """Test that streaming curate rates window by window and appends accepted pairs."""
+    monkeypatch.setenv("SDK_BATCH_SIZE", "2")
+    topics = ["photosynthesis", "gravity", "volcanoes", "inflation", "tides", "earthquakes"]
+    qa_pairs = [{"question": f"What causes {topic}?", "answer": f"Several things cause {topic}."} for topic in topics]
+    input_path = tmp_path / "pairs.jsonl"
+    input_path.write_text("".join(json.dumps(pair) + "\n" for pair in qa_pairs))
+    ratings = dict(zip(topics, [3, 3, 8, 8, 3, 8]))
+    client = _mock_client(lambda pair: ratings[pair["question"][len("What causes "):-1]])
+
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        output_path = curate.curate_qa_pairs(str(input_path), str(tmp_path / "out" / "cleaned.json"), threshold=7.0)
+
+    assert output_path.endswith("cleaned.jsonl")
+    with open(output_path) as f:
+        kept = [json.loads(line) for line in f]
+    assert [pair["question"] for pair in kept] == [
+        "What causes volcanoes?", "What causes inflation?", "What causes earthquakes?"
+    ]
+    # Windows of batch_size * inference_batch = 4 pairs
+    assert client.batch_completion.call_count == 2
+    with open(tmp_path / "out" / "cleaned.metrics.json") as f:
+        metrics = json.load(f)["metrics"]
+    assert metrics["total"] == 6
+    assert metrics["filtered"] == 3
+
+
+@pytest.mark.unit
+def test_curate_streaming_reads_run_and_source_from_sidecar(tmp_path, capsys):
+    """Test that JSONL input keeps its run id and source in a .meta.json sidecar."""
+    from synthetic_data_kit.utils.fingerprint_store import record_items
+
+    source = tmp_path / "doc.txt"
+    source.write_text("DNA is a molecule carrying genetic instructions for all known organisms.")
+    qa_pairs = [{"question": "What is DNA?", "answer": "A molecule carrying genetic instructions."}]
+    config = load_config()
+    config["generation"]["fingerprint_store"] = str(tmp_path / "store")
+    # The create run recorded its own pairs
+    record_items(qa_pairs, config["generation"], "create-1")
+
+    input_path = tmp_path / "pairs.jsonl"
+    input_path.write_text("".join(json.dumps(pair) + "\n" for pair in qa_pairs))
+    (tmp_path / "pairs.meta.json").write_text(json.dumps({"fingerprint_run": "create-1", "source": str(source)}))
+    client = _mock_client(lambda pair: 8, config)
+
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        output_path = curate.curate_qa_pairs(str(input_path), str(tmp_path / "out" / "cleaned.jsonl"))
+
+    with open(output_path) as f:
+        assert [json.loads(line)["question"] for line in f] == ["What is DNA?"]
+    with open(tmp_path / "out" / "cleaned.meta.json") as f:
+        assert json.load(f) == {"summary": "", "fingerprint_run": "create-1", "source": str(source)}
+    with open(tmp_path / "out" / "cleaned.metrics.json") as f:
+        assert json.load(f)["metrics"]["avg_grounding"] > 0
+
+    # Without the sidecar the run is unknown: its pairs are not mistaken for known ones
+    (tmp_path / "pairs.meta.json").unlink()
+    capsys.readouterr()
+    with patch("synthetic_data_kit.core.curate.LLMClient", return_value=client):
+        output_path = curate.curate_qa_pairs(str(input_path), str(tmp_path / "out" / "cleaned.jsonl"))
+
+    with open(output_path) as f:
+        assert [json.loads(line)["question"] for line in f] == ["What is DNA?"]
+    out = capsys.readouterr().out
+    assert "skipping the fingerprint store check" in out
+    assert "skipping grounding check" in out
@@ -0,0 +1,142 @@
+"""Unit tests for near-duplicate removal."""
+
+import numpy as np
+import pytest
+
+from synthetic_data_kit.utils import dedup
+
+
+@pytest.mark.unit
+def test_minhash_signatures_estimate_similarity():
+    """Test that signatures agree for near-identical text and not for unrelated text."""
+    signatures = dedup.minhash_signatures([
+        "What is the capital of France?",
+        "what is the capital of France",
+        "Who wrote Hamlet?",
+        "",
+    ])
+
+    assert signatures.shape == (4, 128)
+    assert signatures.dtype == np.uint32
+    # Case and punctuation are normalised away
+    assert np.array_equal(signatures[0], signatures[1])
+    assert np.mean(signatures[0] == signatures[2]) < 0.2
+    # Deterministic across calls
+    assert np.array_equal(signatures, dedup.minhash_signatures([
+        "What is the capital of France?", "what is the capital of France", "Who wrote Hamlet?", ""
+    ]))
+
+
+@pytest.mark.unit
+def test_lsh_params_stay_below_threshold():
+    """Test that banding never raises the candidate threshold above the target."""
+    for threshold in (0.5, 0.8, 0.9):
+        bands, rows = dedup.lsh_params(threshold, 128)
+        assert bands * rows == 128
+        assert (1.0 / bands) ** (1.0 / rows) <= threshold
+
+
+@pytest.mark.unit
+def test_deduplicate_keeps_first_occurrence():
+    """Test that near-duplicates are dropped and order is preserved."""
+    items = [
+        {"question": "What is the boiling point of water at sea level?", "answer": "100 C"},
+        {"question": "Who discovered penicillin?", "answer": "Fleming"},
+        {"question": "What is the boiling point of water at sea-level?", "answer": "100 degrees"},
+        {"question": "How many moons does Mars have?", "answer": "Two"},
+    ]
+
+    kept, removed = dedup.deduplicate(items, threshold=0.8)
+
+    assert removed == 1
+    assert [item["answer"] for item in kept] == ["100 C", "Fleming", "Two"]
+
+
+@pytest.mark.unit
+def test_deduplicate_items_honours_config():
+    """Test that enable_deduplication turns the stage off."""
+    items = [{"question": "Same question?"}, {"question": "Same question?"}]
+
+    assert len(dedup.deduplicate_items(items, {"enable_deduplication": True})) == 1
+    assert len(dedup.deduplicate_items(items, {"enable_deduplication": False})) == 2
+    # A threshold above 1.0 can never be reached
+    assert len(dedup.deduplicate_items(items, {"similarity_threshold": 1.1})) == 2
+
+
+@pytest.mark.unit
+def test_hashing_embedder_is_batch_independent():
+    """Test that a text embeds the same way whatever batch it is in."""
+    alone = dedup.embed_texts(["How do vaccines train the immune system?"])
+    batched = dedup.embed_texts(["Unrelated text", "How do vaccines train the immune system?"], batch_size=1)
+
+    assert np.allclose(alone[0], batched[1])
+    assert np.isclose(np.linalg.norm(alone[0]), 1.0)
+
+
+@pytest.mark.unit
+def test_semantic_deduplicate_keeps_highest_rated():
+    """Test that the best-rated member of a paraphrase group survives."""
+    items = [
+        {"question": "What is the main function of mitochondria in a cell?", "rating": 6},
+        {"question": "Who painted the Mona Lisa?", "rating": 9},
+        {"question": "What is the main function of the mitochondria in a cell?", "rating": 8},
+    ]
+
+    kept, removed = dedup.semantic_deduplicate(items, threshold=0.8)
+
+    assert removed == 1
+    assert [item["rating"] for item in kept] == [9, 8]
+
+
+@pytest.mark.unit
+def test_semantic_deduplicate_custom_embedder_and_lsh():
+    """Test a pluggable embedding function on the bucketed (LSH) path."""
+    topics = {"define x": [1.0, 0.0, 0.0], "what is x": [0.99, 0.1, 0.0], "why y": [0.0, 1.0, 0.0]}
+
+    def embed(texts):
+        return np.array([topics[text] for text in texts])
+
+    items = [{"question": q, "rating": r} for q, r in [("what is x", 5), ("define x", 7), ("why y", 3)]] * 10
+    kept, removed = dedup.semantic_deduplicate(items, threshold=0.95, embed_fn=embed, exact_limit=4, bucket_size=2)
+
+    assert removed == len(items) - 2
+    assert [item["question"] for item in kept] == ["define x", "why y"]
+
+
+@pytest.mark.unit
+def test_load_embed_fn():
+    """Test resolving the embedding function from config."""
+    assert dedup.load_embed_fn(None) is dedup.hashing_embedder
+    assert dedup.load_embed_fn("numpy:ones") is np.ones
+    with pytest.raises(ValueError):
+        dedup.load_embed_fn("numpy.ones")
+
+
+@pytest.mark.unit
+def test_novelty_tracker_saturates():
+    """Test that the novelty rate drops once items start repeating."""
+    tracker = dedup.NoveltyTracker(floor=0.5, window=4)
+
+    questions = ["Who wrote Hamlet?", "What is photosynthesis?", "How far is the Moon?", "Why is the sky blue?"]
+    assert tracker.observe([{"question": q} for q in questions]) == [True] * 4
+    assert not tracker.saturated()
+
+    assert tracker.observe([{"question": "What is photosynthesis?"}] * 3) == [False] * 3
+    assert tracker.rate == 0.25
+    assert tracker.saturated()
+    assert "below the floor" in tracker.describe()
+
+    # A floor of zero never stops generation
+    assert not dedup.NoveltyTracker(floor=0.0, window=1).saturated()
+
+
+@pytest.mark.unit
+def test_novelty_tracker_dispatch_ranges():
+    """Test that dispatches start small when saturation is checked."""
+    tracker = dedup.NoveltyTracker(floor=0.1, check_chunks=4)
+    assert tracker.dispatch_ranges(40, 16) == [(0, 4), (4, 12), (12, 28), (28, 40)]
+    assert dedup.NoveltyTracker(floor=0.0).dispatch_ranges(40, 16) == [(0, 16), (16, 32), (32, 40)]
+
+    # The window shrinks to small targets, but not below 10 items
+    assert dedup.NoveltyTracker.from_config({}, target=25).recent.maxlen == 25
+    assert dedup.NoveltyTracker.from_config({}, target=3).recent.maxlen == 10
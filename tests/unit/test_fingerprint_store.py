@@ -0,0 +1,111 @@
+"""Unit tests for the persistent question fingerprint store."""
+
+import pytest
+
+from synthetic_data_kit.utils.fingerprint_store import FingerprintStore, filter_known_items, record_items
+
+
+@pytest.mark.unit
+def test_store_persists_across_instances(tmp_path):
+    """Test that questions added in one run are found, exactly and nearly, in the next."""
+    store = FingerprintStore(tmp_path / "store")
+    store.add(["What is the boiling point of water at sea level?", "Who discovered penicillin?"], "run-1")
+    store.flush()
+
+    reopened = FingerprintStore(tmp_path / "store")
+    assert len(reopened) == 2
+    assert reopened.contains([
+        "who discovered penicillin",
+        "What is the boiling point of water at sea-level?",
+        "How many moons does Mars have?",
+    ]) == [True, True, False]
+    # A run does not see its own entries when excluded
+    assert reopened.contains(["Who discovered penicillin?"], exclude_run="run-1") == [False]
+
+
+@pytest.mark.unit
+def test_store_grows_past_initial_capacity(tmp_path):
+    """Test that tables rehash and keep every entry when they fill up."""
+    store = FingerprintStore(tmp_path / "store", initial_capacity=4)
+    questions = [f"Question number {i} about topic {i * 7}?" for i in range(200)]
+    store.add(questions[:100], "run-1")
+    store.add(questions[100:], "run-2")
+    # Re-adding known questions does not create new entries
+    store.add(questions[:10], "run-3")
+    store.flush()
+
+    reopened = FingerprintStore(tmp_path / "store")
+    assert len(reopened) == 200
+    assert all(reopened.contains(questions))
+
+
+@pytest.mark.unit
+def test_filter_known_items_across_create_and_curate(tmp_path):
+    """Test the create -> curate -> next create flow."""
+    config = {"fingerprint_store": str(tmp_path / "store")}
+    pairs = [{"question": "What is DNA?", "answer": "A molecule."}]
+
+    # create records its pairs, curate of the same run keeps them
+    assert filter_known_items(pairs, config, "create-1") == pairs
+    assert filter_known_items(pairs, config, "create-1", update=False) == pairs
+    record_items(pairs, config, "create-1")
+
+    # A later run drops them before they are rated
+    assert filter_known_items(pairs, config, "create-2") == []
+
+    # Disabled store leaves items alone
+    assert filter_known_items(pairs, {}, "create-3") == pairs
+
+
+@pytest.mark.unit
+def test_store_survives_crash_mid_add(tmp_path, monkeypatch):
+    """Test that a crash while adding never lets two questions share an id."""
+    from synthetic_data_kit.utils import fingerprint_store
+
+    store = FingerprintStore(tmp_path / "store", initial_capacity=4)
+    store.add(["Who discovered penicillin?"], "run-1")
+    store.flush()
+
+    # Crash after the exact table is written but before the band table
+    place = fingerprint_store._DiskHashTable.insert_many
+
+    def crash_on_bands(table, keys, values):
+        if table.name == "bands":
+            raise KeyboardInterrupt
+        place(table, keys, values)
+
+    monkeypatch.setattr(fingerprint_store._DiskHashTable, "insert_many", crash_on_bands)
+    with pytest.raises(KeyboardInterrupt):
+        store.add(["What is the boiling point of water?"], "run-2")
+    monkeypatch.undo()
+    store.exact.flush()
+
+    reopened = FingerprintStore(tmp_path / "store")
+    assert len(reopened) == 2
+    reopened.add(["How many moons does Mars have?"], "run-3")
+    ids = [reopened.exact.find(fingerprint_store.question_key(q)) for q in (
+        "Who discovered penicillin?", "What is the boiling point of water?", "How many moons does Mars have?")]
+    assert ids == [[0], [1], [2]]
+
+
+@pytest.mark.unit
+def test_store_recovers_interrupted_rehash(tmp_path, monkeypatch):
+    """Test that a crash while a table doubles keeps the old table."""
+    from synthetic_data_kit.utils import fingerprint_store
+
+    store = FingerprintStore(tmp_path / "store", initial_capacity=4)
+    questions = [f"Question number {i} about topic {i * 7}?" for i in range(3)]
+    store.add(questions, "run-1")
+    store.flush()
+
+    def crash(table, keys, values):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(fingerprint_store._DiskHashTable, "_place", crash)
+    with pytest.raises(KeyboardInterrupt):
+        store.add([f"Another question {i}?" for i in range(20)], "run-2")
+    monkeypatch.undo()
+
+    reopened = FingerprintStore(tmp_path / "store")
+    assert not list((tmp_path / "store").glob("*.old"))
+    assert all(reopened.contains(questions))
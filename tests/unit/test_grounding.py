@@ -0,0 +1,41 @@
+"""Unit tests for the lexical grounding scorer."""
+
+import pytest
+
+from synthetic_data_kit.utils.grounding import GroundingIndex, load_source_chunks
+
+
+@pytest.mark.unit
+def test_grounding_scores_supported_answers_higher():
+    """Test that answers drawn from a chunk score above unrelated ones."""
+    index = GroundingIndex([
+        "Mitochondria produce ATP through oxidative phosphorylation in eukaryotic cells.",
+        "The Treaty of Westphalia ended the Thirty Years War in 1648.",
+    ])
+
+    scores = index.score_pairs([
+        {"answer": "Mitochondria produce ATP through oxidative phosphorylation."},
+        {"answer": "The Thirty Years War ended in 1648."},
+        {"answer": "Photosynthesis converts sunlight into glucose."},
+        {"answer": "It is."},
+    ])
+
+    assert scores[0] == 1.0
+    assert 0.5 < scores[1] < 1.0
+    assert scores[2] == 0.0
+    # Nothing but stopwords: nothing to contradict
+    assert scores[3] == 1.0
+    # Scoring against a specific chunk
+    assert index.score("Mitochondria produce ATP.", chunk_id=1) == 0.0
+
+
+@pytest.mark.unit
+def test_load_source_chunks_from_text(tmp_path):
+    """Test that chunks are rebuilt from a text source and a missing source is skipped."""
+    source = tmp_path / "doc.txt"
+    source.write_text("First paragraph about cells.\n\nSecond paragraph about treaties.")
+
+    chunks = load_source_chunks(str(source), {"chunk_size": 30, "overlap": 0})
+
+    assert len(chunks) == 2
+    assert load_source_chunks(str(tmp_path / "missing.txt"), {}) is None
@@ -0,0 +1,72 @@
+"""Unit tests for multimodal image deduplication"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from synthetic_data_kit.utils.image_dedup import ImageRegistry, dedupe_rows, image_id
+
+
+def _png(size, color="red"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+def test_dedupe_rows_within_dataset():
+    """Test page text is stored once and repeated images become references"""
+    logo, chart, icon = _png((100, 100)), _png((200, 120), "blue"), _png((8, 8))
+    rows = [
+        {"text": "Page one", "image": logo, "page": 1},
+        {"text": "Page one", "image": chart, "page": 1},
+        {"text": "Page one", "image": icon, "page": 1},
+        {"text": "Page two", "image": logo, "page": 2},
+    ]
+
+    result = list(dedupe_rows(rows, min_image_size=32))
+
+    assert [row["text"] for row in result] == ["Page one", "", "Page two"]
+    assert [row["image"] for row in result] == [logo, chart, None]
+    assert [row["image_id"] for row in result] == [image_id(logo), image_id(chart), image_id(logo)]
+
+
+@pytest.mark.unit
+def test_image_registry_is_corpus_wide(tmp_path):
+    """Test an image is stored by the first written dataset and resolved by the others"""
+    import shutil
+
+    from synthetic_data_kit.core.create import read_documents
+    from synthetic_data_kit.utils.lance_utils import create_lance_dataset
+
+    logo = _png((100, 100))
+    rows = [{"text": "Cover", "image": logo}]
+
+    def ingest(name):
+        registry = ImageRegistry(str(tmp_path), str(tmp_path / name))
+        result = list(dedupe_rows(rows, registry))
+        return registry, result
+
+    first_registry, first = ingest("a.lance")
+    # Nothing is claimed until the owning dataset has been written
+    assert ingest("b.lance")[1][0]["image"] == logo
+    create_lance_dataset(first, str(tmp_path / "a.lance"))
+    first_registry.commit()
+
+    second_registry, second = ingest("b.lance")
+    assert first[0]["image"] == logo
+    assert second[0]["image"] is None and second[0]["image_id"] == image_id(logo)
+    # Re-ingesting the owner keeps storing the bytes
+    assert ingest("a.lance")[1][0]["image"] == logo
+
+    # References are resolved from the owning dataset
+    create_lance_dataset(second, str(tmp_path / "b.lance"))
+    second_registry.commit()
+    documents, image_loader = read_documents(str(tmp_path / "b.lance"), "multimodal-qa")
+    assert image_loader([documents[0]["image_id"]]) == [logo]
+
+    # A marker whose dataset is gone is taken over
+    shutil.rmtree(tmp_path / "a.lance")
+    assert image_loader([documents[0]["image_id"]]) == [None]
+    assert ingest("c.lance")[1][0]["image"] == logo
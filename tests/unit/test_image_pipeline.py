@@ -0,0 +1,75 @@
+"""Unit tests for the vision request image pipeline"""
+
+import io
+import base64
+
+import pytest
+from PIL import Image
+
+from synthetic_data_kit.utils.image_pipeline import ImagePipeline
+
+
+def _encoded(size, image_format="PNG", mode="RGB"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, "red").save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def _decode(url):
+    header, payload = url.split(",", 1)
+    return header, Image.open(io.BytesIO(base64.b64decode(payload)))
+
+
+@pytest.mark.unit
+def test_large_images_are_downsized_and_reencoded():
+    """Test images beyond max_size are scaled down and sent as JPEG"""
+    pipeline = ImagePipeline(max_size=256, workers=1)
+
+    header, image = _decode(pipeline.encode(_encoded((1024, 512), mode="RGBA")))
+
+    assert header == "data:image/jpeg;base64"
+    assert image.size == (256, 128)
+
+
+@pytest.mark.unit
+def test_small_compressed_images_pass_through():
+    """Test small PNG/JPEG bytes are sent unchanged"""
+    data = _encoded((64, 64))
+    pipeline = ImagePipeline(max_size=256, workers=1)
+
+    url = pipeline.encode(data)
+
+    assert url == "data:image/png;base64," + base64.b64encode(data).decode("utf-8")
+    assert pipeline.stats["passed_through"] == 1
+
+
+@pytest.mark.unit
+def test_encodings_are_cached_and_ordered():
+    """Test repeated images are encoded once and batches keep their order"""
+    big, small = _encoded((800, 800)), _encoded((32, 32))
+    pipeline = ImagePipeline(max_size=200, image_format="webp", workers=4)
+
+    urls = pipeline.encode_many([big, None, small, big, Image.new("RGB", (400, 100))])
+
+    assert urls[1] is None
+    assert urls[0] == urls[3] and urls[0].startswith("data:image/webp")
+    assert urls[2].startswith("data:image/png")
+    assert _decode(urls[4])[1].size == (200, 50)
+    assert pipeline.stats["encoded"] + pipeline.stats["passed_through"] == 3
+
+
+@pytest.mark.unit
+def test_corrupt_images_fall_back_or_are_skipped():
+    """Test an image PIL can't process doesn't fail the batch"""
+    pipeline = ImagePipeline(max_size=64, workers=2)
+    good = _encoded((32, 32))
+    # A large PNG cut short: recognised, but can't be resized
+    truncated = _encoded((512, 512))[:200]
+    garbage = b"not an image at all"
+
+    urls = pipeline.encode_many([good, truncated, garbage])
+
+    assert _decode(urls[0])[0] == "data:image/png;base64"
+    assert urls[1] == "data:image/png;base64," + base64.b64encode(truncated).decode("utf-8")
+    assert urls[2] is None
+    assert pipeline.stats["failed"] == 1
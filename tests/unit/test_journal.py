@@ -0,0 +1,57 @@
+"""Unit tests for the checkpoint/resume run journal."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from synthetic_data_kit.generators.qa_generator import QAGenerator
+from synthetic_data_kit.utils.journal import RunJournal, journaled
+
+
+@pytest.mark.unit
+def test_journal_resumes_only_matching_runs(tmp_path):
+    """Test that completed units are replayed for the same fingerprint only."""
+    path = str(tmp_path / "doc_qa.journal.jsonl")
+    with RunJournal(path, "fp-1") as journal:
+        assert journaled(journal, "summary", lambda: "A summary.") == "A summary."
+        journal.record("qa:0", ["response"])
+    # The unit in flight when the process died
+    with open(path, "a") as f:
+        f.write('{"unit": "qa:32", "res')
+
+    resumed = RunJournal(path, "fp-1", resume=True)
+    assert len(resumed) == 2
+    assert journaled(resumed, "summary", lambda: pytest.fail("recomputed")) == "A summary."
+    resumed.record("qa:32", ["again"])
+    resumed.close()
+    assert len(RunJournal(path, "fp-1", resume=True)) == 3
+
+    # Different settings or no --resume start over
+    assert len(RunJournal(path, "fp-2", resume=True)) == 0
+    assert len(RunJournal(path, "fp-1")) == 0
+
+    finished = RunJournal(path, "fp-1", resume=True)
+    finished.finish()
+    assert not (tmp_path / "doc_qa.journal.jsonl").exists()
+
+
+@pytest.mark.unit
+def test_generate_qa_pairs_replays_journal(patch_config, tmp_path):
+    """Test that a resumed run reuses completed batches without calling the LLM."""
+    client = MagicMock()
+    client.batch_completion.side_effect = lambda batches, **kwargs: [
+        json.dumps([{"question": f"What is covered in part {i}?", "answer": "Something."}])
+        for i, _ in enumerate(batches)
+    ]
+    path = str(tmp_path / "journal.jsonl")
+    text = "Some document text. " * 20
+
+    generator = QAGenerator(client=client)
+    generator.journal = RunJournal(path, "fp")
+    first = generator.generate_qa_pairs(text, "A summary.", num_pairs=2)
+    generator.journal.close()
+
+    client.batch_completion.side_effect = AssertionError("LLM called on resume")
+    generator.journal = RunJournal(path, "fp", resume=True)
+    assert generator.generate_qa_pairs(text, "A summary.", num_pairs=2) == first
@@ -0,0 +1,55 @@
+"""Unit tests for Lance dataset helpers"""
+
+import os
+
+import lance
+import pyarrow as pa
+import pytest
+
+from synthetic_data_kit.utils import lance_utils
+from synthetic_data_kit.utils.lance_utils import create_lance_dataset, write_lance_stream
+
+
+@pytest.mark.unit
+def test_write_lance_stream_rows_and_batches(tmp_path, monkeypatch):
+    """Test rows and record batches are written incrementally, in order"""
+    monkeypatch.setattr(lance_utils, "BATCH_ROWS", 3)
+    schema = pa.schema([pa.field("text", pa.string()), pa.field("page", pa.int32())])
+
+    def rows():
+        for page in range(1, 8):
+            yield {"text": f"Page {page}", "page": page}
+        yield pa.RecordBatch.from_pylist([{"page": 8, "text": "Page 8"}])
+
+    output_path = str(tmp_path / "doc.lance")
+    assert write_lance_stream(rows(), output_path, schema) == 8
+
+    table = lance.dataset(output_path).to_table()
+    assert table.schema == schema
+    assert table.column("page").to_pylist() == list(range(1, 9))
+
+
+@pytest.mark.unit
+def test_write_lance_stream_infers_schema_and_skips_empty(tmp_path):
+    """Test schema inference from the first rows and that empty input writes nothing"""
+    empty_path = str(tmp_path / "empty.lance")
+    assert write_lance_stream(iter([]), empty_path) == 0
+    assert not os.path.exists(empty_path)
+
+    output_path = str(tmp_path / "doc.lance")
+    create_lance_dataset(({"text": f"Row {i}"} for i in range(5)), output_path)
+    assert lance.dataset(output_path).to_table().column("text").to_pylist()[-1] == "Row 4"
+
+
+@pytest.mark.unit
+def test_iter_lance_rows_projects_columns(tmp_path):
+    """Test rows are read batch by batch with only the projected columns"""
+    output_path = str(tmp_path / "doc.lance")
+    create_lance_dataset([{"text": f"Row {i}", "image": b"x" * i or None} for i in range(5)], output_path)
+    dataset = lance.dataset(output_path)
+
+    rows = list(lance_utils.iter_lance_rows(dataset, {"text": "text", "has_image": "image IS NOT NULL"},
+                                            batch_size=2))
+    assert rows == [{"text": f"Row {i}", "has_image": i > 0} for i in range(5)]
+    assert lance_utils.take_column(dataset, "image", [3, 1]) == [b"xxx", b"x"]
+    assert lance_utils.take_column(dataset, "image", []) == []
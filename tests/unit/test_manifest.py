@@ -0,0 +1,50 @@
+"""Unit tests for the processed-input manifest"""
+
+import os
+
+import pytest
+
+from synthetic_data_kit.utils.manifest import Manifest, content_hash
+
+
+@pytest.mark.unit
+def test_manifest_up_to_date(tmp_path):
+    """Test that inputs are current until their content, settings or output change"""
+    source = tmp_path / "doc.txt"
+    output = tmp_path / "doc_qa_pairs.json"
+    source.write_text("Some text")
+    output.write_text("{}")
+
+    manifest = Manifest(str(tmp_path))
+    assert manifest.up_to_date("create:qa", str(source), "s1") is None
+    manifest.record("create:qa", str(source), "s1", str(output))
+
+    # Reloaded from disk
+    manifest = Manifest(str(tmp_path))
+    assert manifest.up_to_date("create:qa", str(source), "s1") == str(output)
+    assert manifest.up_to_date("create:qa", str(source), "s2") is None
+    assert manifest.up_to_date("create:cot", str(source), "s1") is None
+
+    # A new mtime with the same bytes is still current, and is remembered
+    os.utime(source, ns=(0, 0))
+    assert manifest.up_to_date("create:qa", str(source), "s1") == str(output)
+    assert Manifest(str(tmp_path)).entries[f"create:qa:{source}"]["mtime_ns"] == 0
+
+    source.write_text("Some other text")
+    assert manifest.up_to_date("create:qa", str(source), "s1") is None
+
+    manifest.record("create:qa", str(source), "s1", str(output))
+    output.unlink()
+    assert manifest.up_to_date("create:qa", str(source), "s1") is None
+
+
+@pytest.mark.unit
+def test_content_hash_of_directory(tmp_path):
+    """Test that directory hashes cover file names and contents"""
+    dataset = tmp_path / "doc.lance"
+    dataset.mkdir()
+    (dataset / "part-0").write_bytes(b"abc")
+    first = content_hash(str(dataset))
+
+    (dataset / "part-0").write_bytes(b"abd")
+    assert content_hash(str(dataset)) != first
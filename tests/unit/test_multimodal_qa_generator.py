@@ -0,0 +1,92 @@
+"""Unit tests for the multimodal QA generator"""
+
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from synthetic_data_kit.generators.multimodal_qa_generator import MultimodalQAGenerator
+
+
+def _png(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 40), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+def test_images_stay_with_their_chunks():
+    """Test each chunk carries only its own pages' images, each encoded once"""
+    client = MagicMock()
+    client.config = {"generation": {"chunk_size": 60, "overlap": 0, "batch_size": 8}}
+    client.batch_completion.side_effect = lambda batch, **kwargs: [
+        json.dumps([{"question": "Q?", "answer": "A."}]) for _ in batch
+    ]
+    chart, logo = _png("red"), _png("blue")
+    documents = [
+        {"text": "Page one talks about the revenue chart.", "image": chart, "image_id": "chart", "page": 1},
+        {"text": "", "image": logo, "image_id": "logo", "page": 1},
+        {"text": "Page two has no pictures at all, only prose.", "image": None, "image_id": None, "page": 2},
+        {"text": "Page three repeats the logo.", "image": None, "image_id": "logo", "page": 3},
+        {"text": "Page four has an image stored elsewhere.", "image": None, "image_id": "other", "page": 4},
+    ]
+
+    generator = MultimodalQAGenerator(client)
+    pairs = generator.generate_qa_pairs(documents, num_pairs=4)
+
+    messages = client.batch_completion.call_args.args[0]
+    images = [
+        [part["image_url"]["url"] for part in batch[1]["content"] if part["type"] == "image_url"]
+        for batch in messages
+    ]
+    urls = generator.image_pipeline.encode_many([chart, logo])
+    assert images == [urls, [], [urls[1]], []]
+    assert generator.image_pipeline.stats["encoded"] + generator.image_pipeline.stats["passed_through"] == 2
+    assert len(pairs) == 4
+
+
+@pytest.mark.unit
+def test_lance_images_load_per_batch(tmp_path):
+    """Test create reads only the columns it needs and images load batch by batch"""
+    from synthetic_data_kit.core.create import read_documents
+    from synthetic_data_kit.utils.lance_utils import create_lance_dataset
+
+    chart, logo = _png("red"), _png("blue")
+    dataset_path = str(tmp_path / "doc.lance")
+    create_lance_dataset([
+        {"text": "Page one talks about the revenue chart.", "image": chart, "image_id": "chart", "page": 1},
+        {"text": "Page two has no pictures at all, only prose.", "image": None, "image_id": None, "page": 2},
+        {"text": "Page three shows the company logo.", "image": logo, "image_id": "logo", "page": 3},
+    ], dataset_path)
+
+    documents, image_loader = read_documents(dataset_path, "qa")
+    assert image_loader is None
+    assert all(set(doc) == {"text", "page", "image_id"} for doc in documents)
+
+    documents, image_loader = read_documents(dataset_path, "multimodal-qa")
+    assert [doc["has_image"] for doc in documents] == [True, False, True]
+    assert all("image" not in doc for doc in documents)
+
+    loaded = []
+
+    def loader(keys):
+        loaded.append(keys)
+        return image_loader(keys)
+
+    client = MagicMock()
+    client.config = {"generation": {"chunk_size": 50, "overlap": 0, "batch_size": 2}}
+    client.batch_completion.side_effect = lambda batch, **kwargs: [
+        json.dumps([{"question": "Q?", "answer": "A."}]) for _ in batch
+    ]
+    generator = MultimodalQAGenerator(client)
+    assert len(generator.generate_qa_pairs(documents, num_pairs=3, image_loader=loader)) == 3
+
+    assert loaded == [["chart"], ["logo"]]
+    urls = generator.image_pipeline.encode_many([chart, logo])
+    images = [
+        [part["image_url"]["url"] for part in messages[1]["content"] if part["type"] == "image_url"]
+        for call in client.batch_completion.call_args_list for messages in call.args[0]
+    ]
+    assert images == [[urls[0]], [], [urls[1]]]
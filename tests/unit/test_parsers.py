@@ -140,3 +140,94 @@ def test_pdf_parser():
                 saved_content = f.read()
 
             assert saved_content == "This is sample PDF content for testing."
+
+
+@pytest.mark.unit
+def test_pdf_parser_pymupdf_pages(tmp_path):
+    """Test the PyMuPDF backend returns one numbered row per page, in parallel or not."""
+    import fitz  # PyMuPDF
+
+    pdf_path = str(tmp_path / "pages.pdf")
+    doc = fitz.open()
+    for page_num in range(1, 6):
+        doc.new_page().insert_text((72, 72), f"Content of page {page_num}")
+    doc.save(pdf_path)
+    doc.close()
+
+    serial = PDFParser(backend="pymupdf", workers=1).parse(pdf_path)
+    parallel = PDFParser(backend="pymupdf", workers=2, parallel_min_pages=1).parse(pdf_path)
+
+    assert [row["page"] for row in serial] == [1, 2, 3, 4, 5]
+    assert serial[2]["text"].strip() == "Content of page 3"
+    assert parallel == serial
+
+    with pytest.raises(ValueError):
+        PDFParser(backend="unknown")
+
+
+@pytest.mark.unit
+def test_multimodal_parser_page_parallel(tmp_path):
+    """Test page-sharded multimodal extraction matches serial extraction, in page order."""
+    import io
+    import lance
+    import fitz  # PyMuPDF
+    from PIL import Image
+    from synthetic_data_kit.core.ingest import process_file
+    from synthetic_data_kit.parsers.multimodal_parser import MultimodalParser
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32), "red").save(buffer, format="PNG")
+    pdf_path = str(tmp_path / "deck.pdf")
+    doc = fitz.open()
+    for page_num in range(1, 8):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Slide {page_num}")
+        if page_num % 2:
+            page.insert_image(fitz.Rect(100, 100, 200, 200), stream=buffer.getvalue())
+    doc.save(pdf_path)
+    doc.close()
+
+    serial = MultimodalParser(workers=1).parse(pdf_path)
+    parallel = list(MultimodalParser(workers=3, parallel_min_pages=1).iter_rows(pdf_path))
+
+    assert [row["page"] for row in serial] == [1, 2, 3, 4, 5, 6, 7]
+    assert [row["image"] is not None for row in serial] == [True, False, True, False, True, False, True]
+    assert parallel == serial
+
+    config = {"ingest": {"pdf_page_workers": 2, "pdf_parallel_min_pages": 1}}
+    output_path = process_file(pdf_path, str(tmp_path / "parsed"), None, config, multimodal=True)
+    table = lance.dataset(output_path).to_table()
+    assert table.schema.names == ["text", "image", "image_id", "page"]
+    assert table.column("page").to_pylist() == [1, 2, 3, 4, 5, 6, 7]
+
+
+@pytest.mark.unit
+def test_multimodal_parser_skips_small_images_and_repeated_xrefs(tmp_path):
+    """Test small images are never extracted and a repeated logo is extracted once."""
+    import io
+    import fitz  # PyMuPDF
+    from PIL import Image
+    from synthetic_data_kit.parsers.multimodal_parser import MultimodalParser
+
+    def png(size):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, "green").save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    pdf_path = str(tmp_path / "report.pdf")
+    doc = fitz.open()
+    logo_xref = 0
+    for page_num in range(1, 4):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {page_num}")
+        logo_xref = page.insert_image(fitz.Rect(10, 10, 60, 60), stream=png((80, 80)), xref=logo_xref)
+        page.insert_image(fitz.Rect(100, 100, 110, 110), stream=png((8, 8)))
+    doc.save(pdf_path)
+    doc.close()
+
+    with patch("fitz.Document.extract_image", autospec=True, side_effect=fitz.Document.extract_image) as extract:
+        rows = MultimodalParser(workers=1, min_image_size=32).parse(pdf_path)
+
+    assert extract.call_count == 1
+    assert [row["page"] for row in rows] == [1, 2, 3]
+    assert len({row["image_id"] for row in rows}) == 1
@@ -0,0 +1,39 @@
+"""Unit tests for the rule-based curate pre-filter."""
+
+import pytest
+
+from synthetic_data_kit.utils.prefilter import prefilter_pairs, PREFILTER_RULES
+
+
+@pytest.mark.unit
+def test_prefilter_rejects_each_rule():
+    """Test that each rule rejects its case and counts it once."""
+    pairs = [
+        {"question": "What is the capital of France?", "answer": "Paris."},
+        {"question": "What is the capital of Spain?", "answer": "   "},
+        {"question": "Name the capital of Italy", "answer": "Rome."},
+        {"question": "What is the capital of Germany?", "answer": "The capital of Germany."},
+        {"question": "Why is the sky blue?", "answer": "Rayleigh scattering " * 50},
+        # Fails two rules but is only counted under the first
+        {"question": "Tell me", "answer": ""},
+    ]
+
+    kept, counts = prefilter_pairs(pairs, {"max_pair_chars": 200})
+
+    assert kept == pairs[:1]
+    assert set(counts) == set(PREFILTER_RULES)
+    assert counts == {"empty_answer": 2, "no_question_mark": 1, "restates_question": 1, "too_long": 1}
+
+
+@pytest.mark.unit
+def test_prefilter_rules_are_configurable():
+    """Test that rules can be relaxed from the curate config."""
+    pairs = [
+        {"question": "Name the capital of Italy", "answer": "Rome."},
+        {"question": "Why is the sky blue?", "answer": "Rayleigh scattering " * 50},
+    ]
+
+    kept, counts = prefilter_pairs(pairs, {"require_question_mark": False, "max_pair_chars": None})
+
+    assert kept == pairs
+    assert sum(counts.values()) == 0
@@ -0,0 +1,76 @@
+"""Unit tests for the combined QA + CoT generator."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from synthetic_data_kit.generators.qa_cot_generator import QACoTGenerator, parse_qa_cot_output
+
+
+@pytest.mark.unit
+def test_parse_qa_cot_output():
+    """Test parsing combined, plain-list and invalid responses."""
+    combined = json.dumps({
+        "qa_pairs": [{"question": "Q?", "answer": "A."}, {"question": "No answer?"}],
+        "cot_examples": [{"question": "Why?", "reasoning": "Step 1: ...", "answer": "Because."}],
+    })
+    qa_pairs, examples = parse_qa_cot_output(f"```json\n{combined}\n```")
+    assert qa_pairs == [{"question": "Q?", "answer": "A."}]
+    assert examples[0]["reasoning"] == "Step 1: ..."
+
+    # A model that ignores the combined format still yields QA pairs
+    qa_pairs, examples = parse_qa_cot_output(json.dumps([{"question": "Q?", "answer": "A."}]))
+    assert len(qa_pairs) == 1
+    assert examples == []
+
+    assert parse_qa_cot_output("not json") == ([], [])
+
+
+@pytest.mark.unit
+def test_generate_qa_cot_single_request_per_chunk():
+    """Test that every chunk is sent once and both outputs are collected."""
+    mock_client = MagicMock()
+    mock_client.batch_completion.side_effect = lambda batch, **kwargs: [
+        json.dumps({
+            "qa_pairs": [{"question": f"Q{i}a?", "answer": "A."}, {"question": f"Q{i}b?", "answer": "A."}],
+            "cot_examples": [{"question": f"Why {i}?", "reasoning": "Step 1: ...", "answer": "Because."}],
+        })
+        for i in range(len(batch))
+    ]
+    mock_client.chat_completion.return_value = "A summary."
+
+    generator = QACoTGenerator(client=mock_client)
+    generator.generation_config = {"chunk_size": 100, "overlap": 0, "pair_allocation": "uniform"}
+
+    paragraphs = [f"Paragraph {i} covers topic{i} in detail." + " filler" * 10 for i in range(3)]
+    result = generator.process_documents([{"text": "\n\n".join(paragraphs)}], num_pairs=6, num_examples=2)
+
+    # One batch, one request per chunk, both outputs requested in the same prompt
+    assert mock_client.batch_completion.call_count == 1
+    sent = mock_client.batch_completion.call_args[0][0]
+    assert len(sent) == 3
+    assert "reasoning" in sent[0][0]["content"]
+
+    assert len(result["qa_pairs"]) == 6
+    assert len(result["cot_examples"]) == 2
+    assert len(result["conversations"]) == 2
+    assert result["conversations"][0][1]["content"] == "Why 0?"
+    assert result["summary"] == "A summary."
+
+
+@pytest.mark.unit
+def test_generate_qa_cot_plans_each_half_against_its_own_budget():
+    """Test that a larger CoT target doesn't inflate the QA pairs requested."""
+    mock_client = MagicMock()
+    mock_client.batch_completion.side_effect = lambda batch, **kwargs: ["{}"] * len(batch)
+
+    generator = QACoTGenerator(client=mock_client)
+    generator.generation_config = {"chunk_size": 100, "overlap": 0, "pair_allocation": "uniform"}
+
+    paragraphs = [f"Paragraph {i} covers topic{i} in detail." + " filler" * 10 for i in range(3)]
+    generator.generate_qa_cot("\n\n".join(paragraphs), num_pairs=2, num_examples=6)
+
+    prompts = [messages[0]["content"] for messages in mock_client.batch_completion.call_args[0][0]]
+    assert [prompt.split("\n")[1].split()[1] for prompt in prompts] == ["1", "1", "0"]
+    assert [prompt.split("\n")[2].split()[1] for prompt in prompts] == ["2", "2", "2"]
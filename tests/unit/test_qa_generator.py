@@ -177,3 +177,73 @@ def test_process_document(patch_config):
     assert "qa_pairs" in result
     assert result["summary"] == "This is a summary of the document."
     assert len(result["qa_pairs"]) == 2
+
+
+@pytest.mark.unit
+def test_generate_qa_pairs_coverage_sampling(patch_config):
+    """Test that few pairs from many chunks are drawn from across the document."""
+    mock_client = MagicMock()
+    mock_client.batch_completion.side_effect = lambda batch, **kwargs: [
+        json.dumps([{"question": f"Q{i}?", "answer": f"A{i}."}]) for i in range(len(batch))
+    ]
+
+    generator = QAGenerator(client=mock_client)
+    generator.generation_config = {"chunk_size": 100, "overlap": 0, "chunk_sampling": "coverage"}
+
+    paragraphs = [f"Paragraph {i} talks about topic{i % 4} in detail." + " filler" * 10 for i in range(40)]
+    qa_pairs = generator.generate_qa_pairs("\n\n".join(paragraphs), "summary", num_pairs=4)
+
+    assert len(qa_pairs) == 4
+    # Only the sampled chunks were sent, and they are not the first four
+    sent = mock_client.batch_completion.call_args[0][0]
+    assert len(sent) == 4
+    sent_text = " ".join(messages[0]["content"] for messages in sent)
+    assert not all(f"Paragraph {i} talks" in sent_text for i in range(4))
+    assert any(f"Paragraph {i} talks" in sent_text for i in range(20, 40))
+
+
+@pytest.mark.unit
+def test_generate_qa_pairs_stops_when_saturated(patch_config):
+    """Test that dispatch stops once the model only repeats itself."""
+    mock_client = MagicMock()
+    mock_client.batch_completion.return_value = [
+        json.dumps([{"question": "What is the same thing again?", "answer": "The same."}] * 3)
+    ]
+
+    generator = QAGenerator(client=mock_client)
+    generator.generation_config = {
+        "chunk_size": 100, "overlap": 0, "batch_size": 1, "pair_allocation": "uniform",
+        "chunk_sampling": "sequential", "saturation_floor": 0.5, "saturation_window": 4,
+    }
+
+    paragraphs = [f"Paragraph {i} talks about topic{i} in detail." + " filler" * 10 for i in range(10)]
+    qa_pairs = generator.generate_qa_pairs("\n\n".join(paragraphs), "summary", num_pairs=30)
+
+    # Repeats are dropped and the remaining chunks are never sent
+    assert len(qa_pairs) == 1
+    assert mock_client.batch_completion.call_count == 2
+    assert generator.stop_reason.startswith("saturated")
+
+
+@pytest.mark.unit
+def test_generate_qa_pairs_saturates_within_one_batch(patch_config):
+    """Test that a document fitting in one default batch can still stop early."""
+    mock_client = MagicMock()
+    mock_client.batch_completion.side_effect = lambda batch, **kwargs: [
+        json.dumps([{"question": "What is the same thing again?", "answer": "The same."}] * 3)
+    ] * len(batch)
+
+    generator = QAGenerator(client=mock_client)
+    generator.generation_config = {
+        "chunk_size": 100, "overlap": 0, "batch_size": 32, "pair_allocation": "uniform",
+        "chunk_sampling": "sequential", "saturation_floor": 0.5,
+    }
+
+    paragraphs = [f"Paragraph {i} talks about topic{i} in detail." + " filler" * 10 for i in range(20)]
+    generator.generate_qa_pairs("\n\n".join(paragraphs), "summary", num_pairs=30)
+
+    # The window (30 pairs, the target) fills after two small dispatches;
+    # the other 8 chunks are never sent
+    sent = [len(call.args[0]) for call in mock_client.batch_completion.call_args_list]
+    assert sent == [4, 8]
+    assert generator.stop_reason.startswith("saturated")
@@ -0,0 +1,39 @@
+"""Unit tests for incremental QA pair reading."""
+
+import json
+
+import pytest
+
+from synthetic_data_kit.utils import qa_stream
+from synthetic_data_kit.utils.qa_stream import iter_qa_pairs, read_metadata
+
+
+@pytest.mark.unit
+def test_iter_qa_pairs_from_json_in_small_reads(tmp_path, monkeypatch):
+    """Test that pairs and metadata survive values split across reads."""
+    monkeypatch.setattr(qa_stream._JsonScanner.__init__, "__defaults__", (5,))
+    data = {
+        "summary": "A summary.",
+        "qa_pairs": [{"question": f"Question {i} é?", "answer": "x" * i, "score": 12345.5} for i in range(20)],
+        "source": "/data/doc.txt",
+        "count": 1234567,
+    }
+    path = tmp_path / "doc_qa_pairs.json"
+    path.write_text(json.dumps(data, indent=2))
+
+    assert list(iter_qa_pairs(str(path))) == data["qa_pairs"]
+    assert read_metadata(str(path)) == {"summary": "A summary.", "source": "/data/doc.txt", "count": 1234567}
+
+    path.write_text(json.dumps(data["qa_pairs"]))
+    assert list(iter_qa_pairs(str(path))) == data["qa_pairs"]
+
+
+@pytest.mark.unit
+def test_iter_qa_pairs_from_jsonl(tmp_path):
+    """Test that JSONL input yields one pair per non-empty line and has no metadata."""
+    pairs = [{"question": "What is DNA?", "answer": "A molecule."}, {"question": "Why?", "answer": "Because."}]
+    path = tmp_path / "pairs.jsonl"
+    path.write_text("\n".join(json.dumps(pair) for pair in pairs) + "\n\n")
+
+    assert list(iter_qa_pairs(str(path))) == pairs
+    assert read_metadata(str(path)) == {}
@@ -0,0 +1,50 @@
+"""Unit tests for the curate rating store."""
+
+import pytest
+
+from synthetic_data_kit.utils.rating_store import RatingStore, align_ratings, pair_hash
+
+
+@pytest.mark.unit
+def test_rating_store_round_trip(tmp_path):
+    """Test that ratings and sub-scores survive a reload and changed pairs are unrated."""
+    path = str(tmp_path / "doc.ratings.jsonl")
+    pairs = [
+        {"question": "What is DNA?", "answer": "A molecule."},
+        {"question": "What is RNA?", "answer": "A nucleic acid."},
+    ]
+    store = RatingStore(path, fingerprint="judge-v1")
+    # The judge echoes the pairs back with edits (even to the question) and an extra score
+    stored = store.record(align_ratings(pairs, [
+        {"question": "What's DNA?", "answer": "A molecule!", "rating": 8, "relevance": 9},
+        {"question": "What is RNA?", "answer": "A nucleic acid.", "rating": 5},
+    ]), judge="judge")
+    assert stored[0] == {"question": "What is DNA?", "answer": "A molecule.", "rating": 8, "scores": {"relevance": 9}}
+
+    # An interrupted write leaves a torn line, which is ignored
+    with open(path, "a") as f:
+        f.write('{"hash": "abc", "rat')
+
+    reloaded = RatingStore(path, fingerprint="judge-v1")
+    assert len(reloaded) == 2
+    changed = {"question": "What is RNA?", "answer": "Ribonucleic acid."}
+    rated, unrated = reloaded.lookup(pairs + [changed])
+    assert [pair["rating"] for pair in rated] == [8, 5]
+    assert rated[0]["scores"] == {"relevance": 9}
+    assert unrated == [changed]
+    # The hash ignores attached ratings
+    assert pair_hash(rated[0]) == pair_hash(pairs[0])
+
+    # Another judge configuration re-rates everything; re-thresholding reuses any rating
+    assert len(RatingStore(path, fingerprint="judge-v2")) == 0
+    assert len(RatingStore(path)) == 2
+
+
+@pytest.mark.unit
+def test_align_ratings_falls_back_to_questions():
+    """Test that a response with a pair missing is matched by question."""
+    pairs = [{"question": "Q1", "answer": "A1"}, {"question": "Q2", "answer": "A2"}]
+    assert align_ratings(pairs, [{"question": "Q2", "answer": "A2!", "rating": 7}]) == [
+        {"question": "Q2", "answer": "A2", "rating": 7}
+    ]
+    assert align_ratings(pairs, [{"question": "Q9", "answer": "A9", "rating": 3}]) == []
@@ -0,0 +1,29 @@
+"""Unit tests for streaming top-K selection."""
+
+import pytest
+
+from synthetic_data_kit.utils.top_k import TopKSelector, select_top_k
+
+
+@pytest.mark.unit
+def test_selector_keeps_best_k_per_group():
+    """Test that each group keeps its K best items, earliest first on ties."""
+    selector = TopKSelector(2)
+    for i, (score, group) in enumerate([(5, "a"), (9, "a"), (7, "a"), (9, "a"), (1, "b"), (3, "b"), (2, "b")]):
+        selector.push(i, score, group)
+
+    assert selector.seen == 7
+    assert len(selector) == 4
+    assert selector.results("a") == [1, 3]
+    assert selector.results("b") == [5, 6]
+
+
+@pytest.mark.unit
+def test_select_top_k_preserves_input_order():
+    """Test that selected items come back in input order."""
+    items = [{"q": i, "rating": rating} for i, rating in enumerate([6, 9, 4, 8, 7])]
+
+    assert [item["q"] for item in select_top_k(items, 3)] == [1, 3, 4]
+    assert select_top_k(items, 10) == items
+    with pytest.raises(ValueError):
+        select_top_k(items, 0)
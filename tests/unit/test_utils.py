@@ -1,5 +1,6 @@
 """Unit tests for utility functions."""
 
+import json
 from pathlib import Path
 
 import pytest
@@ -159,3 +160,34 @@ def test_get_path_config():
     empty_config = {}
     default_path = config.get_path_config(empty_config, "output", "default")
     assert default_path == "data/output"
+
+
+@pytest.mark.unit
+def test_compact_text():
+    """Test whitespace normalisation and de-hyphenation."""
+    raw = "The  exam-\nple   shows\t\ttabs.  \n\n\n\nNew   paragraph.\fNext page"
+    compacted = text.compact_text(raw)
+
+    assert compacted == "The example shows tabs.\n\nNew paragraph.\fNext page"
+    # Compaction is idempotent
+    assert text.compact_text(compacted) == compacted
+    # Hyphens that are not line-break artifacts are kept
+    assert text.compact_text("well-known") == "well-known"
+
+
+@pytest.mark.unit
+def test_prompt_compactor_tracks_tokens_saved():
+    """Test compact JSON serialisation and token accounting."""
+    pairs = [{"question": "What is café?", "answer": "A coffee shop."}]
+
+    compactor = text.PromptCompactor()
+    serialised = compactor.json(pairs)
+
+    assert serialised == '[{"question":"What is café?","answer":"A coffee shop."}]'
+    assert compactor.tokens_saved > 0
+
+    disabled = text.PromptCompactor(enabled=False)
+    assert disabled.json(pairs) == json.dumps(pairs, indent=2)
+    assert "café" in disabled.json(pairs, ensure_ascii=False)
+    assert disabled.text("a  b") == "a  b"
+    assert disabled.tokens_saved == 0